@@ -1,48 +1,88 @@
 #!/usr/bin/env python3
 """Configure Claude Desktop to use Obsidian MCP server."""
 
-import json
 import os
 import sys
-import platform
-import argparse
-import shutil
+import functools
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # orjson is optional; fall back to the stdlib
+    import json
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy a file in-kernel, using copy_file_range (reflink-capable) when available."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+        except OSError:
+            pass
+    import shutil
+
+    # shutil.copyfile uses sendfile()/fcopyfile() where the platform supports it
+    shutil.copyfile(src, dst)
+
+
+# Signature of the pre-2.0 REST API server config
+_OLD_ARGS = ["-m", "src.server"]
+_OLD_ENV_KEYS = frozenset({"OBSIDIAN_REST_API_KEY", "PYTHONPATH"})
+_OLD_PY_CMDS = ("python", "python3")
+
+
+@functools.cache
+def _get_config_path() -> Path:
+    """Get Claude Desktop config path based on OS."""
+    if sys.platform == "darwin":  # macOS
+        config_dir = Path.home() / "Library" / "Application Support" / "Claude"
+    elif sys.platform == "win32":
+        config_dir = Path(os.environ["APPDATA"]) / "Claude"
+    elif sys.platform.startswith("linux"):
+        config_dir = Path.home() / ".config" / "Claude"
+    else:
+        raise ValueError(f"Unsupported operating system: {sys.platform}")
+        
+    return config_dir / "claude_desktop_config.json"
+
 
 class ConfigManager:
     """Manages Claude Desktop configuration for Obsidian MCP."""
     
+    __slots__ = ("config_path", "config")
+    
     def __init__(self):
-        self.config_path = self._get_config_path()
+        self.config_path = _get_config_path()
         self.config: Dict[str, Any] = {}
         
-    def _get_config_path(self) -> Path:
-        """Get Claude Desktop config path based on OS."""
-        system = platform.system()
-        
-        if system == "Darwin":  # macOS
-            config_dir = Path.home() / "Library" / "Application Support" / "Claude"
-        elif system == "Windows":
-            config_dir = Path(os.environ["APPDATA"]) / "Claude"
-        elif system == "Linux":
-            config_dir = Path.home() / ".config" / "Claude"
-        else:
-            raise ValueError(f"Unsupported operating system: {system}")
-            
-        config_path = config_dir / "claude_desktop_config.json"
-        return config_path
-    
     def load_config(self) -> bool:
         """Load existing config or create empty one."""
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    self.config = json.load(f)
+                self.config = _json_loads(self.config_path.read_bytes())
                 return True
-            except json.JSONDecodeError:
+            except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
                 print(f"⚠️  Warning: Invalid JSON in {self.config_path}")
                 self.config = {}
                 return False
@@ -56,11 +96,13 @@ class ConfigManager:
     def backup_config(self) -> Optional[Path]:
         """Create backup of existing config."""
         if self.config_path.exists():
+            from datetime import datetime
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = self.config_path.with_name(
                 f"{self.config_path.stem}.backup_{timestamp}.json"
             )
-            shutil.copy2(self.config_path, backup_path)
+            _copy_file(self.config_path, backup_path)
             print(f"💾 Backup saved to: {backup_path.name}")
             return backup_path
         return None
@@ -76,14 +118,14 @@ class ConfigManager:
             
         old_config = servers[server_name]
         
-        # Check for indicators of old REST API config
-        is_old = any([
-            "cwd" in old_config,
-            old_config.get("args") == ["-m", "src.server"],
-            "OBSIDIAN_REST_API_KEY" in old_config.get("env", {}),
-            "PYTHONPATH" in old_config.get("env", {}),
-            old_config.get("command", "").endswith("python") or old_config.get("command", "").endswith("python3")
-        ])
+        # Check for indicators of old REST API config (stops at the first hit)
+        env = old_config.get("env") or {}
+        is_old = (
+            "cwd" in old_config
+            or old_config.get("args") == _OLD_ARGS
+            or not _OLD_ENV_KEYS.isdisjoint(env)
+            or old_config.get("command", "").endswith(_OLD_PY_CMDS)
+        )
         
         return old_config if is_old else None
     
@@ -150,8 +192,11 @@ class ConfigManager:
     
     def save_config(self) -> None:
         """Save config to file with pretty formatting."""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        # Write to a sibling temp file and rename so a crash never leaves
+        # a half-written config behind
+        tmp_path = self.config_path.with_suffix(self.config_path.suffix + ".tmp")
+        tmp_path.write_bytes(_json_dumps(self.config))
+        os.replace(tmp_path, self.config_path)
         print(f"\n💾 Configuration saved to: {self.config_path}")
         
     def show_usage(self) -> None:
@@ -165,6 +210,8 @@ class ConfigManager:
 
 def main():
     """Main entry point for configuration script."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Configure Claude Desktop to use Obsidian MCP server",
         formatter_class=argparse.RawDescriptionHelpFormatter,
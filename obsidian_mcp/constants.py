@@ -1,5 +1,9 @@
 """Constants for Obsidian MCP server."""
 
+import sys
+from string import Formatter
+from types import MappingProxyType
+
 # Obsidian REST API configuration
 OBSIDIAN_BASE_URL = "http://127.0.0.1:27123"
 DEFAULT_TIMEOUT = 10  # seconds - reduced for local API
@@ -15,7 +19,43 @@ ENDPOINTS = {
 }
 
 # File extensions
-MARKDOWN_EXTENSIONS = {".md", ".markdown"}
+MARKDOWN_EXTENSIONS = frozenset(map(sys.intern, (".md", ".markdown")))
+# Same extensions as a tuple, for a single str.endswith() call
+MARKDOWN_SUFFIXES = tuple(sorted(MARKDOWN_EXTENSIONS))
+
+# Directories never descended into when walking the vault (nor watched for
+# changes). Any other dot-directory is skipped too, since _ensure_safe_path
+# rejects such paths.
+SKIP_DIRS = frozenset({".obsidian", ".trash", ".git", ".venv", "node_modules", "__pycache__"})
+
+# Image file extensions readable by the image tools
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".bmp", ".ico")
+
+# Embedded images read and resized at once per note, so a note with dozens
+# of images doesn't open (and decode) all of them together
+IMAGE_LOAD_CONCURRENCY = 8
+
+# MIME type of each image extension, and the Image format name for each MIME type
+IMAGE_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+    ".bmp": "image/bmp",
+    ".ico": "image/x-icon",
+}
+IMAGE_FORMATS = {
+    "image/png": "png",
+    "image/jpeg": "jpeg",
+    "image/jpg": "jpeg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/svg+xml": "svg",
+    "image/bmp": "bmp",
+    "image/x-icon": "ico",
+}
 
 # Error messages - Actionable and specific
 ERROR_MESSAGES = {
@@ -168,4 +208,33 @@ RESPONSE_STRUCTURES = {
         "message": str,  # Human-readable message
         "suggestions": list  # Actionable suggestions
     }
-}
\ No newline at end of file
+}
+
+# Freeze the shared tables so no caller can mutate them at runtime
+ERROR_MESSAGES = MappingProxyType(ERROR_MESSAGES)
+RESPONSE_STRUCTURES = MappingProxyType(RESPONSE_STRUCTURES)
+IMAGE_MIME_TYPES = MappingProxyType(IMAGE_MIME_TYPES)
+IMAGE_FORMATS = MappingProxyType(IMAGE_FORMATS)
+
+# Error templates pre-split into (literal, field) parts so formatting is a join
+_ERROR_TEMPLATES = {
+    key: tuple((literal, field) for literal, field, _, _ in Formatter().parse(template))
+    for key, template in ERROR_MESSAGES.items()
+}
+
+
+def format_error(key: str, **kwargs) -> str:
+    """
+    Format an ERROR_MESSAGES template using its pre-parsed parts.
+    
+    Args:
+        key: Key into ERROR_MESSAGES
+        **kwargs: Values for the template's placeholders
+        
+    Returns:
+        The formatted error message
+    """
+    return "".join(
+        literal + (str(kwargs[field]) if field is not None else "")
+        for literal, field in _ERROR_TEMPLATES[key]
+    )
@@ -0,0 +1,36 @@
+"""Annotated path types shared by the tool signatures."""
+
+from typing import Annotated
+from pydantic import AfterValidator, Field
+from .constants import IMAGE_SUFFIXES
+
+
+def _check_note_path(path: str) -> str:
+    """Require a vault-relative path ending in .md (cheaper than a regex)."""
+    if path.startswith("/") or not path.endswith(".md"):
+        raise ValueError("Path must be relative to the vault root and end with .md")
+    return path
+
+
+def _check_image_path(path: str) -> str:
+    """Require a vault-relative path with a supported image extension."""
+    if path.startswith("/") or not path.lower().endswith(IMAGE_SUFFIXES):
+        raise ValueError(
+            f"Path must be relative to the vault root and end with one of: {', '.join(IMAGE_SUFFIXES)}"
+        )
+    return path
+
+
+# Shared path constraints, built once and reused by every tool signature.
+# The patterns are only advertised in the JSON schema; validation itself
+# is done by the plain string checks above.
+NotePath = Annotated[str, Field(
+    min_length=1,
+    max_length=255,
+    json_schema_extra={"pattern": r"^[^/].*\.md$"}
+), AfterValidator(_check_note_path)]
+ImagePath = Annotated[str, Field(
+    min_length=1,
+    max_length=255,
+    json_schema_extra={"pattern": r"^[^/].*\.(png|jpg|jpeg|gif|webp|svg|bmp|ico)$"}
+), AfterValidator(_check_image_path)]
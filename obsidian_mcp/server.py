@@ -1,56 +1,87 @@
 """Main entry point for Obsidian MCP server."""
 
 import os
+import time
 import logging
-from typing import Annotated, Optional, List, Literal, Union
+import functools
+from typing import Annotated, Optional, List, Literal, Union, Tuple, Type
 from pydantic import Field
 from fastmcp import FastMCP
 from fastmcp.exceptions import ToolError
+from fastmcp.tools import ToolResult
+from mcp.types import TextContent
 from .utils.filesystem import init_vault, get_vault
+from .path_types import NotePath, ImagePath
 
 # Configure logging
 logging.basicConfig(
     level=os.getenv("OBSIDIAN_LOG_LEVEL", "INFO"),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-
-# Import all tools
-from .tools import (
-    read_note,
-    create_note,
-    update_note,
-    edit_note_section,
-    delete_note,
-    search_notes,
-    search_by_date,
-    search_by_regex,
-    search_by_property,
-    list_notes,
-    list_folders,
-    move_note,
-    rename_note,
-    create_folder,
-    move_folder,
-    add_tags,
-    update_tags,
-    remove_tags,
-    get_note_info,
-    list_tags,
-    batch_update_properties,
-    get_backlinks,
-    get_outgoing_links,
-    find_broken_links,
-    find_orphaned_notes,
-    read_image,
-    view_note_images,
-)
+logger = logging.getLogger(__name__)
 
 # Check for vault path
-if not os.getenv("OBSIDIAN_VAULT_PATH"):
+VAULT_PATH = os.getenv("OBSIDIAN_VAULT_PATH")
+if not VAULT_PATH:
     raise ValueError("OBSIDIAN_VAULT_PATH environment variable must be set")
 
-# Initialize vault
-init_vault()
+# Initialize vault (its root is resolved once here, not per request)
+init_vault(VAULT_PATH)
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; FastMCP serializes results itself
+    orjson = None
+
+
+def _json_result(result):
+    """
+    Encode a dict tool result with orjson.
+    
+    FastMCP would otherwise serialize it through pydantic twice for the text
+    content (plus once more for the structured content), which dominates the
+    cost of large listings and search results. Anything orjson can't encode
+    is returned unchanged for FastMCP to handle.
+    """
+    if orjson is None or not isinstance(result, dict):
+        return result
+    try:
+        text = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        return result
+    return ToolResult(content=[TextContent(type="text", text=text)], structured_content=result)
+
+
+def tool_errors(message: str, passthrough: Tuple[Type[Exception], ...] = (ValueError,)):
+    """
+    Map exceptions raised by a tool implementation to ToolError.
+    
+    Every tool goes through this wrapper, so it is also where per-call
+    timing is logged (at DEBUG level, e.g. OBSIDIAN_LOG_LEVEL=DEBUG) and
+    where dict results are JSON-encoded with orjson.
+    
+    Args:
+        message: Prefix for unexpected errors, e.g. "Failed to read note"
+        passthrough: Exception types whose message is shown to the user as-is
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _json_result(await func(*args, **kwargs))
+            except ToolError:
+                raise
+            except passthrough as e:
+                raise ToolError(str(e))
+            except Exception as e:
+                raise ToolError(f"{message}: {str(e)}")
+            finally:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"{func.__name__} took {(time.perf_counter() - start) * 1000:.1f} ms")
+        return wrapper
+    return decorator
+
 
 # Create FastMCP server instance
 mcp = FastMCP(
@@ -60,12 +91,10 @@ mcp = FastMCP(
 
 # Register tools with proper error handling
 @mcp.tool()
+@tool_errors("Failed to read note", (ValueError, FileNotFoundError))
 async def read_note_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Note location within your vault (e.g., 'Projects/AI Research.md'). Use forward slashes for folders.",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Daily/2024-01-15.md", "Projects/AI Research.md", "Ideas/Quick Note.md"]
     )],
     ctx=None
@@ -92,20 +121,14 @@ async def read_note_tool(
     "I can see this note contains [N] images. Would you like me to analyze/examine them for you?"
     Then use view_note_images to load and analyze the images if requested.
     """
-    try:
-        return await read_note(path, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to read note: {str(e)}")
+    from .tools.note_management import read_note
+    return await read_note(path, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to create note", (ValueError, FileExistsError))
 async def create_note_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Where to create the new note in your vault. Folders will be created automatically if needed.",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Ideas/New Idea.md", "Daily/2024-01-15.md", "Projects/Project Plan.md"]
     )],
     content: Annotated[str, Field(
@@ -138,20 +161,14 @@ async def create_note_tool(
     Returns:
         Created note information with path and metadata
     """
-    try:
-        return await create_note(path, content, overwrite, ctx)
-    except (ValueError, FileExistsError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to create note: {str(e)}")
+    from .tools.note_management import create_note
+    return await create_note(path, content, overwrite, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to update note", (ValueError, FileNotFoundError))
 async def update_note_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Which note to update in your vault",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Daily/2024-01-15.md", "Projects/Project.md"]
     )],
     content: Annotated[str, Field(
@@ -187,20 +204,14 @@ async def update_note_tool(
     Returns:
         Update status with path, metadata, and operation performed
     """
-    try:
-        return await update_note(path, content, create_if_not_exists, merge_strategy, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to update note: {str(e)}")
+    from .tools.note_management import update_note
+    return await update_note(path, content, create_if_not_exists, merge_strategy, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to edit section", (ValueError, FileNotFoundError))
 async def edit_note_section_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Path to the note to edit",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Daily/2024-01-15.md", "Projects/Project.md"]
     )],
     section_identifier: Annotated[str, Field(
@@ -254,20 +265,14 @@ async def edit_note_section_tool(
     Returns:
         Edit status including whether section was found or created
     """
-    try:
-        return await edit_note_section(path, section_identifier, content, operation, create_if_missing, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to edit section: {str(e)}")
+    from .tools.note_management import edit_note_section
+    return await edit_note_section(path, section_identifier, content, operation, create_if_missing, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to delete note", (ValueError, FileNotFoundError))
 async def delete_note_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Path to the note to delete from your vault",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Archive/Old Note.md", "Temp/Draft.md"]
     )],
     ctx=None
@@ -289,14 +294,11 @@ async def delete_note_tool(
     Returns:
         Deletion confirmation with the path of the deleted note
     """
-    try:
-        return await delete_note(path, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to delete note: {str(e)}")
+    from .tools.note_management import delete_note
+    return await delete_note(path, ctx)
 
 @mcp.tool()
+@tool_errors("Search failed")
 async def search_notes_tool(
     query: Annotated[str, Field(
         description="Search query that matches BOTH filenames and content by default. Just type a note name to find it! Use prefixes for specific search types: 'tag:' for tags, 'path:' for ONLY filenames, 'property:' for metadata.",
@@ -365,14 +367,11 @@ async def search_notes_tool(
         Filename matches have higher scores than content matches.
         Response includes match_type field: "filename" or "content".
     """
-    try:
-        return await search_notes(query, context_length, max_results, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Search failed: {str(e)}")
+    from .tools.search_discovery import search_notes
+    return await search_notes(query, context_length, max_results, ctx)
 
 @mcp.tool()
+@tool_errors("Date search failed")
 async def search_by_date_tool(
     date_type: Annotated[Literal["created", "modified"], Field(
         description="Which date to search by: when the note was first created or last modified",
@@ -406,14 +405,11 @@ async def search_by_date_tool(
     Returns:
         Notes matching the date criteria with paths and timestamps
     """
-    try:
-        return await search_by_date(date_type, days_ago, operator, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Date search failed: {str(e)}")
+    from .tools.search_discovery import search_by_date
+    return await search_by_date(date_type, days_ago, operator, ctx)
 
 @mcp.tool()
+@tool_errors("Regex search failed")
 async def search_by_regex_tool(
     pattern: Annotated[str, Field(
         description="Regular expression pattern for advanced searches. Use for finding URLs, code patterns, TODO items, etc.",
@@ -461,14 +457,11 @@ async def search_by_regex_tool(
     Returns:
         Notes containing regex matches with match details and context
     """
-    try:
-        return await search_by_regex(pattern, flags, context_length, max_results, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Regex search failed: {str(e)}")
+    from .tools.search_discovery import search_by_regex
+    return await search_by_regex(pattern, flags, context_length, max_results, ctx)
 
 @mcp.tool()
+@tool_errors("Property search failed")
 async def search_by_property_tool(
     property_name: Annotated[str, Field(
         description="The frontmatter property to search for (e.g., 'status', 'priority'). These are metadata fields at the top of notes.",
@@ -526,14 +519,11 @@ async def search_by_property_tool(
     Returns:
         Notes matching the property criteria with values displayed
     """
-    try:
-        return await search_by_property(property_name, value, operator, context_length, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Property search failed: {str(e)}")
+    from .tools.search_discovery import search_by_property
+    return await search_by_property(property_name, value, operator, context_length, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to list notes", ())
 async def list_notes_tool(
     directory: Annotated[Optional[str], Field(
         description="Specific folder to list notes from. Leave empty to list entire vault.",
@@ -567,12 +557,11 @@ async def list_notes_tool(
     Returns:
         Hierarchical structure of notes with paths and folder organization
     """
-    try:
-        return await list_notes(directory, recursive, ctx)
-    except Exception as e:
-        raise ToolError(f"Failed to list notes: {str(e)}")
+    from .tools.search_discovery import list_notes
+    return await list_notes(directory, recursive, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to list folders")
 async def list_folders_tool(
     directory: Annotated[Optional[str], Field(
         description="Specific directory to list folders from (optional, defaults to root)",
@@ -601,27 +590,18 @@ async def list_folders_tool(
     Returns:
         Folder structure with paths and names
     """
-    try:
-        return await list_folders(directory, recursive, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to list folders: {str(e)}")
+    from .tools.search_discovery import list_folders
+    return await list_folders(directory, recursive, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to move note", (ValueError, FileNotFoundError, FileExistsError))
 async def move_note_tool(
-    source_path: Annotated[str, Field(
+    source_path: Annotated[NotePath, Field(
         description="Current location of the note to move",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Inbox/Quick Note.md", "Projects/Old Project.md"]
     )],
-    destination_path: Annotated[str, Field(
+    destination_path: Annotated[NotePath, Field(
         description="New location for the note. Folders will be created if needed.",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Projects/Active/Quick Note.md", "Archive/2024/Old Project.md"]
     )],
     update_links: Annotated[bool, Field(
@@ -653,27 +633,18 @@ async def move_note_tool(
     Returns:
         Move confirmation with path changes and link update details
     """
-    try:
-        return await move_note(source_path, destination_path, update_links, ctx)
-    except (ValueError, FileNotFoundError, FileExistsError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to move note: {str(e)}")
+    from .tools.organization import move_note
+    return await move_note(source_path, destination_path, update_links, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to rename note", (ValueError, FileNotFoundError, FileExistsError))
 async def rename_note_tool(
-    old_path: Annotated[str, Field(
+    old_path: Annotated[NotePath, Field(
         description="Current path of the note to rename",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Projects/Old Name.md", "Ideas/Temporary Title.md"]
     )],
-    new_path: Annotated[str, Field(
+    new_path: Annotated[NotePath, Field(
         description="New path for the note (must be in same directory)",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Projects/New Name.md", "Ideas/Final Title.md"]
     )],
     update_links: Annotated[bool, Field(
@@ -704,14 +675,11 @@ async def rename_note_tool(
     Returns:
         Rename confirmation with link update details
     """
-    try:
-        return await rename_note(old_path, new_path, update_links, ctx)
-    except (ValueError, FileNotFoundError, FileExistsError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to rename note: {str(e)}")
+    from .tools.organization import rename_note
+    return await rename_note(old_path, new_path, update_links, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to create folder")
 async def create_folder_tool(
     folder_path: Annotated[str, Field(
         description="Path of the folder to create",
@@ -745,14 +713,11 @@ async def create_folder_tool(
     Returns:
         Creation status with list of folders created and placeholder file path
     """
-    try:
-        return await create_folder(folder_path, create_placeholder, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to create folder: {str(e)}")
+    from .tools.organization import create_folder
+    return await create_folder(folder_path, create_placeholder, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to move folder", (ValueError, FileNotFoundError))
 async def move_folder_tool(
     source_folder: Annotated[str, Field(
         description="Current folder path to move",
@@ -788,20 +753,14 @@ async def move_folder_tool(
     Returns:
         Move status with count of notes and folders moved
     """
-    try:
-        return await move_folder(source_folder, destination_folder, update_links, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to move folder: {str(e)}")
+    from .tools.organization import move_folder
+    return await move_folder(source_folder, destination_folder, update_links, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to add tags", (ValueError, FileNotFoundError))
 async def add_tags_tool(
-    path: Annotated[str, Field(
-        description="Path to the note",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255
+    path: Annotated[NotePath, Field(
+        description="Path to the note"
     )],
     tags: Annotated[List[str], Field(
         description="List of tags to add to the note. Don't include the # symbol - it will be added automatically. Supports hierarchical tags with forward slashes.",
@@ -832,20 +791,14 @@ async def add_tags_tool(
     Returns:
         Updated tag list for the note
     """
-    try:
-        return await add_tags(path, tags, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to add tags: {str(e)}")
+    from .tools.organization import add_tags
+    return await add_tags(path, tags, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to update tags", (ValueError, FileNotFoundError))
 async def update_tags_tool(
-    path: Annotated[str, Field(
-        description="Path to the note",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255
+    path: Annotated[NotePath, Field(
+        description="Path to the note"
     )],
     tags: Annotated[List[str], Field(
         description="New tags for the note. Empty list removes all tags. Don't include # symbols. Supports hierarchical tags with forward slashes.",
@@ -875,20 +828,14 @@ async def update_tags_tool(
     Returns:
         Previous tags, new tags, and operation performed
     """
-    try:
-        return await update_tags(path, tags, merge, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to update tags: {str(e)}")
+    from .tools.organization import update_tags
+    return await update_tags(path, tags, merge, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to remove tags", (ValueError, FileNotFoundError))
 async def remove_tags_tool(
-    path: Annotated[str, Field(
-        description="Path to the note",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255
+    path: Annotated[NotePath, Field(
+        description="Path to the note"
     )],
     tags: Annotated[List[str], Field(
         description="Tags to remove from the note (without # prefix). Removes exact matches only.",
@@ -917,20 +864,14 @@ async def remove_tags_tool(
     Returns:
         Updated tag list after removal, with count of removed tags
     """
-    try:
-        return await remove_tags(path, tags, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to remove tags: {str(e)}")
+    from .tools.organization import remove_tags
+    return await remove_tags(path, tags, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to get note info")
 async def get_note_info_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Path to the note to analyze",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Projects/Overview.md", "Daily/2024-01-15.md"]
     )],
     ctx=None
@@ -954,20 +895,14 @@ async def get_note_info_tool(
         Note metadata including path, existence, dates, size, frontmatter properties,
         and statistics (word count, link count, tag count, image presence)
     """
-    try:
-        return await get_note_info(path, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to get note info: {str(e)}")
+    from .tools.organization import get_note_info
+    return await get_note_info(path, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to get backlinks", (ValueError, FileNotFoundError))
 async def get_backlinks_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Path to the note to find backlinks for",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Daily/2024-01-15.md", "Projects/AI Research.md"]
     )],
     include_context: Annotated[bool, Field(
@@ -980,6 +915,11 @@ async def get_backlinks_tool(
         le=500,
         default=100
     )] = 100,
+    limit: Annotated[Optional[int], Field(
+        description="Maximum number of backlinks to return (omit for all). Useful for heavily linked notes",
+        ge=1,
+        default=None
+    )] = None,
     ctx=None
 ):
     """
@@ -996,27 +936,21 @@ async def get_backlinks_tool(
     - Searching for broken links (use find_broken_links)
     
     Performance note:
-    - Fast for small vaults (<100 notes)
-    - May take several seconds for large vaults (1000+ notes)
-    - Consider using search_notes for specific link queries
+    - Links are indexed on disk; only notes changed since the last call are re-read
+    - Only notes that actually link to the target are opened
+    - The first call on a large vault (1000+ notes) may take several seconds
     
     Returns:
         All notes linking to the target with optional context
     """
-    try:
-        return await get_backlinks(path, include_context, context_length, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to get backlinks: {str(e)}")
+    from .tools.link_management import get_backlinks
+    return await get_backlinks(path, include_context, context_length, limit, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to get outgoing links", (ValueError, FileNotFoundError))
 async def get_outgoing_links_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Path to the note to extract links from",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Projects/Overview.md", "Index.md"]
     )],
     check_validity: Annotated[bool, Field(
@@ -1041,14 +975,11 @@ async def get_outgoing_links_tool(
     Returns:
         All outgoing links with their types and optional validity status
     """
-    try:
-        return await get_outgoing_links(path, check_validity, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to get outgoing links: {str(e)}")
+    from .tools.link_management import get_outgoing_links
+    return await get_outgoing_links(path, check_validity, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to find broken links")
 async def find_broken_links_tool(
     directory: Annotated[Optional[str], Field(
         description="Check only this folder and its subfolders. Leave empty to check entire vault.",
@@ -1079,14 +1010,11 @@ async def find_broken_links_tool(
     Returns:
         All broken links found in the specified scope
     """
-    try:
-        return await find_broken_links(directory, single_note, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to find broken links: {str(e)}")
+    from .tools.link_management import find_broken_links
+    return await find_broken_links(directory, single_note, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to find orphaned notes")
 async def find_orphaned_notes_tool(
     orphan_type: Annotated[Literal["no_backlinks", "no_links", "no_tags", "no_metadata", "isolated"], Field(
         description="What makes a note 'orphaned'. Choose the criteria that best fits your organization needs.",
@@ -1160,24 +1088,21 @@ async def find_orphaned_notes_tool(
         }
     }
     """
-    try:
-        # Parse exclude_folders if it's a JSON string
-        if isinstance(exclude_folders, str):
-            try:
-                import json
-                exclude_folders = json.loads(exclude_folders)
-                if not isinstance(exclude_folders, list):
-                    raise ValueError("exclude_folders must be a list")
-            except json.JSONDecodeError:
-                raise ToolError("Invalid JSON format for exclude_folders. Expected a JSON array like: [\"Daily\", \"Templates\"]")
-        
-        return await find_orphaned_notes(orphan_type, exclude_folders, min_age_days, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to find orphaned notes: {str(e)}")
+    # Parse exclude_folders if it's a JSON string
+    if isinstance(exclude_folders, str):
+        try:
+            import json
+            exclude_folders = json.loads(exclude_folders)
+            if not isinstance(exclude_folders, list):
+                raise ValueError("exclude_folders must be a list")
+        except json.JSONDecodeError:
+            raise ToolError("Invalid JSON format for exclude_folders. Expected a JSON array like: [\"Daily\", \"Templates\"]")
+    
+    from .tools.find_orphaned_notes import find_orphaned_notes
+    return await find_orphaned_notes(orphan_type, exclude_folders, min_age_days, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to list tags")
 async def list_tags_tool(
     include_counts: Annotated[bool, Field(
         description="Show how many times each tag is used across your vault",
@@ -1219,23 +1144,18 @@ async def list_tags_tool(
     - Searching notes by tag (use search_notes with tag: prefix)
     
     Performance note:
-    - For vaults with <1000 notes: Fast (1-3 seconds)
-    - For vaults with 1000-5000 notes: Moderate (3-10 seconds)
-    - For vaults with >5000 notes: May be slow (10+ seconds)
-    - Uses batched concurrent requests to optimize performance
+    - Tags are cached on disk; only notes changed since the last call are re-read
+    - The first call on a large vault (>5000 notes) may take 10+ seconds
     - include_files=true adds minimal overhead
     
     Returns:
         All unique tags with optional usage counts and file paths
     """
-    try:
-        return await list_tags(include_counts, sort_by, include_files, ctx)
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to list tags: {str(e)}")
+    from .tools.organization import list_tags
+    return await list_tags(include_counts, sort_by, include_files, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to batch update properties")
 async def batch_update_properties_tool(
     search_criteria: Annotated[dict, Field(
         description="How to find notes to update. Must include one of: 'query' (search string), 'folder' (folder path), or 'files' (list of paths). Use 'query' for complex searches, 'folder' for directory operations, 'files' for specific notes.",
@@ -1313,53 +1233,47 @@ async def batch_update_properties_tool(
             "errors": [...]            # List of errors with paths and reasons
         }
     """
-    try:
-        import json
-        
-        # Parse string inputs if needed
-        if isinstance(add_tags, str):
-            try:
-                add_tags = json.loads(add_tags)
-                if not isinstance(add_tags, list):
-                    raise ValueError("add_tags must be a list when parsed from JSON string")
-            except json.JSONDecodeError as e:
-                raise ToolError(
-                    f"Invalid JSON in add_tags parameter: {str(e)}. "
-                    "Expected format: '[\"tag1\", \"tag2\"]' or use a list directly."
-                )
-        
-        if isinstance(remove_tags, str):
-            try:
-                remove_tags = json.loads(remove_tags)
-                if not isinstance(remove_tags, list):
-                    raise ValueError("remove_tags must be a list when parsed from JSON string")
-            except json.JSONDecodeError as e:
-                raise ToolError(
-                    f"Invalid JSON in remove_tags parameter: {str(e)}. "
-                    "Expected format: '[\"tag1\", \"tag2\"]' or use a list directly."
-                )
-        
-        return await batch_update_properties(
-            search_criteria,
-            property_updates,
-            properties_to_remove,
-            add_tags,
-            remove_tags,
-            remove_inline_tags,
-            ctx
-        )
-    except ValueError as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to batch update properties: {str(e)}")
+    import json
+    
+    # Parse string inputs if needed
+    if isinstance(add_tags, str):
+        try:
+            add_tags = json.loads(add_tags)
+            if not isinstance(add_tags, list):
+                raise ValueError("add_tags must be a list when parsed from JSON string")
+        except json.JSONDecodeError as e:
+            raise ToolError(
+                f"Invalid JSON in add_tags parameter: {str(e)}. "
+                "Expected format: '[\"tag1\", \"tag2\"]' or use a list directly."
+            )
+    
+    if isinstance(remove_tags, str):
+        try:
+            remove_tags = json.loads(remove_tags)
+            if not isinstance(remove_tags, list):
+                raise ValueError("remove_tags must be a list when parsed from JSON string")
+        except json.JSONDecodeError as e:
+            raise ToolError(
+                f"Invalid JSON in remove_tags parameter: {str(e)}. "
+                "Expected format: '[\"tag1\", \"tag2\"]' or use a list directly."
+            )
+    
+    from .tools.organization import batch_update_properties
+    return await batch_update_properties(
+        search_criteria,
+        property_updates,
+        properties_to_remove,
+        add_tags,
+        remove_tags,
+        remove_inline_tags,
+        ctx
+    )
 
 @mcp.tool()
+@tool_errors("Failed to read image", (ValueError, FileNotFoundError))
 async def read_image_tool(
-    path: Annotated[str, Field(
+    path: Annotated[ImagePath, Field(
         description="Path to the image file relative to vault root",
-        pattern=r"^[^/].*\.(png|jpg|jpeg|gif|webp|svg|bmp|ico)$",
-        min_length=1,
-        max_length=255,
         examples=["attachments/screenshot.png", "images/diagram.jpg", "media/logo.svg"]
     )],
     include_metadata: Annotated[bool, Field(
@@ -1383,20 +1297,14 @@ async def read_image_tool(
     Returns:
         Image object that Claude can analyze and describe
     """
-    try:
-        return await read_image(path, include_metadata, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to read image: {str(e)}")
+    from .tools.image_management import read_image
+    return await read_image(path, include_metadata, ctx)
 
 @mcp.tool()
+@tool_errors("Failed to view note images", (ValueError, FileNotFoundError))
 async def view_note_images_tool(
-    path: Annotated[str, Field(
+    path: Annotated[NotePath, Field(
         description="Path to the note containing images",
-        pattern=r"^[^/].*\.md$",
-        min_length=1,
-        max_length=255,
         examples=["Projects/Design.md", "Daily/2024-01-15.md", "Ideas/Mockups.md"]
     )],
     image_index: Annotated[Optional[int], Field(
@@ -1427,12 +1335,8 @@ async def view_note_images_tool(
     Returns:
         List of Image objects that Claude can analyze and describe
     """
-    try:
-        return await view_note_images(path, image_index, max_width, ctx)
-    except (ValueError, FileNotFoundError) as e:
-        raise ToolError(str(e))
-    except Exception as e:
-        raise ToolError(f"Failed to view note images: {str(e)}")
+    from .tools.view_note_images import view_note_images
+    return await view_note_images(path, image_index, max_width, ctx)
 
 
 
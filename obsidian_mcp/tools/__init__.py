@@ -1,46 +1,56 @@
 """Tool modules for Obsidian MCP server."""
 
-from .note_management import (
-    read_note,
-    create_note,
-    update_note,
-    edit_note_section,
-    delete_note,
-)
-from .search_discovery import (
-    search_notes,
-    search_by_date,
-    search_by_regex,
-    search_by_property,
-    list_notes,
-    list_folders,
-)
-from .organization import (
-    move_note,
-    rename_note,
-    create_folder,
-    move_folder,
-    add_tags,
-    update_tags,
-    remove_tags,
-    get_note_info,
-    list_tags,
-    batch_update_properties,
-)
-from .link_management import (
-    get_backlinks,
-    get_outgoing_links,
-    find_broken_links,
-)
-from .find_orphaned_notes import (
-    find_orphaned_notes,
-)
-from .image_management import (
-    read_image,
-)
-from .view_note_images import (
-    view_note_images,
-)
+import importlib
+
+# Modules named after the tool they define are imported eagerly: loading the
+# submodule would otherwise rebind the package attribute to the module.
+from .find_orphaned_notes import find_orphaned_notes
+from .view_note_images import view_note_images
+
+# Other tools are imported from their module on first access, so starting the
+# server doesn't load every tool's dependencies up front
+_TOOL_MODULES = {
+    "read_note": ".note_management",
+    "create_note": ".note_management",
+    "update_note": ".note_management",
+    "edit_note_section": ".note_management",
+    "delete_note": ".note_management",
+    "search_notes": ".search_discovery",
+    "search_by_date": ".search_discovery",
+    "search_by_regex": ".search_discovery",
+    "search_by_property": ".search_discovery",
+    "list_notes": ".search_discovery",
+    "list_folders": ".search_discovery",
+    "move_note": ".organization",
+    "rename_note": ".organization",
+    "create_folder": ".organization",
+    "move_folder": ".organization",
+    "add_tags": ".organization",
+    "update_tags": ".organization",
+    "remove_tags": ".organization",
+    "get_note_info": ".organization",
+    "list_tags": ".organization",
+    "batch_update_properties": ".organization",
+    "get_backlinks": ".link_management",
+    "get_outgoing_links": ".link_management",
+    "find_broken_links": ".link_management",
+    "read_image": ".image_management",
+}
+
+
+def __getattr__(name: str):
+    """Import a tool function from its module on first access."""
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     # Note management
@@ -1,35 +1,88 @@
 """Find orphaned notes in the vault."""
 
+import asyncio
 import logging
 import re
-from typing import List, Dict, Any, Optional, Literal
+from operator import itemgetter
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Literal, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 from ..utils.filesystem import get_vault
 from ..utils import is_markdown_file
-from .link_management import get_backlinks, get_outgoing_links
 
 logger = logging.getLogger(__name__)
 
+# System properties that don't count as a note's own metadata
+_SYSTEM_PROPERTIES = frozenset(["tags", "aliases", "cssclass"])
 
-async def find_orphaned_notes(
+
+def _has_backlinks(link_graph, path: str) -> bool:
+    # Links are indexed by the path as written, so match the full path and
+    # the bare filename like get_backlinks does (self-links don't count)
+    return link_graph.has_sources((path, path.rsplit("/", 1)[-1]), ignore=path)
+
+
+def _has_no_links(link_graph, path: str) -> bool:
+    return not link_graph.forward.get(path) and not _has_backlinks(link_graph, path)
+
+
+def _no_backlinks(path: str, tags: List[str], frontmatter: Dict[str, Any], link_graph) -> bool:
+    return not _has_backlinks(link_graph, path)
+
+
+def _no_links(path: str, tags: List[str], frontmatter: Dict[str, Any], link_graph) -> bool:
+    return _has_no_links(link_graph, path)
+
+
+def _no_tags(path: str, tags: List[str], frontmatter: Dict[str, Any], link_graph) -> bool:
+    return not tags
+
+
+def _no_metadata(path: str, tags: List[str], frontmatter: Dict[str, Any], link_graph) -> bool:
+    return frontmatter.keys() <= _SYSTEM_PROPERTIES
+
+
+def _isolated(path: str, tags: List[str], frontmatter: Dict[str, Any], link_graph) -> bool:
+    return not tags and _has_no_links(link_graph, path)
+
+
+# Orphan criteria and their reasons, picked once per call. Each classifier only
+# looks at what it needs, e.g. tag checks never touch the link graph
+_CLASSIFIERS: Dict[str, Tuple[Callable[..., bool], str]] = {
+    "no_backlinks": (_no_backlinks, "No incoming links"),
+    "no_links": (_no_links, "No incoming or outgoing links"),
+    "no_tags": (_no_tags, "No tags"),
+    "no_metadata": (_no_metadata, "No metadata properties"),
+    "isolated": (_isolated, "No links and no tags"),
+}
+
+
+async def iter_orphaned_notes(
     orphan_type: str = "no_backlinks",
     exclude_folders: Optional[List[str]] = None,
     min_age_days: Optional[int] = None,
-    ctx=None
-) -> Dict[str, Any]:
+    ctx=None,
+    stats: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[Tuple[float, Dict[str, Any]]]:
     """
-    Find orphaned notes based on specified criteria.
+    Yield orphaned notes as they are found, in no particular order.
     
     Args:
         orphan_type: Type of orphaned notes to find
         exclude_folders: Folders to exclude from search
         min_age_days: Only include notes older than X days
         ctx: MCP context for progress reporting
+        stats: If given, filled with the scan statistics before the first note is yielded
         
-    Returns:
-        Dictionary containing orphaned notes and statistics
+    Yields:
+        Tuples of the note's modification timestamp and its orphan record
     """
+    if orphan_type not in _CLASSIFIERS:
+        raise ValueError(f"Invalid orphan type: {orphan_type}. Must be one of: {', '.join(_CLASSIFIERS)}")
+    
+    # Pick the criteria once rather than comparing orphan_type for every note
+    is_orphaned, orphan_reason = _CLASSIFIERS[orphan_type]
+    
     vault = get_vault()
     
     # Default exclusions if not specified
@@ -39,140 +92,130 @@ async def find_orphaned_notes(
     if ctx:
         ctx.info(f"Finding orphaned notes of type: {orphan_type}")
     
-    # Get all notes
-    all_notes = await vault.list_notes(recursive=True)
-    orphaned_notes = []
+    # Get all notes; excluded folders are never walked
+    all_notes = await vault.list_notes(recursive=True, exclude_folders=exclude_folders)
+    
+    # One refresh of the metadata index gives the link graph, tags and
+    # frontmatter of the whole vault. Entries are validated by mtime and size,
+    # so repeated runs on an unchanged vault re-read nothing to classify notes.
+    index = await vault.refresh_metadata_index()
+    link_graph = index.link_graph
     
     # Calculate date threshold if min_age_days is specified
     date_threshold = None
+    threshold_ts = None
     if min_age_days is not None:
         date_threshold = datetime.now() - timedelta(days=min_age_days)
+        threshold_ts = date_threshold.timestamp()
     
-    # Process each note
+    # Process notes concurrently; each one is I/O bound (note read, link lookups)
     total_notes = len(all_notes)
-    for i, note_info in enumerate(all_notes):
+    semaphore = asyncio.Semaphore(16)
+    processed = 0
+    
+    async def process_note(note_info: Dict[str, str]) -> Optional[Tuple[float, Dict[str, Any]]]:
+        nonlocal processed
         path = note_info["path"]
         
-        # Skip excluded folders
-        if any(path.startswith(folder + "/") or path.startswith(folder + "\\") 
-               for folder in exclude_folders):
-            continue
-        
-        # Skip if file is in root and we're excluding root level files
-        if "/" not in path and "\\" not in path:
-            # Root level file - you might want to handle these differently
-            pass
-        
         try:
-            # Read note to get full information
-            note = await vault.read_note(path)
-            
-            # Check age if threshold is set
-            if date_threshold and note.metadata.modified:
-                # Handle both timezone-aware and naive datetime strings
-                mod_str = note.metadata.modified
-                if mod_str.endswith('Z'):
-                    mod_str = mod_str[:-1] + '+00:00'
-                try:
-                    # Try to parse with timezone
-                    mod_time = datetime.fromisoformat(mod_str)
-                except ValueError:
-                    # If that fails, parse as naive and assume local timezone
-                    mod_time = datetime.fromisoformat(mod_str.split('+')[0].split('.')[0])
-                
-                # Make date_threshold timezone-naive for comparison
-                if mod_time.tzinfo is not None:
-                    mod_time = mod_time.replace(tzinfo=None)
-                
-                if mod_time > date_threshold:
-                    continue  # Skip recent notes
-            
-            # Check orphan criteria
-            is_orphaned = False
-            orphan_reason = ""
-            
-            if orphan_type == "no_backlinks":
-                # Get backlinks for this note
-                backlinks_result = await get_backlinks(path)
-                backlinks = backlinks_result.get("backlinks", [])
-                if not backlinks or len(backlinks) == 0:
-                    is_orphaned = True
-                    orphan_reason = "No incoming links"
-                    
-            elif orphan_type == "no_links":
-                # Check both incoming and outgoing links
-                backlinks_result = await get_backlinks(path)
-                backlinks = backlinks_result.get("backlinks", [])
-                outgoing_result = await get_outgoing_links(path)
-                outgoing = outgoing_result.get("outgoing_links", [])
-                if (not backlinks or len(backlinks) == 0) and (not outgoing or len(outgoing) == 0):
-                    is_orphaned = True
-                    orphan_reason = "No incoming or outgoing links"
-                    
-            elif orphan_type == "no_tags":
-                # Check if note has any tags
-                if not note.metadata.tags or len(note.metadata.tags) == 0:
-                    is_orphaned = True
-                    orphan_reason = "No tags"
-                    
-            elif orphan_type == "no_metadata":
-                # Check if note has any frontmatter properties (beyond basic ones)
-                frontmatter = note.metadata.frontmatter
-                # Remove system properties
-                user_properties = {k: v for k, v in frontmatter.items() 
-                                 if k not in ["tags", "aliases", "cssclass"]}
-                if not user_properties:
-                    is_orphaned = True
-                    orphan_reason = "No metadata properties"
-                    
-            elif orphan_type == "isolated":
-                # Multiple criteria: no links AND no tags
-                backlinks_result = await get_backlinks(path)
-                backlinks = backlinks_result.get("backlinks", [])
-                outgoing_result = await get_outgoing_links(path)
-                outgoing = outgoing_result.get("outgoing_links", [])
-                has_no_links = (not backlinks or len(backlinks) == 0) and (not outgoing or len(outgoing) == 0)
-                has_no_tags = not note.metadata.tags or len(note.metadata.tags) == 0
-                
-                if has_no_links and has_no_tags:
-                    is_orphaned = True
-                    orphan_reason = "No links and no tags"
-            
-            if is_orphaned:
-                # Calculate size and word count
-                content = note.content
-                size_bytes = len(content.encode('utf-8'))
-                word_count = len(content.split())
-                
-                orphaned_notes.append({
-                    "path": path,
-                    "reason": orphan_reason,
-                    "modified": note.metadata.modified.isoformat() if note.metadata.modified else None,
-                    "size": size_bytes,
-                    "word_count": word_count
-                })
-                
+            async with semaphore:
+                return await classify_note(path)
         except Exception as e:
             logger.warning(f"Error processing note {path}: {e}")
-            continue
-        
-        # Progress reporting
-        if ctx and (i + 1) % 50 == 0:
-            ctx.info(f"Processed {i + 1}/{total_notes} notes...")
+            return None
+        finally:
+            # Progress reporting
+            processed += 1
+            if ctx and processed % 50 == 0:
+                ctx.info(f"Processed {processed}/{total_notes} notes...")
     
-    # Sort by modified date (oldest first)
-    orphaned_notes.sort(key=lambda x: x.get("modified", ""), reverse=False)
+    async def classify_note(path: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        stat = (vault.vault_path / path).stat()
+        
+        # Skip recent notes before reading them (the note's modified time is
+        # this same st_mtime)
+        if threshold_ts is not None and stat.st_mtime > threshold_ts:
+            return None
+        
+        note = None
+        entry = index.entries.get(path)
+        if entry is None:
+            # Not indexed (e.g. created during the scan), so read it directly
+            note = await vault.read_note(path)
+            tags, frontmatter = note.metadata.tags, note.metadata.frontmatter
+        else:
+            tags, frontmatter = entry["tags"], entry["frontmatter"]
+        
+        if not is_orphaned(path, tags, frontmatter, link_graph):
+            return None
+        
+        # Size and modified time come from the stat; only the word count needs the content
+        if note is None:
+            note = await vault.read_note(path)
+        content = note.content
+        size_bytes = stat.st_size
+        word_count = len(content.split())
+        
+        # Paired with the raw mtime so results sort on a float, not the ISO string
+        return stat.st_mtime, {
+            "path": path,
+            "reason": orphan_reason,
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "size": size_bytes,
+            "word_count": word_count
+        }
     
     # Prepare summary statistics
-    stats = {
-        "total_notes_scanned": total_notes,
-        "excluded_folders": exclude_folders,
-        "orphan_type": orphan_type,
-        "min_age_days": min_age_days
-    }
-    
-    if min_age_days:
-        stats["date_threshold"] = date_threshold.isoformat()
+    if stats is not None:
+        stats.update({
+            "total_notes_scanned": total_notes,
+            "excluded_folders": exclude_folders,
+            "orphan_type": orphan_type,
+            "min_age_days": min_age_days
+        })
+        
+        if min_age_days:
+            stats["date_threshold"] = date_threshold.isoformat()
+    
+    # Hand out orphans as soon as they are classified; if the caller stops
+    # early, the notes still being processed are cancelled
+    tasks = [asyncio.ensure_future(process_note(note_info)) for note_info in all_notes]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result is not None:
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def find_orphaned_notes(
+    orphan_type: str = "no_backlinks",
+    exclude_folders: Optional[List[str]] = None,
+    min_age_days: Optional[int] = None,
+    ctx=None
+) -> Dict[str, Any]:
+    """
+    Find orphaned notes based on specified criteria.
+    
+    Args:
+        orphan_type: Type of orphaned notes to find
+        exclude_folders: Folders to exclude from search
+        min_age_days: Only include notes older than X days
+        ctx: MCP context for progress reporting
+        
+    Returns:
+        Dictionary containing orphaned notes and statistics
+    """
+    stats: Dict[str, Any] = {}
+    orphans = [
+        orphan async for orphan in iter_orphaned_notes(orphan_type, exclude_folders, min_age_days, ctx, stats)
+    ]
+    
+    # Sort by modified date (oldest first)
+    orphans.sort(key=itemgetter(0))
+    orphaned_notes = [record for _, record in orphans]
     
     return {
         "orphaned_notes": orphaned_notes,
@@ -1,12 +1,12 @@
 """Image management tools for Obsidian MCP server."""
 
-import base64
+import os
 from typing import Optional, Union, Dict, Any
 from fastmcp import Context
 from fastmcp.utilities.types import Image
 from ..utils.filesystem import get_vault
 from ..utils import validate_note_path, sanitize_path
-from ..constants import ERROR_MESSAGES
+from ..constants import format_error, IMAGE_SUFFIXES, IMAGE_MIME_TYPES, IMAGE_FORMATS
 
 
 async def read_image(
@@ -56,10 +56,8 @@ async def read_image(
         raise ValueError("Path cannot be empty")
     
     # Check for common image extensions
-    valid_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.bmp', '.ico'}
-    ext = path.lower().split('.')[-1] if '.' in path else ''
-    if f'.{ext}' not in valid_extensions:
-        raise ValueError(f"Invalid image file extension. Supported: {', '.join(valid_extensions)}")
+    if os.path.splitext(path)[1].lower() not in IMAGE_MIME_TYPES:
+        raise ValueError(f"Invalid image file extension. Supported: {', '.join(IMAGE_SUFFIXES)}")
     
     # Don't sanitize path for images - it adds .md extension
     
@@ -69,25 +67,12 @@ async def read_image(
     vault = get_vault()
     
     try:
-        image_data = await vault.read_image(path, max_width=max_width)
+        image_bytes, image_data = await vault.read_image_bytes(path, max_width=max_width)
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
-    
-    # Convert base64 content back to bytes for Image object
-    image_bytes = base64.b64decode(image_data["content"])
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Extract format from mime type
-    mime_to_format = {
-        "image/png": "png",
-        "image/jpeg": "jpeg",
-        "image/jpg": "jpeg",
-        "image/gif": "gif",
-        "image/webp": "webp",
-        "image/svg+xml": "svg",
-        "image/bmp": "bmp",
-        "image/x-icon": "ico"
-    }
-    format_type = mime_to_format.get(image_data["mime_type"], "png")
+    format_type = IMAGE_FORMATS.get(image_data["mime_type"], "png")
     
     if include_metadata:
         # If metadata is requested, return both Image and metadata in a dict
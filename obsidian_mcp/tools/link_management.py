@@ -1,65 +1,55 @@
 """Link management tools for Obsidian MCP server."""
 
-import re
-import asyncio
-from typing import List, Optional, Dict, Set, Tuple
+from typing import Iterator, List, Optional, Dict, Set
 from ..utils.filesystem import get_vault
 from ..utils import is_markdown_file
 from ..utils.validation import validate_note_path
+from ..utils.link_graph import WIKI_LINK_PATTERN, LINK_PATTERN, extract_links_from_content
 
 
-# Regular expressions for matching different link types
-WIKI_LINK_PATTERN = re.compile(r'\[\[([^\]|]+)(\|([^\]]+))?\]\]')
-MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
-
-# Cache for vault structure to avoid repeated scans
-_vault_notes_cache: Optional[Dict[str, str]] = None
-_cache_timestamp: Optional[float] = None
+# How long a vault's note-name lookup is reused before the vault is rescanned
 CACHE_TTL = 300  # 5 minutes
 
+# Linking notes read per batch when collecting backlinks
+BACKLINK_READ_CHUNK = 64
+
+
+def note_name_key(name: str) -> str:
+    """Canonical lookup key for a note name: lowercased, without '.md'."""
+    name = name.lower()
+    return name[:-3] if name.endswith('.md') else name
+
 
 async def build_vault_notes_index(vault, force_refresh: bool = False) -> Dict[str, str]:
     """
     Build an index of all notes in the vault.
-    Maps note names to their full paths.
+    Maps note names (as note_name_key) to their full paths, so one entry per
+    note serves lookups with or without '.md' and in any letter case, like
+    Obsidian's own link resolution.
     
-    This is cached for performance.
+    This is cached on the vault for performance. Concurrent callers wait for
+    one rebuild instead of each rescanning the vault.
     """
-    global _vault_notes_cache, _cache_timestamp
     import time
     
-    # Check if we can use cache
-    if not force_refresh and _vault_notes_cache is not None:
-        if _cache_timestamp and (time.time() - _cache_timestamp) < CACHE_TTL:
-            return _vault_notes_cache
-    
-    # Build fresh index
-    notes_index = {}
-    
-    # Get all notes from the vault
-    all_notes = await vault.list_notes(recursive=True)
-    
-    for note_info in all_notes:
-        full_path = note_info["path"]
-        note_name = note_info["name"]
+    async with vault._notes_index_lock:
+        # Check if we can use cache
+        if not force_refresh and vault._notes_index_cache is not None:
+            if vault._notes_index_ts and (time.time() - vault._notes_index_ts) < CACHE_TTL:
+                return vault._notes_index_cache
+        
+        # Get all notes from the vault
+        all_notes = await vault.list_notes(recursive=True)
         
-        # Map both with and without .md extension
-        notes_index[note_name] = full_path
-        if note_name.endswith('.md'):
-            notes_index[note_name[:-3]] = full_path
+        # Build fresh index (a note's name is its filename)
+        notes_index = {note_name_key(note_info["name"]): note_info["path"] for note_info in all_notes}
         
-        # Also map by just the filename without path
-        filename = full_path.split('/')[-1]
-        if filename != note_name:
-            notes_index[filename] = full_path
-            if filename.endswith('.md'):
-                notes_index[filename[:-3]] = full_path
-    
-    # Update cache
-    _vault_notes_cache = notes_index
-    _cache_timestamp = time.time()
-    
-    return notes_index
+        # Update cache
+        vault._notes_index_cache = notes_index
+        vault._notes_index_paths = frozenset(notes_index.values())
+        vault._notes_index_ts = time.time()
+        
+        return notes_index
 
 
 async def find_notes_by_names(vault, note_names: List[str]) -> Dict[str, Optional[str]]:
@@ -70,6 +60,7 @@ async def find_notes_by_names(vault, note_names: List[str]) -> Dict[str, Optiona
     """
     # Build or get cached index
     notes_index = await build_vault_notes_index(vault)
+    note_paths = vault._notes_index_paths
     
     results = {}
     for name in note_names:
@@ -77,11 +68,11 @@ async def find_notes_by_names(vault, note_names: List[str]) -> Dict[str, Optiona
         lookup_name = name if name.endswith('.md') else name + '.md'
         
         # First check if it's already a full path that exists
-        if lookup_name in notes_index.values():
+        if lookup_name in note_paths:
             results[name] = lookup_name
         else:
             # Look up by filename
-            results[name] = notes_index.get(lookup_name) or notes_index.get(name)
+            results[name] = notes_index.get(note_name_key(name))
     
     return results
 
@@ -89,6 +80,9 @@ async def find_notes_by_names(vault, note_names: List[str]) -> Dict[str, Optiona
 async def check_links_validity_batch(vault, links: List[Dict[str, str]]) -> List[Dict[str, any]]:
     """
     Check validity of multiple links in batch for performance.
+    
+    The link dicts are updated in place (callers pass freshly built ones) and
+    the same list is returned.
     """
     # Get unique paths to check
     unique_paths = list(set(link['path'] for link in links))
@@ -97,64 +91,12 @@ async def check_links_validity_batch(vault, links: List[Dict[str, str]]) -> List
     found_paths = await find_notes_by_names(vault, unique_paths)
     
     # Update links with validity info
-    results = []
+    found_path_of = found_paths.get
     for link in links:
-        link_copy = link.copy()
-        found_path = found_paths.get(link['path'])
-        link_copy['exists'] = found_path is not None
+        found_path = found_path_of(link['path'])
+        link['exists'] = found_path is not None
         if found_path and found_path != link['path']:
-            link_copy['actual_path'] = found_path
-        results.append(link_copy)
-    
-    return results
-
-
-def extract_links_from_content(content: str) -> List[dict]:
-    """
-    Extract all links from note content.
-    
-    Finds both wiki-style ([[Link]]) and markdown-style ([text](link)) links.
-    
-    Args:
-        content: The note content to extract links from
-        
-    Returns:
-        List of link dictionaries with path, display text, and type
-    """
-    links = []
-    
-    # Extract wiki-style links
-    for match in WIKI_LINK_PATTERN.finditer(content):
-        link_path = match.group(1).strip()
-        alias = match.group(3)
-        
-        # Ensure .md extension for internal links
-        if not link_path.endswith('.md') and not link_path.startswith('http'):
-            link_path += '.md'
-        
-        links.append({
-            'path': link_path,
-            'display_text': alias.strip() if alias else match.group(1).strip(),
-            'type': 'wiki'
-        })
-    
-    # Extract markdown-style links (only internal links, not URLs)
-    for match in MARKDOWN_LINK_PATTERN.finditer(content):
-        link_path = match.group(2).strip()
-        
-        # Skip external URLs
-        if link_path.startswith('http://') or link_path.startswith('https://'):
-            continue
-        
-        # Ensure .md extension
-        if not link_path.endswith('.md'):
-            link_path += '.md'
-        
-        links.append({
-            'path': link_path,
-            'display_text': match.group(1).strip(),
-            'type': 'markdown'
-        })
+            link['actual_path'] = found_path
     
     return links
 
@@ -177,12 +119,14 @@ def get_link_context(content: str, match, context_length: int = 100) -> str:
     # Extract context
     context = content[start:end]
     
-    # Add ellipsis if truncated
+    # Add ellipsis if truncated, building the result in one step; only ends
+    # without an ellipsis have whitespace trimmed
     if start > 0:
-        context = "..." + context
+        if end < len(content):
+            return f"...{context}..."
+        return f"...{context.rstrip()}"
     if end < len(content):
-        context = context + "..."
-    
+        return f"{context.lstrip()}..."
     return context.strip()
 
 
@@ -190,6 +134,7 @@ async def get_backlinks(
     path: str,
     include_context: bool = True,
     context_length: int = 100,
+    limit: Optional[int] = None,
     ctx=None
 ) -> dict:
     """
@@ -202,6 +147,7 @@ async def get_backlinks(
         path: Path to the target note
         include_context: Whether to include surrounding text context
         context_length: Characters of context to include (default 100)
+        limit: Maximum number of backlinks to return (default: all)
         ctx: MCP context for progress reporting
         
     Returns:
@@ -238,15 +184,17 @@ async def get_backlinks(
     
     vault = get_vault()
     
-    # Verify the target note exists
-    try:
-        note = await vault.read_note(path)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Note not found: {path}")
+    # Only notes the link graph says link to the target need to be read
+    index = await vault.refresh_metadata_index()
     
-    # Build notes index
-    notes_index = await build_vault_notes_index(vault)
-    all_note_paths = list(set(notes_index.values()))  # Use set to get unique paths
+    # Verify the target note exists; the freshly refreshed index already knows
+    # every note it covers, so only notes outside it (e.g. in skipped folders)
+    # are read
+    if path not in index.entries:
+        try:
+            await vault.read_note(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Note not found: {path}")
     
     # Create variations of the target path to match against
     target_names = [path]
@@ -261,78 +209,84 @@ async def get_backlinks(
         if filename_no_ext not in target_names:
             target_names.append(filename_no_ext)
     
+    # Link targets are indexed with '.md' appended, so the full path and the
+    # bare filename cover every variation above
+    source_paths = sorted(index.link_graph.sources_of({path, filename}) - {path})
+    
+    # Every '.md' variation is listed with and without the extension, so a link
+    # matches when its text is in this set, with or without '.md' appended
+    target_set = frozenset(target_names)
+    
     if ctx:
         ctx.info(f"Will match against variations: {target_names}")
-        ctx.info(f"Scanning {len(all_note_paths)} notes...")
+        ctx.info(f"Scanning {len(source_paths)} linking notes...")
     
-    # Process notes in parallel batches
     backlinks = []
-    batch_size = 10  # Process 10 notes at a time
     
-    async def check_note_for_backlinks(note_path: str) -> List[dict]:
-        """Check a single note for backlinks."""
-        if note_path == path:
-            return []
+    def make_backlink(note_path: str, content: str, match, link_text: str, link_type: str) -> dict:
+        backlink_info = {
+            'source_path': note_path,
+            'link_text': link_text,
+            'link_type': link_type
+        }
         
-        try:
-            note = await vault.read_note(note_path)
-            
-            content = note.content
-            note_backlinks = []
-            
-            # Check for wiki-style links
-            for match in WIKI_LINK_PATTERN.finditer(content):
-                linked_path = match.group(1).strip()
-                
-                # Check if this link matches our target
-                is_match = False
-                if linked_path in target_names:
-                    is_match = True
-                elif linked_path + '.md' in target_names:
-                    is_match = True
-                
-                if is_match:
-                    alias = match.group(3)
-                    link_text = alias.strip() if alias else match.group(1).strip()
-                    
-                    backlink_info = {
-                        'source_path': note_path,
-                        'link_text': link_text,
-                        'link_type': 'wiki'
-                    }
-                    
-                    if include_context:
-                        backlink_info['context'] = get_link_context(content, match, context_length)
-                    
-                    note_backlinks.append(backlink_info)
-            
-            # Check for markdown-style links
-            for match in MARKDOWN_LINK_PATTERN.finditer(content):
-                link_path = match.group(2).strip()
-                if link_path in target_names:
-                    backlink_info = {
-                        'source_path': note_path,
-                        'link_text': match.group(1).strip(),
-                        'link_type': 'markdown'
-                    }
-                    
-                    if include_context:
-                        backlink_info['context'] = get_link_context(content, match, context_length)
-                    
-                    note_backlinks.append(backlink_info)
-            
-            return note_backlinks
-            
-        except Exception:
-            return []
-    
-    # Process in batches
-    for i in range(0, len(all_note_paths), batch_size):
-        batch = all_note_paths[i:i + batch_size]
-        batch_results = await asyncio.gather(*[check_note_for_backlinks(np) for np in batch])
+        if include_context:
+            backlink_info['context'] = get_link_context(content, match, context_length)
+        
+        return backlink_info
+    
+    def check_note_for_backlinks(note_path: str, content: str) -> Iterator[dict]:
+        """
+        Yield a single note's backlinks, wiki-style ones first.
+        
+        Each backlink (and its context) is only built when it is yielded, so
+        nothing is built for links past the limit.
+        """
+        markdown_matches = []
         
-        for note_backlinks in batch_results:
-            backlinks.extend(note_backlinks)
+        # Context needs each link's position, otherwise findall's plain group
+        # tuples are enough and no match objects are built
+        matches = LINK_PATTERN.finditer(content) if include_context else LINK_PATTERN.findall(content)
+        
+        # One pass finds both link types
+        for match in matches:
+            linked_path, _, alias, text, url = match.groups() if include_context else match
+            if linked_path:
+                # Wiki-style link: check if it matches our target
+                linked_path = linked_path.strip()
+                if linked_path in target_set:
+                    yield make_backlink(note_path, content, match, alias.strip() if alias else linked_path, 'wiki')
+            elif url.strip() in target_set:
+                # Markdown-style links are listed after the wiki-style ones
+                markdown_matches.append((match, text))
+        
+        for match, text in markdown_matches:
+            yield make_backlink(note_path, content, match, text.strip(), 'markdown')
+    
+    async def iter_backlinks():
+        # Read the linking notes a chunk at a time (each chunk concurrently), so
+        # only one chunk's text is held. Every linking note holds at least one
+        # backlink, so with a limit no more notes are read than could still be
+        # needed (plus one to tell whether the results are truncated).
+        i = 0
+        while i < len(source_paths):
+            chunk_size = BACKLINK_READ_CHUNK
+            if limit is not None:
+                chunk_size = min(chunk_size, limit + 1 - len(backlinks))
+            chunk = source_paths[i:i + chunk_size]
+            i += len(chunk)
+            contents = await vault.read_many(chunk)
+            for note_path, content in zip(chunk, contents):
+                if content is not None:
+                    for backlink_info in check_note_for_backlinks(note_path, content):
+                        yield backlink_info
+    
+    truncated = False
+    async for backlink_info in iter_backlinks():
+        if limit is not None and len(backlinks) >= limit:
+            truncated = True
+            break
+        backlinks.append(backlink_info)
     
     if ctx:
         ctx.info(f"Found {len(backlinks)} backlinks")
@@ -342,12 +296,14 @@ async def get_backlinks(
         'findings': backlinks,
         'summary': {
             'backlink_count': len(backlinks),
-            'sources': len(set(bl['source_path'] for bl in backlinks))  # Unique source notes
+            'sources': len(set(bl['source_path'] for bl in backlinks)),  # Unique source notes
+            'truncated': truncated
         },
         'target': path,
         'scope': {
             'include_context': include_context,
-            'context_length': context_length
+            'context_length': context_length,
+            'limit': limit
         }
     }
 
@@ -403,17 +359,12 @@ async def get_outgoing_links(
     
     vault = get_vault()
     
-    # Read the note content
+    # Extract all links (served from the metadata index when it is current)
     try:
-        note = await vault.read_note(path)
+        links = [link._asdict() for link in await vault.get_note_links(path)]
     except FileNotFoundError:
         raise FileNotFoundError(f"Note not found: {path}")
     
-    content = note.content
-    
-    # Extract all links
-    links = extract_links_from_content(content)
-    
     # Check validity if requested - in batch!
     if check_validity:
         if ctx:
@@ -456,13 +407,14 @@ async def find_broken_links(
         
     Returns:
         Dictionary containing:
-        - broken_link_count: Total number of broken links
+        - broken_link_count: Number of distinct broken links (per source note)
         - affected_notes: Number of notes containing broken links
         - broken_links: List of broken link details including:
           - source_path: Note containing the broken link
           - broken_link: The path that doesn't exist
-          - link_text: The display text of the link
+          - link_text: The display text of the link's first occurrence
           - link_type: 'wiki' or 'markdown'
+          - count: How many times the note links to that path
           
     Example:
         {
@@ -473,7 +425,8 @@ async def find_broken_links(
                     "source_path": "Daily/2024-01-15.md",
                     "broken_link": "Projects/Old Project.md",
                     "link_text": "Old Project",
-                    "link_type": "wiki"
+                    "link_type": "wiki",
+                    "count": 1
                 }
             ]
         }
@@ -489,70 +442,78 @@ async def find_broken_links(
     
     vault = get_vault()
     
+    # Links of unchanged notes come straight from the metadata index
+    index = await vault.refresh_metadata_index()
+    
     # Get notes to check
     notes_to_check = []
     if single_note:
-        notes_to_check = [single_note]
+        notes_to_check = [single_note if single_note.endswith('.md') else single_note + '.md']
+    elif directory:
+        # Notes in the directory, found by bisecting the index's sorted paths
+        notes_to_check = index.paths_under(directory)
     else:
-        # Build index to get all notes
-        notes_index = await build_vault_notes_index(vault)
-        all_notes = list(set(notes_index.values()))  # Get unique paths
-        
-        if directory:
-            # Filter to directory
-            notes_to_check = [n for n in all_notes if n.startswith(directory + '/') or n.startswith(directory)]
-        else:
-            notes_to_check = all_notes
+        notes_to_check = list(index.entries)
     
     if ctx:
         ctx.info(f"Checking {len(notes_to_check)} notes...")
     
-    # Collect all links from all notes
+    # Collect links from the index; only notes it doesn't cover have to be read
     all_links_by_note = {}
-    batch_size = 10
-    
-    async def get_note_links(note_path: str) -> Tuple[str, List[dict]]:
-        """Get all links from a note."""
-        try:
-            note = await vault.read_note(note_path)
-            return note_path, extract_links_from_content(note.content)
-        except Exception:
-            return note_path, []
-    
-    # Process notes in batches
-    for i in range(0, len(notes_to_check), batch_size):
-        batch = notes_to_check[i:i + batch_size]
-        batch_results = await asyncio.gather(*[get_note_links(np) for np in batch])
-        
-        for note_path, links in batch_results:
-            if links:
-                all_links_by_note[note_path] = links
+    unindexed = []
+    for note_path in notes_to_check:
+        links = index.get_links(note_path)
+        if links is None:
+            unindexed.append(note_path)
+        elif links:
+            all_links_by_note[note_path] = links
+    
+    contents = await vault.read_many(unindexed)
+    for note_path, content in zip(unindexed, contents):
+        if content is None:
+            continue
+        links = extract_links_from_content(content)
+        if links:
+            all_links_by_note[note_path] = links
     
     # Get all unique link paths
     all_link_paths = set()
     for links in all_links_by_note.values():
         for link in links:
-            all_link_paths.add(link['path'])
+            all_link_paths.add(link.path)
     
     if ctx:
         ctx.info(f"Checking validity of {len(all_link_paths)} unique links...")
     
-    # Check which links exist - in one batch!
-    found_paths = await find_notes_by_names(vault, list(all_link_paths))
+    # Links naming an existing note path resolve directly; only the rest
+    # (e.g. bare filenames of nested notes) need the name lookup
+    existing_notes = frozenset(index.entries)
+    unresolved = [p for p in all_link_paths if p not in existing_notes]
+    found_paths = await find_notes_by_names(vault, unresolved)
+    valid_paths = existing_notes.union(p for p, found in found_paths.items() if found)
     
-    # Find broken links
+    # Find broken links, reporting each (source, target) pair once with the
+    # text and type of its first occurrence
     broken_links = []
+    broken_by_pair = {}
     affected_notes_set = set()
     
     for note_path, links in all_links_by_note.items():
         for link in links:
-            if not found_paths.get(link['path']):
+            if link.path not in valid_paths:
+                broken_link_info = broken_by_pair.get((note_path, link.path))
+                if broken_link_info is not None:
+                    broken_link_info['count'] += 1
+                    continue
+                
                 broken_link_info = {
                     'source_path': note_path,
-                    'broken_link': link['path'],
-                    'link_text': link['display_text'],
-                    'link_type': link['type']
+                    'broken_link': link.path,
+                    'link_text': link.display_text,
+                    'link_type': link.type,
+                    'count': 1
                 }
+                broken_by_pair[(note_path, link.path)] = broken_link_info
                 broken_links.append(broken_link_info)
                 affected_notes_set.add(note_path)
     
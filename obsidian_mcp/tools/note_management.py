@@ -7,8 +7,13 @@ from fastmcp import Context
 from ..utils.filesystem import get_vault
 from ..utils import validate_note_path, sanitize_path
 from ..utils.validation import validate_content
+from ..utils.link_graph import IMAGE_PATTERN
 from ..models import Note
-from ..constants import ERROR_MESSAGES
+from ..constants import format_error, IMAGE_LOAD_CONCURRENCY
+
+# Markdown heading: level markers and heading text
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+HEADING_LEVEL_PATTERN = re.compile(r'^(#{1,6})\s+')
 
 
 async def read_note(
@@ -57,7 +62,7 @@ async def read_note(
     try:
         note = await vault.read_note(path)
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Return standardized CRUD success structure
     return {
@@ -138,26 +143,21 @@ async def _extract_and_load_images(
     
     Supports both Obsidian wiki-style (![[image.png]]) and standard markdown (![alt](image.png)) formats.
     """
-    # Pattern for wiki-style embeds: ![[image.png]]
-    wiki_pattern = r'!\[\[([^]]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico))\]\]'
-    # Pattern for standard markdown: ![alt text](image.png)
-    markdown_pattern = r'!\[[^\]]*\]\(([^)]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico))\)'
-    
-    # Find all image references
-    image_paths = set()
-    
-    for match in re.finditer(wiki_pattern, content, re.IGNORECASE):
-        image_paths.add(match.group(1))
-    
-    for match in re.finditer(markdown_pattern, content, re.IGNORECASE):
-        image_paths.add(match.group(1))
+    # Find all image references (both styles in one pass)
+    image_paths = {match.group(1) or match.group(2) for match in IMAGE_PATTERN.finditer(content)}
     
     # Load all images concurrently for better performance
     if not image_paths:
         return []
     
-    # Create tasks for all images
-    tasks = [_search_and_load_image(image_ref, vault, ctx) for image_ref in image_paths]
+    # Create tasks for all images, a bounded number of which load at a time
+    semaphore = asyncio.Semaphore(IMAGE_LOAD_CONCURRENCY)
+    
+    async def load_image(image_ref: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await _search_and_load_image(image_ref, vault, ctx)
+    
+    tasks = [load_image(image_ref) for image_ref in image_paths]
     
     # Execute all tasks concurrently
     results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -229,7 +229,7 @@ async def create_note(
         created = True
     except FileExistsError:
         if not overwrite:
-            raise FileExistsError(ERROR_MESSAGES["overwrite_protection"].format(path=path))
+            raise FileExistsError(format_error("overwrite_protection", path=path))
         # If we get here, overwrite is True but file exists - this shouldn't happen
         # with our write_note implementation, but handle it just in case
         note = await vault.write_note(path, content, overwrite=True)
@@ -324,7 +324,7 @@ async def update_note(
                 }
             }
         else:
-            raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
+            raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Handle merge strategies
     if merge_strategy == "append":
@@ -418,10 +418,10 @@ async def edit_note_section(
         existing_note = await vault.read_note(path)
         note_content = existing_note.content
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Parse the section identifier to extract heading level and text
-    heading_match = re.match(r'^(#{1,6})\s+(.+)$', section_identifier)
+    heading_match = HEADING_PATTERN.match(section_identifier)
     if not heading_match:
         raise ValueError(f"Invalid section identifier: {section_identifier}. Must be a markdown heading (e.g., '## Section Name')")
     
@@ -435,7 +435,7 @@ async def edit_note_section(
     
     # Find the section
     for i, line in enumerate(lines):
-        line_match = re.match(r'^(#{1,6})\s+(.+)$', line)
+        line_match = HEADING_PATTERN.match(line)
         if line_match:
             line_level = len(line_match.group(1))
             line_text = line_match.group(2).strip()
@@ -446,7 +446,7 @@ async def edit_note_section(
                 
                 # Find where this section ends (next heading of same or higher level, or end of file)
                 for j in range(i + 1, len(lines)):
-                    next_match = re.match(r'^(#{1,6})\s+', lines[j])
+                    next_match = HEADING_LEVEL_PATTERN.match(lines[j])
                     if next_match:
                         next_level = len(next_match.group(1))
                         if next_level <= heading_level:
@@ -572,7 +572,7 @@ async def delete_note(path: str, ctx: Optional[Context] = None) -> dict:
         await vault.delete_note(path)
         deleted = True
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Return standardized CRUD success structure
     return {
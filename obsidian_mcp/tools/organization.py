@@ -4,10 +4,19 @@ import re
 from typing import List, Dict, Any, Optional
 from fastmcp import Context
 from ..utils.filesystem import get_vault
+from ..utils.frontmatter import yaml_safe_load
 from ..utils import validate_note_path, sanitize_path, is_markdown_file
 from ..utils.validation import validate_tags
 from ..models import Note, NoteMetadata, Tag
-from ..constants import ERROR_MESSAGES
+from ..constants import format_error
+
+# Fixed patterns, compiled once
+WIKILINK_PATTERN = re.compile(r'\[\[([^\]]+)\]\]')
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+FLOW_LIST_PATTERN = re.compile(r'\[(.*?)\]')
+FENCED_CODE_PATTERN = re.compile(r'```[\s\S]*?```')
+INLINE_CODE_PATTERN = re.compile(r'`[^`]+`')
+MULTI_SPACE_PATTERN = re.compile(r'  +')
 
 
 async def move_note(
@@ -88,7 +97,7 @@ async def move_note(
         search_result = await search_notes(f"path:{source_filename}", max_results=10, ctx=None)
         
         if search_result["count"] == 0:
-            raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=source_path))
+            raise FileNotFoundError(format_error("note_not_found", path=source_path))
         elif search_result["count"] == 1:
             # Exactly one match - use it
             found_path = search_result["results"][0]["path"]
@@ -298,7 +307,7 @@ async def rename_note(
         search_result = await search_notes(f"path:{old_filename}", max_results=10, ctx=None)
         
         if search_result["count"] == 0:
-            raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=old_path))
+            raise FileNotFoundError(format_error("note_not_found", path=old_path))
         elif search_result["count"] == 1:
             # Exactly one match - use it
             found_path = search_result["results"][0]["path"]
@@ -746,7 +755,7 @@ async def add_tags(
     try:
         note = await vault.read_note(path)
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Parse frontmatter and update tags
     content = note.content
@@ -828,7 +837,7 @@ async def update_tags(
     try:
         note = await vault.read_note(path)
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Store previous tags
     previous_tags = note.metadata.tags.copy() if note.metadata.tags else []
@@ -920,7 +929,7 @@ async def remove_tags(
     try:
         note = await vault.read_note(path)
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
     # Parse frontmatter and update tags
     content = note.content
@@ -1014,8 +1023,8 @@ async def get_note_info(
     word_count = len(content.split())
     
     # Count links (both [[wikilinks]] and [markdown](links))
-    wikilink_count = len(re.findall(r'\[\[([^\]]+)\]\]', content))
-    markdown_link_count = len(re.findall(r'\[([^\]]+)\]\(([^)]+)\)', content))
+    wikilink_count = len(WIKILINK_PATTERN.findall(content))
+    markdown_link_count = len(MARKDOWN_LINK_PATTERN.findall(content))
     link_count = wikilink_count + markdown_link_count
     
     # Return standardized CRUD success structure
@@ -1082,7 +1091,7 @@ def _update_frontmatter_tags(content: str, tags: List[str], operation: str) -> s
             # Check if tags are on the same line
             if '[' in line:
                 # Array format: tags: [tag1, tag2]
-                match = re.search(r'\[(.*?)\]', line)
+                match = FLOW_LIST_PATTERN.search(line)
                 if match:
                     existing_tags = [t.strip().strip('"').strip("'") for t in match.group(1).split(',') if t.strip()]
             elif line.strip() != 'tags:':
@@ -1181,7 +1190,7 @@ async def list_tags(
     """
     # Validate sort_by parameter
     if sort_by not in ["name", "count"]:
-        raise ValueError(ERROR_MESSAGES["invalid_sort_by"].format(value=sort_by))
+        raise ValueError(format_error("invalid_sort_by", value=sort_by))
     
     if ctx:
         ctx.info("Collecting tags from vault...")
@@ -1193,42 +1202,17 @@ async def list_tags(
     tag_files = {} if include_files else None
     
     try:
-        # Get all notes in the vault
-        all_notes = await vault.list_notes(recursive=True)
+        # Cached per-note metadata; only notes changed since the last call are re-parsed
+        index = await vault.refresh_metadata_index()
         
         if ctx:
-            ctx.info(f"Scanning {len(all_notes)} notes for tags...")
-        
-        # Process notes in batches for better performance
-        import asyncio
-        
-        # Adjust batch size based on vault size
-        batch_size = 50 if len(all_notes) > 1000 else 20
-        max_concurrent = asyncio.Semaphore(batch_size)
+            ctx.info(f"Counting tags across {len(index.entries)} notes...")
         
-        async def process_note(note_info):
-            async with max_concurrent:
-                try:
-                    note = await vault.read_note(note_info["path"])
-                    if note and note.metadata and note.metadata.tags:
-                        return (note_info["path"], note.metadata.tags)
-                except Exception:
-                    return (note_info["path"], [])
-                return (note_info["path"], [])
-        
-        # Process all notes concurrently with semaphore limiting
-        tasks = [process_note(note_info) for note_info in all_notes]
-        results = await asyncio.gather(*tasks)
-        
-        # Count tags and collect file paths
-        for path, tags in results:
-            for tag in tags:
-                if tag:
-                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
-                    if include_files:
-                        if tag not in tag_files:
-                            tag_files[tag] = []
-                        tag_files[tag].append(path)
+        # Counts and file lists come straight from the tag -> paths index
+        for tag, paths in index.tag_index.items():
+            tag_counts[tag] = len(paths)
+            if include_files:
+                tag_files[tag] = list(paths)
         
         # Format results
         if include_counts or include_files:
@@ -1264,7 +1248,7 @@ async def list_tags(
     except Exception as e:
         if ctx:
             ctx.info(f"Failed to list tags: {str(e)}")
-        raise ValueError(ERROR_MESSAGES["tag_collection_failed"].format(error=str(e)))
+        raise ValueError(format_error("tag_collection_failed", error=str(e)))
 
 
 def _update_frontmatter_properties(content: str, property_updates: dict, properties_to_remove: List[str] = None) -> str:
@@ -1304,7 +1288,7 @@ def _update_frontmatter_properties(content: str, property_updates: dict, propert
     
     # Parse YAML
     try:
-        frontmatter = yaml.safe_load(frontmatter_str) or {}
+        frontmatter = yaml_safe_load(frontmatter_str) or {}
     except yaml.YAMLError:
         # If YAML parsing fails, return original
         return content
@@ -1370,7 +1354,7 @@ def _remove_inline_tags(content: str, tags_to_remove: List[str]) -> tuple[str, i
         code_blocks.append(match.group(0))
         return f"__CODE_BLOCK_{len(code_blocks)-1}__"
     
-    body_no_code = re.sub(r'```[\s\S]*?```', replace_code_block, body)
+    body_no_code = FENCED_CODE_PATTERN.sub(replace_code_block, body)
     
     # Remove inline code
     inline_code = []
@@ -1378,7 +1362,7 @@ def _remove_inline_tags(content: str, tags_to_remove: List[str]) -> tuple[str, i
         inline_code.append(match.group(0))
         return f"__INLINE_CODE_{len(inline_code)-1}__"
     
-    body_no_code = re.sub(r'`[^`]+`', replace_inline_code, body_no_code)
+    body_no_code = INLINE_CODE_PATTERN.sub(replace_inline_code, body_no_code)
     
     # Remove tags
     tags_removed = 0
@@ -1386,17 +1370,14 @@ def _remove_inline_tags(content: str, tags_to_remove: List[str]) -> tuple[str, i
         # Escape special regex characters
         escaped_tag = re.escape(tag)
         # Match #tag at word boundaries (not part of URL or other text)
-        pattern = rf'(^|\s)#{escaped_tag}(?=\s|$|\.|,|;|:|!|\?|\))'
-        
-        # Count matches before replacing
-        matches = re.findall(pattern, body_no_code)
-        tags_removed += len(matches)
+        pattern = re.compile(rf'(^|\s)#{escaped_tag}(?=\s|$|\.|,|;|:|!|\?|\))')
         
-        # Remove the tags (keep the whitespace before the tag)
-        body_no_code = re.sub(pattern, r'\1', body_no_code)
+        # Remove the tags (keep the whitespace before the tag), counting them
+        body_no_code, removed = pattern.subn(r'\1', body_no_code)
+        tags_removed += removed
     
     # Clean up multiple spaces left by removal
-    body_no_code = re.sub(r'  +', ' ', body_no_code)
+    body_no_code = MULTI_SPACE_PATTERN.sub(' ', body_no_code)
     
     # Restore code blocks
     for i, block in enumerate(code_blocks):
@@ -5,7 +5,7 @@ import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from pathlib import Path
-from ..utils.filesystem import get_vault
+from ..utils.filesystem import get_vault, walk_markdown, walk_folders
 from ..utils import is_markdown_file
 from ..utils.validation import (
     validate_search_query,
@@ -23,39 +23,30 @@ async def _search_by_tag(vault, tag: str, context_length: int) -> List[Dict[str,
     """Search for notes containing a specific tag, supporting hierarchical tags."""
     results = []
     
-    # Get all notes
-    all_notes = await vault.list_notes(recursive=True)
+    # Match against the unique tags of the vault rather than every note.
+    # For hierarchical tags, we support:
+    # - Exact match: "parent/child" matches "parent/child"
+    # - Parent match: "parent" matches "parent/child", "parent/grandchild"
+    # - Child match: searching for "child" finds "parent/child"
+    # - Any level match: "middle" matches "parent/middle/child"
+    index = await vault.refresh_metadata_index()
+    matched_tags = {
+        note_tag for note_tag in index.tag_index
+        if note_tag == tag
+        or note_tag.startswith(tag + "/")
+        or ("/" in note_tag and f"/{tag}/" in f"/{note_tag}/")
+    }
     
-    for note_info in all_notes:
+    # Union of the posting lists of every matching tag
+    candidate_paths = set()
+    for note_tag in matched_tags:
+        candidate_paths.update(index.tag_index[note_tag])
+    
+    for path in sorted(candidate_paths):
         try:
-            # Read the note to get its tags
-            note = await vault.read_note(note_info["path"])
-            
-            # Check for exact match or hierarchical match
-            # For hierarchical tags, we support:
-            # - Exact match: "parent/child" matches "parent/child"
-            # - Parent match: "parent" matches "parent/child", "parent/grandchild"
-            # - Child match: searching for "child" finds "parent/child"
-            matched = False
-            matching_tags = []
-            
-            for note_tag in note.metadata.tags:
-                # Exact match
-                if note_tag == tag:
-                    matched = True
-                    matching_tags.append(note_tag)
-                # Parent tag match - if searching for "parent", match "parent/child"
-                elif note_tag.startswith(tag + "/"):
-                    matched = True
-                    matching_tags.append(note_tag)
-                # Child tag match - if searching for "child", match "parent/child"
-                elif "/" in note_tag and note_tag.split("/")[-1] == tag:
-                    matched = True
-                    matching_tags.append(note_tag)
-                # Any level match - if searching for "middle", match "parent/middle/child"
-                elif "/" in note_tag and f"/{tag}/" in f"/{note_tag}/":
-                    matched = True
-                    matching_tags.append(note_tag)
+            note = await vault.read_note(path)
+            matching_tags = [t for t in index.entries[path]["tags"] if t in matched_tags]
+            matched = bool(matching_tags)
             
             if matched:
                 # Get context around the tag occurrences
@@ -219,14 +210,18 @@ async def _search_by_property(vault, property_query: str, context_length: int) -
             # Fall back to manual search if index fails
             logger.warning(f"Property search via index failed: {e}, falling back to manual search")
     
-    # Fall back to manual search (original implementation)
+    # Fall back to manual search; only notes whose cached frontmatter has the
+    # property need to be read
     results = []
-    all_notes = await vault.list_notes(recursive=True)
+    index = await vault.refresh_metadata_index()
+    candidates = sorted(
+        path for path, entry in index.entries.items() if prop_name in entry["frontmatter"]
+    )
     
-    for note_info in all_notes:
+    for note_path in candidates:
         try:
             # Read note to get metadata
-            note = await vault.read_note(note_info["path"])
+            note = await vault.read_note(note_path)
             
             # Get the property value from frontmatter
             frontmatter = note.metadata.frontmatter
@@ -578,17 +573,14 @@ async def search_by_date(
     vault = get_vault()
     
     try:
-        # Get all notes in the vault
-        all_notes = await vault.list_notes(recursive=True)
+        # Walk all notes in the vault (in path order, as list_notes returns them)
+        all_notes = sorted(walk_markdown(str(vault.vault_path)), key=lambda item: item[0])
         
         # Filter by date
         formatted_results = []
-        for note_info in all_notes:
-            note_path = note_info["path"]
-            
-            # Get file stats (use lenient path validation for existing files)
-            full_path = vault._get_absolute_path(note_path)
-            stat = full_path.stat()
+        for note_path, entry in all_notes:
+            # The DirEntry stats the file directly, without resolving its path
+            stat = entry.stat()
             
             # Get the appropriate timestamp
             if date_type == "created":
@@ -895,30 +887,12 @@ async def list_folders(
         else:
             search_path = vault.vault_path
         
-        # Find all directories
-        folders = []
-        if recursive:
-            # Recursive search
-            for path in search_path.rglob("*"):
-                if path.is_dir():
-                    rel_path = path.relative_to(vault.vault_path)
-                    # Skip hidden directories
-                    if not any(part.startswith(".") for part in rel_path.parts):
-                        folders.append({
-                            "path": str(rel_path),
-                            "name": path.name
-                        })
-        else:
-            # Non-recursive - only immediate subdirectories
-            for path in search_path.iterdir():
-                if path.is_dir():
-                    rel_path = path.relative_to(vault.vault_path)
-                    # Skip hidden directories
-                    if not path.name.startswith("."):
-                        folders.append({
-                            "path": str(rel_path),
-                            "name": path.name
-                        })
+        # Find all (non-hidden) directories
+        rel_prefix = directory.strip("/") if directory else ""
+        folders = [
+            {"path": rel_path, "name": entry.name}
+            for rel_path, entry in walk_folders(str(search_path), rel_prefix, recursive)
+        ]
         
         # Sort by path
         folders.sort(key=lambda x: x["path"])
@@ -1056,30 +1030,19 @@ async def search_by_regex(
         # Perform regex search
         results = await vault.search_by_regex(pattern, regex_flags, context_length, max_results)
         
-        # Format results for output
+        # Format results for output, reusing the match entries instead of copying them
         formatted_results = []
         for result in results:
-            formatted_result = {
-                "path": result["path"],
-                "match_count": result["match_count"],
-                "matches": []
-            }
-            
-            # Include match details
             for match in result["matches"]:
-                match_info = {
-                    "match": match["match"],
-                    "line": match["line"],
-                    "context": match["context"]
-                }
-                
-                # Include capture groups if present
-                if match["groups"]:
-                    match_info["groups"] = match["groups"]
-                
-                formatted_result["matches"].append(match_info)
+                # Only include capture groups if present
+                if not match["groups"]:
+                    del match["groups"]
             
-            formatted_results.append(formatted_result)
+            formatted_results.append({
+                "path": result["path"],
+                "match_count": result["match_count"],
+                "matches": result["matches"]
+            })
         
         # Return standardized search results structure
         return {
@@ -1,13 +1,13 @@
 """Tool for viewing images embedded in notes."""
 
-import re
-import base64
+import asyncio
 from typing import List, Optional
 from fastmcp import Context
 from fastmcp.utilities.types import Image
 from ..utils.filesystem import get_vault
 from ..utils import validate_note_path, sanitize_path
-from ..constants import ERROR_MESSAGES
+from ..utils.link_graph import IMAGE_PATTERN
+from ..constants import format_error, IMAGE_FORMATS, IMAGE_LOAD_CONCURRENCY
 
 
 async def view_note_images(
@@ -56,21 +56,21 @@ async def view_note_images(
     try:
         note = await vault.read_note(path)
     except FileNotFoundError:
-        raise FileNotFoundError(ERROR_MESSAGES["note_not_found"].format(path=path))
-    
-    # Extract image references
-    wiki_pattern = r'!\[\[([^]]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico))\]\]'
-    markdown_pattern = r'!\[[^\]]*\]\(([^)]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico))\)'
+        raise FileNotFoundError(format_error("note_not_found", path=path))
     
+    # Extract image references in one pass; wiki-style embeds are listed
+    # first, then markdown-style ones, which is the order image_index uses
     image_paths = []
+    markdown_paths = []
     
-    # Find wiki-style embeds
-    for match in re.finditer(wiki_pattern, note.content, re.IGNORECASE):
-        image_paths.append(match.group(1))
+    for match in IMAGE_PATTERN.finditer(note.content):
+        wiki_path = match.group(1)
+        if wiki_path:
+            image_paths.append(wiki_path)
+        else:
+            markdown_paths.append(match.group(2))
     
-    # Find markdown-style embeds
-    for match in re.finditer(markdown_pattern, note.content, re.IGNORECASE):
-        image_paths.append(match.group(1))
+    image_paths.extend(markdown_paths)
     
     if not image_paths:
         if ctx:
@@ -86,51 +86,43 @@ async def view_note_images(
             raise ValueError(f"Invalid image index {image_index}. Note contains {len(image_paths)} images (0-{len(image_paths)-1})")
         image_paths = [image_paths[image_index]]
     
-    # Load and convert images to Image objects
-    images = []
+    # Load images concurrently: decoding and resizing run in worker threads,
+    # so a note with many screenshots uses several cores. The semaphore keeps
+    # the number of open files and decoded images bounded.
+    semaphore = asyncio.Semaphore(IMAGE_LOAD_CONCURRENCY)
     
-    for i, image_ref in enumerate(image_paths):
-        try:
-            if ctx:
-                ctx.info(f"Loading image {i+1}/{len(image_paths)}: {image_ref}")
-            
-            # Try to read the image directly
+    async def load_image(i: int, image_ref: str) -> Optional[Image]:
+        async with semaphore:
             try:
-                image_data = await vault.read_image(image_ref, max_width=max_width)
-            except FileNotFoundError:
-                # If not found at direct path, search for it
-                filename = image_ref.split('/')[-1]
-                found_path = await vault.find_image(filename)
-                if found_path:
-                    if ctx:
-                        ctx.info(f"Found image at: {found_path}")
-                    image_data = await vault.read_image(found_path, max_width=max_width)
-                else:
-                    if ctx:
-                        ctx.info(f"Could not find image: {image_ref}")
-                    continue
-            
-            # Convert to Image object
-            image_bytes = base64.b64decode(image_data["content"])
-            
-            # Extract format from mime type
-            mime_to_format = {
-                "image/png": "png",
-                "image/jpeg": "jpeg",
-                "image/jpg": "jpeg",
-                "image/gif": "gif",
-                "image/webp": "webp",
-                "image/svg+xml": "svg",
-                "image/bmp": "bmp",
-                "image/x-icon": "ico"
-            }
-            format_type = mime_to_format.get(image_data["mime_type"], "png")
-            
-            images.append(Image(data=image_bytes, format=format_type))
-            
-        except Exception as e:
-            if ctx:
-                ctx.info(f"Error loading image {image_ref}: {str(e)}")
-            continue
-    
-    return images
\ No newline at end of file
+                if ctx:
+                    ctx.info(f"Loading image {i+1}/{len(image_paths)}: {image_ref}")
+                
+                # Try to read the image directly
+                try:
+                    image_bytes, image_data = await vault.read_image_bytes(image_ref, max_width=max_width)
+                except FileNotFoundError:
+                    # If not found at direct path, search for it
+                    filename = image_ref.split('/')[-1]
+                    found_path = await vault.find_image(filename)
+                    if found_path:
+                        if ctx:
+                            ctx.info(f"Found image at: {found_path}")
+                        image_bytes, image_data = await vault.read_image_bytes(found_path, max_width=max_width)
+                    else:
+                        if ctx:
+                            ctx.info(f"Could not find image: {image_ref}")
+                        return None
+                
+                # Extract format from mime type
+                format_type = IMAGE_FORMATS.get(image_data["mime_type"], "png")
+                
+                return Image(data=image_bytes, format=format_type)
+                
+            except Exception as e:
+                if ctx:
+                    ctx.info(f"Error loading image {image_ref}: {str(e)}")
+                return None
+    
+    # Results come back in note order; images that failed to load are dropped
+    images = await asyncio.gather(*(load_image(i, image_ref) for i, image_ref in enumerate(image_paths)))
+    return [image for image in images if image is not None]
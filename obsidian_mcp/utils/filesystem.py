@@ -6,18 +6,256 @@ import json
 import asyncio
 import aiofiles
 import yaml
-import base64
 import io
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
-from PIL import Image
+from typing import TYPE_CHECKING, Optional, Dict, Any, FrozenSet, List, Tuple, Iterator, Set
 from ..models import Note, NoteMetadata
-from .persistent_index import PersistentSearchIndex
+from ..constants import IMAGE_MIME_TYPES, SKIP_DIRS
+from .metadata_index import MetadataIndex
+from .link_graph import Link, extract_links_from_content
+from .note_cache import NoteCache
+from .image_cache import ImageCache
+from .parse_cache import ParseCache, content_key
+from .watcher import VaultWatcher
+from .frontmatter import load_frontmatter
+
+if TYPE_CHECKING:
+    # Imported on first search instead (pulls in sqlite3 and aiosqlite)
+    from .persistent_index import PersistentSearchIndex
 
 logger = logging.getLogger(__name__)
 
+try:
+    # SIMD-accelerated drop-in for the base64 module (several times faster on large images)
+    from pybase64 import b64encode, b64decode
+except ImportError:  # pybase64 is optional; fall back to the stdlib
+    from base64 import b64encode, b64decode
+
+# Patterns used on every parsed note, compiled once
+FENCED_CODE_PATTERN = re.compile(r'```[\s\S]*?```')
+INLINE_CODE_PATTERN = re.compile(r'`[^`]+`')
+# Tag must be preceded by whitespace or start of line; supports hierarchical
+# tags with forward slashes (e.g., #parent/child/grandchild)
+INLINE_TAG_PATTERN = re.compile(r'(?:^|[\s\n])#([a-zA-Z0-9_\-]+(?:/[a-zA-Z0-9_\-]+)*)(?=\s|$)', re.MULTILINE)
+INDEX_TAG_PATTERN = re.compile(r'#([a-zA-Z0-9_\-/]+)')
+
+
+def walk_markdown(
+    root: str,
+    rel_prefix: str = "",
+    recursive: bool = True,
+    exclude: Optional[Set[str]] = None,
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Walk a directory tree with os.scandir and yield its markdown files.
+    
+    DirEntry type checks come from the directory listing itself, so no
+    per-entry stat() is needed to tell files from folders, and no Path
+    objects are allocated.
+    
+    Args:
+        root: Absolute directory to walk
+        rel_prefix: Vault-relative path of root ("" for the vault root)
+        recursive: Whether to descend into subdirectories
+        exclude: Vault-relative folder paths that are not descended into
+        
+    Yields:
+        Tuples of (vault-relative path, DirEntry)
+    """
+    stack = [(root, rel_prefix)]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    # Attachments (images, PDFs, ...) fall through both checks
+                    # without a relative path being built for them
+                    if name.endswith(".md"):
+                        if entry.is_file():
+                            yield (f"{rel_dir}/{name}" if rel_dir else name), entry
+                    elif (
+                        recursive
+                        and name[0] != "."
+                        and name not in SKIP_DIRS
+                        and entry.is_dir(follow_symlinks=False)
+                    ):
+                        sub_dir = f"{rel_dir}/{name}" if rel_dir else name
+                        if not exclude or sub_dir not in exclude:
+                            stack.append((entry.path, sub_dir))
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
+
+
+def walk_folders(root: str, rel_prefix: str = "", recursive: bool = True) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Walk a directory tree with os.scandir and yield its folders.
+    
+    Hidden (dot) folders are skipped along with everything below them.
+    Symlinked folders are listed but not descended into.
+    
+    Args:
+        root: Absolute directory to walk
+        rel_prefix: Vault-relative path of root ("" for the vault root)
+        recursive: Whether to descend into subdirectories
+        
+    Yields:
+        Tuples of (vault-relative path, DirEntry)
+    """
+    stack = [(root, rel_prefix)]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name[0] == "." or not entry.is_dir():
+                        continue
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    yield rel_path, entry
+                    if recursive and not entry.is_symlink():
+                        stack.append((entry.path, rel_path))
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
+
+
+def _find_file(root: str, filename: str) -> Optional[str]:
+    """Return the vault-relative path of the first file named filename, if any."""
+    stack = [(root, "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name == filename:
+                        if entry.is_file():
+                            return f"{rel_dir}/{name}" if rel_dir else name
+                    elif name[0] != "." and entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{rel_dir}/{name}" if rel_dir else name))
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
+    return None
+
+
+def _read_text(path: Path) -> str:
+    """
+    Read a whole UTF-8 text file in one call.
+    
+    Meant for asyncio.to_thread: notes are small, so a single blocking
+    open+read in the thread pool is cheaper than aiofiles, which hops to a
+    thread separately for open, read and close.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _read_texts(paths: List[Path]) -> List[Optional[str]]:
+    """
+    Read several UTF-8 text files in one call.
+    
+    Meant for asyncio.to_thread: one thread hand-off per batch instead of
+    per file keeps event loop and executor overhead out of vault-wide scans.
+    
+    Args:
+        paths: Files to read
+        
+    Returns:
+        File contents in the same order as paths (None for unreadable files)
+    """
+    contents: List[Optional[str]] = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                contents.append(f.read())
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Failed to read {path}: {e}")
+            contents.append(None)
+    return contents
+
+
+def _resize_image(path: str, content: bytes, ext: str, mime_type: str, max_width: int) -> Tuple[bytes, Dict[str, Any]]:
+    """Shrink a raster image to max_width if it is wider, keeping its format where possible."""
+    # Resize image if needed (PIL is only loaded once an image needs it)
+    from PIL import Image
+    
+    try:
+        # Open image with PIL
+        img = Image.open(io.BytesIO(content))
+        original_width, original_height = img.size
+        
+        # Only resize if image is larger than max_width
+        if original_width > max_width:
+            # Calculate new height maintaining aspect ratio
+            aspect_ratio = original_height / original_width
+            new_height = max(int(max_width * aspect_ratio), 1)
+            
+            # For JPEGs have the decoder scale down by a power of two first,
+            # skipping the full-resolution decode. It stops at twice the target
+            # size (the margin Pillow's own reducing_gap=2.0 keeps), so LANCZOS
+            # still does the final reduction and quality is unchanged.
+            box = None
+            if img.format == 'JPEG':
+                draft = img.draft(None, (max_width * 2, new_height * 2))
+                if draft is not None:
+                    box = draft[1]
+            
+            # Resize image
+            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS, box=box)
+            
+            # Save to bytes
+            output = io.BytesIO()
+            # Use appropriate format based on original
+            if ext in ['.jpg', '.jpeg']:
+                img.save(output, format='JPEG', quality=85, optimize=True)
+            elif ext == '.png':
+                img.save(output, format='PNG', optimize=True)
+            elif ext == '.webp':
+                img.save(output, format='WEBP', quality=85)
+            else:
+                # For other formats, convert to PNG
+                img.save(output, format='PNG', optimize=True)
+                mime_type = 'image/png'
+            
+            resized_content = output.getvalue()
+            
+            return resized_content, {
+                "path": path,
+                "mime_type": mime_type,
+                "size": len(resized_content),
+                "original_size": len(content),
+                "resized": True,
+                "dimensions": {
+                    "original": {"width": original_width, "height": original_height},
+                    "resized": {"width": max_width, "height": new_height}
+                }
+            }
+        else:
+            # Image is already small enough, return as-is
+            return content, {
+                "path": path,
+                "mime_type": mime_type,
+                "size": len(content),
+                "original_size": len(content),
+                "resized": False,
+                "dimensions": {
+                    "original": {"width": original_width, "height": original_height}
+                }
+            }
+    except Exception as e:
+        # If image processing fails, return original (but this might be too large)
+        # Log the error for debugging
+        print(f"Warning: Failed to process image {path}: {e}")
+        return content, {
+            "path": path,
+            "mime_type": mime_type,
+            "size": len(content),
+            "original_size": len(content),
+            "error": str(e)
+        }
+
 
 class ObsidianVault:
     """Direct filesystem access to Obsidian vault."""
@@ -43,14 +281,48 @@ class ObsidianVault:
         if not self.vault_path.is_dir():
             raise ValueError(f"Vault path is not a directory: {self.vault_path}")
         
+        # Resolved once here so path checks don't re-resolve the root per request
+        self.vault_root = self.vault_path.resolve()
+        
         # Initialize SQLite search index
-        self.persistent_index: Optional[PersistentSearchIndex] = None
+        self.persistent_index: Optional["PersistentSearchIndex"] = None
         self._index_timestamp: Optional[float] = None
         self._index_lock = asyncio.Lock()
         
         # Track if persistent index has been initialized
         self._persistent_index_initialized = False
         
+        # Recently parsed notes, keyed by path and validated by (mtime_ns, size)
+        self._note_cache = NoteCache(maxsize=256)
+        
+        # Recently read images, keyed by path and validated by (mtime_ns, size, max_width)
+        self._image_cache = ImageCache()
+        # Image loads in progress, keyed by (path, stamp), so concurrent
+        # readers of the same image wait for one load instead of repeating it
+        self._image_loads: Dict[Tuple[str, Tuple[int, int, int]], asyncio.Future] = {}
+        
+        # Parsed frontmatter and tags keyed by content digest, shared across paths
+        self._parse_cache = ParseCache(maxsize=4096)
+        
+        # Disk-backed cache of parsed tags/frontmatter, loaded on first use
+        self.metadata_index = MetadataIndex(self.vault_path)
+        self._metadata_lock = asyncio.Lock()
+        
+        # Note name -> path lookup used to resolve links, with the set of its
+        # paths (see link_management.build_vault_notes_index)
+        self._notes_index_cache: Optional[Dict[str, str]] = None
+        self._notes_index_paths: FrozenSet[str] = frozenset()
+        self._notes_index_ts: Optional[float] = None
+        self._notes_index_lock = asyncio.Lock()
+        
+        # File watcher (if watchdog is installed) so refreshes only touch changed notes
+        self._watcher = VaultWatcher(self.vault_root, self._on_vault_change)
+        self._changed_paths: Set[str] = set()
+        self._needs_full_scan = True
+        # The search index is refreshed separately, so it tracks its own changes
+        self._search_changed_paths: Set[str] = set()
+        self._search_needs_full_scan = True
+        
         # Store last search metadata for access by tools
         self._last_search_metadata: Optional[Dict[str, Any]] = None
         
@@ -97,7 +369,7 @@ class ObsidianVault:
         # Resolve to absolute path and check it's within vault
         try:
             resolved = full_path.resolve()
-            resolved.relative_to(self.vault_path.resolve())
+            resolved.relative_to(self.vault_root)
         except (ValueError, RuntimeError):
             raise ValueError(f"Path escapes vault: {path}")
         
@@ -132,7 +404,7 @@ class ObsidianVault:
         # Resolve to absolute path and check it's within vault
         try:
             resolved = full_path.resolve()
-            resolved.relative_to(self.vault_path.resolve())
+            resolved.relative_to(self.vault_root)
         except (ValueError, RuntimeError):
             raise ValueError(f"Path escapes vault: {path}")
         
@@ -162,7 +434,7 @@ class ObsidianVault:
                     
                     # Parse YAML properly
                     try:
-                        frontmatter = yaml.safe_load(fm_text) or {}
+                        frontmatter = load_frontmatter(fm_text) or {}
                         # Ensure it's a dict
                         if not isinstance(frontmatter, dict):
                             frontmatter = {}
@@ -262,16 +534,20 @@ class ObsidianVault:
             if isinstance(tag, str):
                 tags.add(tag.lstrip('#'))
         
+        # Large notes without any '#' can't contain inline tags; skip the scans
+        if '#' not in content:
+            return sorted(tags)
+        
         # Remove code blocks from content before extracting tags
-        # Remove fenced code blocks
-        clean_content = re.sub(r'```[\s\S]*?```', '', content)
-        # Remove inline code
-        clean_content = re.sub(r'`[^`]+`', '', clean_content)
+        clean_content = content
+        if '`' in clean_content:
+            # Remove fenced code blocks
+            clean_content = FENCED_CODE_PATTERN.sub('', clean_content)
+            # Remove inline code
+            clean_content = INLINE_CODE_PATTERN.sub('', clean_content)
         
         # Find inline tags in cleaned content
-        # More strict pattern: tag must be preceded by whitespace or start of line
-        # Support hierarchical tags with forward slashes (e.g., #parent/child/grandchild)
-        inline_tags = re.findall(r'(?:^|[\s\n])#([a-zA-Z0-9_\-]+(?:/[a-zA-Z0-9_\-]+)*)(?=\s|$)', clean_content, re.MULTILINE)
+        inline_tags = INLINE_TAG_PATTERN.findall(clean_content)
         tags.update(inline_tags)
         
         return sorted(list(tags))
@@ -284,7 +560,8 @@ class ObsidianVault:
             path: Path to note relative to vault root
             
         Returns:
-            Note object with content and metadata
+            Note object with content and metadata. Notes may be served from
+            cache, so callers must not mutate the returned object.
         """
         # Ensure .md extension
         if not path.endswith('.md'):
@@ -293,30 +570,41 @@ class ObsidianVault:
         # Use lenient path validation for reading existing files
         full_path = self._get_absolute_path(path)
         
-        if not full_path.exists():
+        try:
+            stat = full_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Note not found: {path}")
         
+        # Serve unchanged notes without re-reading or re-parsing them
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._note_cache.get(path, stamp)
+        if cached is not None:
+            return cached
+        
         # Check file size to prevent memory issues
-        stat = full_path.stat()
         max_size = 10 * 1024 * 1024  # 10MB limit
         if stat.st_size > max_size:
             raise ValueError(f"File too large: {stat.st_size} bytes (max: {max_size} bytes)")
         
-        # Read file content asynchronously
-        async with aiofiles.open(full_path, 'r', encoding='utf-8') as f:
-            content = await f.read()
-        
-        # Parse frontmatter
-        frontmatter, clean_content = self._parse_frontmatter(content)
-        
-        # Normalize frontmatter for legacy property names
-        normalized_frontmatter = self._normalize_frontmatter(frontmatter)
-        
-        # Extract tags
-        tags = self._extract_tags(clean_content, normalized_frontmatter)
+        # Read file content in a worker thread (one blocking open+read)
+        content = await asyncio.to_thread(_read_text, full_path)
         
-        # Get file stats
-        stat = full_path.stat()
+        # Identical text parses identically, whatever file or mtime it came from
+        key = content_key(content)
+        parsed = self._parse_cache.get(key)
+        if parsed is None:
+            # Parse frontmatter
+            frontmatter, clean_content = self._parse_frontmatter(content)
+            
+            # Normalize frontmatter for legacy property names
+            normalized_frontmatter = self._normalize_frontmatter(frontmatter)
+            
+            # Extract tags
+            tags = self._extract_tags(clean_content, normalized_frontmatter)
+            
+            parsed = (normalized_frontmatter, tags)
+            self._parse_cache.put(key, parsed)
+        normalized_frontmatter, tags = parsed
         
         # Create metadata
         metadata = NoteMetadata(
@@ -327,11 +615,80 @@ class ObsidianVault:
             frontmatter=normalized_frontmatter
         )
         
-        return Note(
+        note = Note(
             path=path,
             content=content,
             metadata=metadata
         )
+        self._note_cache.put(path, stamp, note)
+        
+        return note
+    
+    async def get_note_links(self, path: str) -> List[Link]:
+        """
+        Get the outgoing links of a note.
+        
+        Links come from the metadata index, where they were extracted in the
+        same pass as tags and frontmatter, as long as the indexed entry matches
+        the file's current stat; otherwise the note is read and parsed.
+        
+        Args:
+            path: Path to note relative to vault root
+            
+        Returns:
+            Links in the format of extract_links_from_content
+            
+        Raises:
+            FileNotFoundError: If the note doesn't exist
+        """
+        # Ensure .md extension
+        if not path.endswith('.md'):
+            path += '.md'
+        
+        full_path = self._get_absolute_path(path)
+        try:
+            stat = full_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Note not found: {path}")
+        
+        if self.metadata_index.is_fresh(path, stat.st_mtime, stat.st_size):
+            links = self.metadata_index.get_links(path)
+            if links is not None:
+                return links
+        
+        note = await self.read_note(path)
+        return extract_links_from_content(note.content)
+    
+    async def read_many(self, paths: List[str], batch_size: int = 32) -> List[Optional[str]]:
+        """
+        Read the raw content of many notes concurrently.
+        
+        Unlike read_note, no frontmatter or tag parsing is done, which makes this
+        the cheaper choice for vault-wide scans that only need the text. Files
+        are read in batches, each batch with a single worker-thread call.
+        
+        Args:
+            paths: Note paths relative to vault root
+            batch_size: Number of files read per worker-thread call
+            
+        Returns:
+            File contents in the same order as paths (None for unreadable files)
+        """
+        full_paths: List[Optional[Path]] = []
+        for path in paths:
+            try:
+                full_paths.append(self._get_absolute_path(path))
+            except ValueError as e:
+                logger.debug(f"Failed to read {path}: {e}")
+                full_paths.append(None)
+        
+        readable = [full_path for full_path in full_paths if full_path is not None]
+        batches = await asyncio.gather(*(
+            asyncio.to_thread(_read_texts, readable[i:i + batch_size])
+            for i in range(0, len(readable), batch_size)
+        ))
+        contents = iter([content for batch in batches for content in batch])
+        return [next(contents) if full_path is not None else None for full_path in full_paths]
     
     async def write_note(self, path: str, content: str, overwrite: bool = False) -> Note:
         """
@@ -362,6 +719,10 @@ class ObsidianVault:
         async with aiofiles.open(full_path, 'w', encoding='utf-8') as f:
             await f.write(content)
         
+        # mtime may not tick between two quick writes, so never trust the cache
+        # here; the indexes re-check the note without waiting for the watcher
+        self._on_vault_change(path)
+        
         # Return the newly created note
         return await self.read_note(path)
     
@@ -386,11 +747,14 @@ class ObsidianVault:
         
         # Delete the file
         full_path.unlink()
+        self._on_vault_change(path)
         return True
     
     async def _initialize_persistent_index(self) -> None:
         """Initialize the persistent search index if not already done."""
         if not self._persistent_index_initialized:
+            from .persistent_index import PersistentSearchIndex
+            
             try:
                 self.persistent_index = PersistentSearchIndex(self.vault_path)
                 await self.persistent_index.initialize()
@@ -459,32 +823,51 @@ class ObsidianVault:
     
     
     async def _update_persistent_index(self) -> None:
-        """Update the persistent search index with incremental updates."""
-        existing_files = set()
-        files_to_process = []
+        """
+        Update the persistent search index with incremental updates.
         
-        # First, collect all markdown files
-        logger.info("Scanning vault for markdown files...")
-        try:
-            all_files = list(self.vault_path.rglob("*.md"))
-            logger.info(f"Found {len(all_files)} markdown files in vault")
-        except Exception as e:
-            logger.error(f"Failed to scan vault: {e}")
-            return
+        While the file watcher is running, only notes it reported as changed
+        are checked; otherwise the whole vault is walked.
+        """
+        existing_files = None
+        files_to_process = []
         
-        # Check which files need updating
-        for md_file in all_files:
-            try:
-                stat = md_file.stat()
-                rel_path = str(md_file.relative_to(self.vault_path))
-                existing_files.add(rel_path)
-                
-                # Check if file needs updating
+        if self._watcher.running and not self._search_needs_full_scan:
+            changed, self._search_changed_paths = self._search_changed_paths, set()
+            logger.info(f"Checking {len(changed)} notes reported by the file watcher")
+            for rel_path in changed:
+                full_path = self.vault_path / rel_path
+                try:
+                    stat = full_path.stat()
+                except OSError:
+                    await self.persistent_index.remove_file(rel_path)
+                    continue
                 if await self.persistent_index.needs_update(rel_path, stat.st_mtime, stat.st_size):
-                    files_to_process.append((md_file, rel_path, stat))
-            except Exception as e:
-                logger.error(f"Failed to check file {md_file}: {e}")
-                continue
+                    files_to_process.append((str(full_path), rel_path, stat))
+        else:
+            # Start watching before the walk so no change slips in between
+            self._watcher.start()
+            self._search_changed_paths.clear()
+            self._search_needs_full_scan = False
+            existing_files = set()
+            
+            # First, collect all markdown files
+            logger.info("Scanning vault for markdown files...")
+            all_files = list(walk_markdown(str(self.vault_path)))
+            logger.info(f"Found {len(all_files)} markdown files in vault")
+            
+            # Check which files need updating
+            for rel_path, entry in all_files:
+                try:
+                    stat = entry.stat()
+                    existing_files.add(rel_path)
+                    
+                    # Check if file needs updating
+                    if await self.persistent_index.needs_update(rel_path, stat.st_mtime, stat.st_size):
+                        files_to_process.append((entry.path, rel_path, stat))
+                except Exception as e:
+                    logger.error(f"Failed to check file {entry.path}: {e}")
+                    continue
         
         logger.info(f"{len(files_to_process)} files need indexing")
         
@@ -494,12 +877,14 @@ class ObsidianVault:
             batch_end = min(i + self._index_batch_size, len(files_to_process))
             logger.info(f"Processing batch {i+1}-{batch_end} of {len(files_to_process)} files")
             
-            for md_file, rel_path, stat in batch:
+            # Read the whole batch in one worker-thread call
+            contents = await asyncio.to_thread(_read_texts, [md_file for md_file, _, _ in batch])
+            
+            for (md_file, rel_path, stat), content in zip(batch, contents):
+                if content is None:
+                    logger.error(f"Failed to index {md_file}: file could not be read")
+                    continue
                 try:
-                    # Read content
-                    async with aiofiles.open(md_file, 'r', encoding='utf-8') as f:
-                        content = await f.read()
-                    
                     # Extract metadata
                     metadata = self._extract_file_metadata(content)
                     
@@ -516,9 +901,10 @@ class ObsidianVault:
             # Yield control periodically to prevent blocking
             await asyncio.sleep(0.1)
         
-        # Remove orphaned entries
-        logger.info("Cleaning up orphaned index entries...")
-        await self.persistent_index.clear_orphaned_entries(existing_files)
+        # Remove orphaned entries (deletions reported by the watcher were handled above)
+        if existing_files is not None:
+            logger.info("Cleaning up orphaned index entries...")
+            await self.persistent_index.clear_orphaned_entries(existing_files)
         logger.info("Index update completed")
     
     def _extract_file_metadata(self, content: str) -> Dict[str, Any]:
@@ -531,7 +917,7 @@ class ObsidianVault:
                 end_index = content.find('\n---\n', 4)
                 if end_index > 0:
                     frontmatter_text = content[4:end_index]
-                    frontmatter = yaml.safe_load(frontmatter_text) or {}
+                    frontmatter = load_frontmatter(frontmatter_text) or {}
                     # Convert dates and other non-serializable objects to strings
                     metadata['frontmatter'] = self._serialize_metadata(frontmatter)
             except:
@@ -548,8 +934,7 @@ class ObsidianVault:
                 tags.add(fm_tags)
         
         # Inline tags
-        tag_pattern = r'#([a-zA-Z0-9_\-/]+)'
-        for match in re.finditer(tag_pattern, content):
+        for match in INDEX_TAG_PATTERN.finditer(content):
             tags.add(match.group(1))
         
         metadata['tags'] = list(tags)
@@ -567,6 +952,90 @@ class ObsidianVault:
         else:
             return obj
     
+    def _on_vault_change(self, path: Optional[str]) -> None:
+        """
+        Record a change reported by the file watcher or made by the vault itself.
+        
+        The server's own writes are recorded directly, since the watcher's
+        event for them may only arrive after the next index refresh.
+        
+        Args:
+            path: Relative path of the changed note, or None if a whole folder changed
+        """
+        if path is None:
+            self._note_cache.clear()
+            self._needs_full_scan = True
+            self._search_needs_full_scan = True
+        else:
+            self._note_cache.invalidate(path)
+            self._changed_paths.add(path)
+            self._search_changed_paths.add(path)
+    
+    async def refresh_metadata_index(self) -> MetadataIndex:
+        """
+        Bring the metadata index up to date.
+        
+        Only notes whose mtime or size changed since the last scan are re-read.
+        While the file watcher is running, only notes it reported as changed are
+        checked instead of walking the whole vault.
+        
+        Returns:
+            The refreshed MetadataIndex (per-note entries, tag -> paths index and link graph)
+        """
+        async with self._metadata_lock:
+            index = self.metadata_index
+            notes = None
+            stale = []
+            if self._watcher.running and not self._needs_full_scan:
+                # Only notes reported by the watcher can have changed
+                changed, self._changed_paths = self._changed_paths, set()
+                for rel_path in changed:
+                    try:
+                        stat = (self.vault_path / rel_path).stat()
+                    except OSError:
+                        index.remove(rel_path)
+                        continue
+                    if not index.is_fresh(rel_path, stat.st_mtime, stat.st_size):
+                        stale.append((rel_path, stat))
+            else:
+                # Start watching before the walk so no change slips in between
+                self._watcher.start()
+                self._changed_paths.clear()
+                self._needs_full_scan = False
+                notes = []
+                for rel_path, entry in walk_markdown(str(self.vault_path)):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    notes.append(rel_path)
+                    if not index.is_fresh(rel_path, stat.st_mtime, stat.st_size):
+                        stale.append((rel_path, stat))
+            
+            semaphore = asyncio.Semaphore(50 if len(stale) > 1000 else 20)
+            
+            async def reparse(path: str, stat: os.stat_result) -> None:
+                async with semaphore:
+                    try:
+                        note = await self.read_note(path)
+                        tags = note.metadata.tags
+                        frontmatter = self._serialize_metadata(note.metadata.frontmatter)
+                        links = extract_links_from_content(note.content)
+                    except Exception as e:
+                        # Cache unreadable notes as empty until they change again
+                        logger.debug(f"Failed to read {path} for metadata index: {e}")
+                        tags, frontmatter, links = [], {}, []
+                    index.update(path, stat.st_mtime, stat.st_size, tags, frontmatter, links)
+            
+            if stale:
+                logger.info(f"Refreshing metadata for {len(stale)} notes")
+                await asyncio.gather(*(reparse(path, stat) for path, stat in stale))
+            
+            if notes is not None:
+                index.prune(notes)
+            index.save()
+            return index
+    
     async def search_notes(self, query: str, context_length: int = 100, max_results: int = 50) -> List[Dict[str, Any]]:
         """
         Search for notes containing query text using indexed search.
@@ -620,51 +1089,59 @@ class ObsidianVault:
         total_count = search_data['total_count']
         truncated = search_data['truncated']
         
-        results = []
         query_lower = query.lower()
         
+        # Matches are counted with overlaps ("aa" occurs twice in "aaa"); str.count
+        # skips overlaps, so it's only exact when the query can't overlap itself
+        self_overlapping = any(query_lower[:i] == query_lower[-i:] for i in range(1, len(query_lower)))
+        
+        # Score and locate the first match per note; snippets are only cut once
+        # the results are ranked
+        hits = []
         for file_info in search_results:
-            content = file_info['content']
-            content_lower = content.lower()
-            
-            # Find all matches
-            matches = []
-            start_pos = 0
-            while True:
-                match_pos = content_lower.find(query_lower, start_pos)
-                if match_pos == -1:
-                    break
-                matches.append(match_pos)
-                start_pos = match_pos + 1
-            
-            # Extract context for first match
-            if matches:
-                first_match = matches[0]
-                
-                # Calculate context bounds
-                start = max(0, first_match - context_length // 2)
-                end = min(len(content), first_match + len(query) + context_length // 2)
-                context = content[start:end].strip()
-                
-                # Add ellipsis if truncated
-                if start > 0:
-                    context = "..." + context
-                if end < len(content):
-                    context = context + "..."
-                
-                # Calculate simple relevance score based on match count
-                score = min(len(matches) / 10.0 + 1.0, 5.0)  # Score between 1 and 5
-                
-                results.append({
-                    "path": file_info['filepath'],
-                    "score": score,
-                    "matches": [query],
-                    "match_count": len(matches),
-                    "context": context
-                })
+            content_lower = file_info['content_lower']  # lowered once at index time
+            first_match = content_lower.find(query_lower)
+            if first_match == -1:
+                continue
+            
+            if self_overlapping:
+                match_count = 0
+                match_pos = first_match
+                while match_pos != -1:
+                    match_count += 1
+                    match_pos = content_lower.find(query_lower, match_pos + 1)
+            else:
+                match_count = content_lower.count(query_lower)
+            
+            # Calculate simple relevance score based on match count
+            score = min(match_count / 10.0 + 1.0, 5.0)  # Score between 1 and 5
+            hits.append((score, first_match, match_count, file_info))
         
         # Sort by score (descending)
-        results.sort(key=lambda x: x["score"], reverse=True)
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        
+        results = []
+        for score, first_match, match_count, file_info in hits:
+            content = file_info['content']
+            
+            # Calculate context bounds
+            start = max(0, first_match - context_length // 2)
+            end = min(len(content), first_match + len(query) + context_length // 2)
+            context = content[start:end].strip()
+            
+            # Add ellipsis if truncated
+            if start > 0:
+                context = "..." + context
+            if end < len(content):
+                context = context + "..."
+            
+            results.append({
+                "path": file_info['filepath'],
+                "score": score,
+                "matches": [query],
+                "match_count": match_count,
+                "context": context
+            })
         
         # Store search metadata
         self._last_search_metadata = {
@@ -707,13 +1184,19 @@ class ObsidianVault:
         return results
     
     
-    async def list_notes(self, directory: Optional[str] = None, recursive: bool = True) -> List[Dict[str, str]]:
+    async def list_notes(
+        self,
+        directory: Optional[str] = None,
+        recursive: bool = True,
+        exclude_folders: Optional[List[str]] = None,
+    ) -> List[Dict[str, str]]:
         """
         List all notes in vault or specific directory.
         
         Args:
             directory: Specific directory to list (optional)
             recursive: Whether to include subdirectories
+            exclude_folders: Vault-relative folders to skip, along with everything below them
             
         Returns:
             List of note paths and names
@@ -730,12 +1213,12 @@ class ObsidianVault:
             search_path = self.vault_path
         
         # Find markdown files
-        pattern = "**/*.md" if recursive else "*.md"
-        for md_file in search_path.glob(pattern):
-            rel_path = md_file.relative_to(self.vault_path)
+        rel_prefix = directory.strip("/") if directory else ""
+        exclude = {folder.replace("\\", "/").strip("/") for folder in exclude_folders} if exclude_folders else None
+        for rel_path, entry in walk_markdown(str(search_path), rel_prefix, recursive, exclude):
             notes.append({
-                "path": str(rel_path),
-                "name": md_file.name
+                "path": rel_path,
+                "name": entry.name
             })
         
         # Sort by path
@@ -753,20 +1236,12 @@ class ObsidianVault:
         Returns:
             Relative path to image if found, None otherwise
         """
-        # Common image extensions
-        image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.bmp', '.ico'}
-        
         # Check if filename has valid extension
-        file_ext = Path(filename).suffix.lower()
-        if file_ext not in image_extensions:
+        if os.path.splitext(filename)[1].lower() not in IMAGE_MIME_TYPES:
             return None
         
-        # Search for the image file
-        for image_file in self.vault_path.rglob(filename):
-            if image_file.is_file():
-                return str(image_file.relative_to(self.vault_path))
-        
-        return None
+        # Search for the image file (a directory walk, so off the event loop)
+        return await asyncio.to_thread(_find_file, str(self.vault_path), filename)
     
     async def read_image(self, path: str, max_width: int = 1600) -> Dict[str, Any]:
         """
@@ -777,7 +1252,21 @@ class ObsidianVault:
             max_width: Maximum width for resizing (default: 800px)
             
         Returns:
-            Dictionary with image data and metadata
+            Dictionary with base64 image data and metadata
+        """
+        content, image_data = await self.read_image_bytes(path, max_width)
+        return {"path": image_data.pop("path"), "content": b64encode(content).decode('utf-8'), **image_data}
+    
+    async def read_image_bytes(self, path: str, max_width: int = 1600) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Read an image file from the vault with automatic resizing, without encoding it.
+        
+        Args:
+            path: Path to image relative to vault root
+            max_width: Maximum width for resizing (default: 800px)
+            
+        Returns:
+            Tuple of the (possibly resized) image bytes and a dictionary of metadata
         """
         # Use lenient validation for reading existing image files
         full_path = self._get_absolute_path(path)
@@ -791,106 +1280,54 @@ class ObsidianVault:
         if stat.st_size > max_size:
             raise ValueError(f"Image too large: {stat.st_size} bytes (max: {max_size} bytes)")
         
-        # Read binary content asynchronously
-        async with aiofiles.open(full_path, 'rb') as f:
-            content = await f.read()
+        # Repeat reads of an unchanged image skip the decode and resize
+        stamp = (stat.st_mtime_ns, stat.st_size, max_width)
+        image = self._image_cache.get(path, stamp)
+        if image is None:
+            # Reads of an image that is already being loaded share that load
+            key = (path, stamp)
+            load = self._image_loads.get(key)
+            if load is None:
+                load = asyncio.ensure_future(self._load_and_cache_image(full_path, path, stamp, max_width))
+                self._image_loads[key] = load
+                load.add_done_callback(lambda _: self._image_loads.pop(key, None))
+            # Shielded so a caller that is cancelled doesn't cancel the others' load
+            image = await asyncio.shield(load)
+        
+        # Callers get their own metadata dict to modify
+        content, metadata = image
+        return content, dict(metadata)
+    
+    async def _load_and_cache_image(
+        self, full_path: Path, path: str, stamp: Tuple[int, int, int], max_width: int
+    ) -> Tuple[bytes, Dict[str, Any]]:
+        """Load an image and cache it under stamp unless loading it failed."""
+        image = await self._load_image(full_path, path, max_width)
+        if "error" not in image[1]:
+            self._image_cache.put(path, stamp, image)
+        return image
+    
+    async def _load_image(self, full_path: Path, path: str, max_width: int) -> Tuple[bytes, Dict[str, Any]]:
+        """Read an image file and resize it to max_width if it is wider."""
+        # Read binary content in a worker thread
+        content = await asyncio.to_thread(full_path.read_bytes)
         
         # Determine MIME type
-        ext = full_path.suffix.lower()
-        mime_types = {
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp',
-            '.svg': 'image/svg+xml',
-            '.bmp': 'image/bmp',
-            '.ico': 'image/x-icon'
-        }
-        mime_type = mime_types.get(ext, 'application/octet-stream')
+        ext = os.path.splitext(path)[1].lower()
+        mime_type = IMAGE_MIME_TYPES.get(ext, 'application/octet-stream')
         
         # Skip resizing for SVG images (vector graphics)
         if ext == '.svg':
-            base64_content = base64.b64encode(content).decode('utf-8')
-            return {
+            return content, {
                 "path": path,
-                "content": base64_content,
                 "mime_type": mime_type,
                 "size": len(content),
                 "original_size": len(content)
             }
         
-        # Resize image if needed
-        try:
-            # Open image with PIL
-            img = Image.open(io.BytesIO(content))
-            original_width, original_height = img.size
-            
-            # Only resize if image is larger than max_width
-            if original_width > max_width:
-                # Calculate new height maintaining aspect ratio
-                aspect_ratio = original_height / original_width
-                new_height = int(max_width * aspect_ratio)
-                
-                # Resize image
-                img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Save to bytes
-                output = io.BytesIO()
-                # Use appropriate format based on original
-                if ext in ['.jpg', '.jpeg']:
-                    img.save(output, format='JPEG', quality=85, optimize=True)
-                elif ext == '.png':
-                    img.save(output, format='PNG', optimize=True)
-                elif ext == '.webp':
-                    img.save(output, format='WEBP', quality=85)
-                else:
-                    # For other formats, convert to PNG
-                    img.save(output, format='PNG', optimize=True)
-                    mime_type = 'image/png'
-                
-                resized_content = output.getvalue()
-                base64_content = base64.b64encode(resized_content).decode('utf-8')
-                
-                return {
-                    "path": path,
-                    "content": base64_content,
-                    "mime_type": mime_type,
-                    "size": len(resized_content),
-                    "original_size": len(content),
-                    "resized": True,
-                    "dimensions": {
-                        "original": {"width": original_width, "height": original_height},
-                        "resized": {"width": max_width, "height": new_height}
-                    }
-                }
-            else:
-                # Image is already small enough, return as-is
-                base64_content = base64.b64encode(content).decode('utf-8')
-                return {
-                    "path": path,
-                    "content": base64_content,
-                    "mime_type": mime_type,
-                    "size": len(content),
-                    "original_size": len(content),
-                    "resized": False,
-                    "dimensions": {
-                        "original": {"width": original_width, "height": original_height}
-                    }
-                }
-        except Exception as e:
-            # If image processing fails, return original (but this might be too large)
-            # Log the error for debugging
-            print(f"Warning: Failed to process image {path}: {e}")
-            base64_content = base64.b64encode(content).decode('utf-8')
-            return {
-                "path": path,
-                "content": base64_content,
-                "mime_type": mime_type,
-                "size": len(content),
-                "original_size": len(content),
-                "error": str(e)
-            }
+        # Decode, resize and re-encode in a worker thread: Pillow releases the
+        # GIL for this work, so it neither blocks the event loop nor other images
+        return await asyncio.to_thread(_resize_image, path, content, ext, mime_type, max_width)
     
 
 # Global vault instance (will be initialized in server.py)
@@ -913,5 +1350,7 @@ def init_vault(vault_path: Optional[str] = None) -> ObsidianVault:
     """
     global vault
     
+    if vault is not None:
+        vault._watcher.stop()
     vault = ObsidianVault(vault_path)
     return vault
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""Fast parsing of YAML frontmatter for Obsidian notes."""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+# libyaml-backed loader when PyYAML was built with it (~10x faster), pure Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_RESOLVER = Resolver()
+_CONSTRUCTOR = SafeConstructor()
+
+# "key: value" / "key:" at the start of a line. Keys are limited to plain words
+# so the mapping structure itself never needs YAML's quoting rules.
+_KEY_LINE = re.compile(r"([A-Za-z_][\w\- ]*?):(?: (.*))?$")
+_LIST_ITEM = re.compile(r"( *)- (.*)$")
+
+# Characters that give a plain scalar a special meaning when they lead it
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+# Characters a flow sequence item must not contain
+_FLOW_SPECIAL = frozenset("[]{}:#'\"")
+
+# Anything but "\n" and YAML's printable characters that aren't line breaks:
+# tabs, "\r", control characters (which YAML rejects) and the line breaks
+# \x85, \u2028 and \u2029 (which split lines where str.split("\n") doesn't)
+_NEEDS_FULL_PARSER = re.compile("[^\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+
+class _Unsupported(Exception):
+    """Raised when frontmatter needs the full YAML parser."""
+
+
+def yaml_safe_load(text: str) -> Any:
+    """Drop-in replacement for yaml.safe_load that prefers the C loader."""
+    return yaml.load(text, Loader=_YAML_LOADER)
+
+
+def _plain_scalar(value: str) -> Any:
+    """Resolve an unquoted scalar exactly like YAML would (str, int, bool, date, ...)."""
+    if not value or value[0] in _INDICATORS or ": " in value or " #" in value or value[-1] == ":":
+        raise _Unsupported
+    tag = _RESOLVER.resolve(ScalarNode, value, (True, False))
+    if tag == _STR_TAG:
+        return value
+    constructor = SafeConstructor.yaml_constructors.get(tag)
+    if constructor is None:
+        # e.g. the merge key "<<"
+        raise _Unsupported
+    return constructor(_CONSTRUCTOR, ScalarNode(tag, value))
+
+
+def _scalar(value: str) -> Any:
+    """Parse a single-line scalar, quoted or plain."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        inner = value[1:-1]
+        # Escapes and embedded quotes need the real parser
+        if value[0] in inner or "\\" in inner:
+            raise _Unsupported
+        return inner
+    return _plain_scalar(value)
+
+
+def _flow_sequence(value: str) -> List[Any]:
+    """Parse a simple one-line flow sequence such as "[a, b, c]"."""
+    inner = value[1:-1].strip(" ")
+    if not inner:
+        return []
+    if any(ch in _FLOW_SPECIAL for ch in inner):
+        raise _Unsupported
+    items = [item.strip(" ") for item in inner.split(",")]
+    if not all(items):
+        raise _Unsupported
+    return [_plain_scalar(item) for item in items]
+
+
+def _check_key(key: str) -> str:
+    """Reject keys YAML would read as something other than a plain string."""
+    if key != key.rstrip(" ") or _RESOLVER.resolve(ScalarNode, key, (True, False)) != _STR_TAG:
+        raise _Unsupported
+    return key
+
+
+def _parse_simple(text: str) -> Dict[str, Any]:
+    """
+    Parse flat frontmatter: "key: scalar", "key: [a, b]" and "key:" followed by "- item" lines.
+
+    Raises:
+        _Unsupported: For anything else (nested maps, anchors, multi-line scalars, ...)
+    """
+    if _NEEDS_FULL_PARSER.search(text):
+        raise _Unsupported
+
+    result: Dict[str, Any] = {}
+    list_key: Optional[str] = None
+    list_indent: Optional[int] = None
+
+    for line in text.split("\n"):
+        stripped = line.strip(" ")
+        if not stripped or stripped[0] == "#":
+            continue
+
+        item = _LIST_ITEM.match(line)
+        if item is not None and list_key is not None:
+            indent = len(item.group(1))
+            if list_indent is None:
+                list_indent = indent
+                result[list_key] = []
+            elif indent != list_indent:
+                raise _Unsupported
+            result[list_key].append(_scalar(item.group(2).strip(" ")))
+            continue
+
+        if line[0] == " ":
+            # Nested mapping or a continuation line
+            raise _Unsupported
+
+        match = _KEY_LINE.match(line.rstrip(" "))
+        if match is None:
+            raise _Unsupported
+        key = _check_key(match.group(1))
+        value = (match.group(2) or "").strip(" ")
+
+        list_key = list_indent = None
+        if not value:
+            # Either an empty value (null) or the start of a block sequence
+            result[key] = None
+            list_key = key
+        elif value[0] == "[" and value[-1] == "]":
+            result[key] = _flow_sequence(value)
+        else:
+            result[key] = _scalar(value)
+
+    return result
+
+
+def load_frontmatter(text: str) -> Any:
+    """
+    Parse the YAML text between a note's "---" fences.
+
+    Flat frontmatter, which is what almost every note has, is handled by a
+    line-oriented parser that resolves scalars with YAML's own rules; anything
+    it doesn't recognise, including text with characters outside YAML's
+    printable set or line breaks other than "\\n", goes through the full
+    (libyaml when available) loader, so the result is what yaml.safe_load
+    would return.
+
+    Args:
+        text: Frontmatter text without the fences
+
+    Returns:
+        Parsed YAML value (normally a dict, None for empty frontmatter)
+
+    Raises:
+        yaml.YAMLError: If the frontmatter is not valid YAML
+    """
+    try:
+        return _parse_simple(text) or None
+    except _Unsupported:
+        return yaml_safe_load(text)
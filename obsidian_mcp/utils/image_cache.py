@@ -0,0 +1,58 @@
+"""In-memory LRU cache of processed images for Obsidian vault."""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+ImageData = Tuple[bytes, Dict[str, Any]]
+
+
+class ImageCache:
+    """
+    LRU cache of resized image bytes, bounded by their total size.
+
+    Like NoteCache, each entry remembers a stamp of the file it was made from
+    (mtime_ns, size and the max_width it was resized to), so a changed file or
+    a different width is a miss.
+    """
+
+    def __init__(self, maxbytes: int = 64 * 1024 * 1024):
+        """
+        Initialize image cache.
+
+        Args:
+            maxbytes: Maximum total size of cached image bytes
+        """
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._entries: "OrderedDict[str, Tuple[Hashable, ImageData]]" = OrderedDict()
+
+    def get(self, path: str, stamp: Hashable) -> Optional[ImageData]:
+        """Return the cached image if it was made from the file version given by stamp."""
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != stamp:
+            return None
+        self._entries.move_to_end(path)
+        return entry[1]
+
+    def put(self, path: str, stamp: Hashable, image: ImageData) -> None:
+        """Cache an image, evicting the least recently used ones to stay within maxbytes."""
+        size = len(image[0])
+        if size > self.maxbytes:
+            return
+        self.invalidate(path)
+        self._entries[path] = (stamp, image)
+        self.nbytes += size
+        while self.nbytes > self.maxbytes:
+            _, (_, (content, _)) = self._entries.popitem(last=False)
+            self.nbytes -= len(content)
+
+    def invalidate(self, path: str) -> None:
+        """Forget an image."""
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.nbytes -= len(entry[1][0])
+
+    def clear(self) -> None:
+        """Forget all images."""
+        self._entries.clear()
+        self.nbytes = 0
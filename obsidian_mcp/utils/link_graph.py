@@ -0,0 +1,164 @@
+"""Link extraction and in-memory link graph for Obsidian vault."""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+
+# Regular expressions for matching different link types
+WIKI_LINK_PATTERN = re.compile(r'\[\[([^\]|]+)(\|([^\]]+))?\]\]')
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+
+# Both link types in one pattern, so content is scanned once. Groups 1-3 are
+# those of WIKI_LINK_PATTERN; groups 4-5 those of MARKDOWN_LINK_PATTERN.
+LINK_PATTERN = re.compile(f"{WIKI_LINK_PATTERN.pattern}|{MARKDOWN_LINK_PATTERN.pattern}")
+
+# Embedded images: wiki-style ![[image.png]] and markdown ![alt text](image.png)
+WIKI_IMAGE_PATTERN = re.compile(r'!\[\[([^]]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico))\]\]', re.IGNORECASE)
+MARKDOWN_IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\(([^)]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico))\)', re.IGNORECASE)
+
+# Both embed styles in one pattern, so content is scanned once. Group 1 is the
+# wiki-style image path, group 2 the markdown one.
+IMAGE_PATTERN = re.compile(f"{WIKI_IMAGE_PATTERN.pattern}|{MARKDOWN_IMAGE_PATTERN.pattern}", re.IGNORECASE)
+
+# Markdown link targets that aren't notes: common URL schemes (any other
+# "scheme://" is caught separately) and anchors within the same note
+NON_NOTE_PREFIXES = ('http://', 'https://', 'mailto:', 'ftp://', '#')
+
+
+class Link(NamedTuple):
+    """
+    An outgoing link of a note.
+
+    Vault-wide passes handle one per link, so they are tuples rather than
+    dicts; tools convert them with _asdict() only for the links they return.
+    """
+
+    path: str
+    display_text: str
+    type: str
+
+
+def extract_links_from_content(content: str) -> List[Link]:
+    """
+    Extract all links from note content.
+
+    Finds both wiki-style ([[Link]]) and markdown-style ([text](link)) links.
+
+    Args:
+        content: The note content to extract links from
+
+    Returns:
+        Links with path, display text, and type (wiki-style links first,
+        then markdown-style ones)
+    """
+    # Every link starts with '['; a note without one is ruled out by a single
+    # memchr-speed scan (cheaper than a two-character substring or the regex)
+    if '[' not in content:
+        return []
+
+    links = []
+    markdown_links = []
+
+    for match in LINK_PATTERN.finditer(content):
+        target = match.group(1)
+        if target is not None:
+            # Wiki-style link
+            link_path = target.strip()
+            alias = match.group(3)
+
+            # Ensure .md extension for internal links
+            if not link_path.endswith('.md') and not link_path.startswith('http'):
+                link_path += '.md'
+
+            links.append(Link(link_path, alias.strip() if alias else target.strip(), 'wiki'))
+            continue
+
+        # Markdown-style link (only internal links, not URLs)
+        link_path = match.group(5).strip()
+
+        # Skip external URLs and in-note anchors
+        if link_path.startswith(NON_NOTE_PREFIXES) or '://' in link_path:
+            continue
+
+        # Ensure .md extension
+        if not link_path.endswith('.md'):
+            link_path += '.md'
+
+        markdown_links.append(Link(link_path, match.group(4).strip(), 'markdown'))
+
+    links.extend(markdown_links)
+    return links
+
+
+class LinkGraph:
+    """
+    Forward and reverse link maps between notes.
+
+    Link targets are stored as written in the note (with '.md' appended), so
+    "[[Note]]" and "[[Folder/Note]]" are different targets; callers resolve
+    targets against the note's full path and its bare filename.
+    """
+
+    def __init__(self):
+        """Initialize an empty link graph."""
+        self.forward: Dict[str, Set[str]] = {}
+        self.reverse: Dict[str, Set[str]] = {}
+
+    def set_links(self, path: str, targets: Iterable[str]) -> None:
+        """
+        Replace the outgoing links of a note.
+
+        Args:
+            path: Note containing the links
+            targets: Link target paths found in the note
+        """
+        self.remove(path)
+        targets = set(targets)
+        if not targets:
+            return
+        self.forward[path] = targets
+        for target in targets:
+            self.reverse.setdefault(target, set()).add(path)
+
+    def remove(self, path: str) -> None:
+        """Forget the outgoing links of a note."""
+        for target in self.forward.pop(path, ()):
+            sources = self.reverse.get(target)
+            if sources is not None:
+                sources.discard(path)
+                if not sources:
+                    del self.reverse[target]
+
+    def sources_of(self, targets: Iterable[str]) -> Set[str]:
+        """
+        Get all notes linking to any of the given targets.
+
+        Args:
+            targets: Link target paths
+
+        Returns:
+            Set of source note paths
+        """
+        sources: Set[str] = set()
+        for target in targets:
+            sources.update(self.reverse.get(target, ()))
+        return sources
+
+    def has_sources(self, targets: Iterable[str], ignore: str = "") -> bool:
+        """
+        Check whether any note links to any of the given targets.
+
+        Stops at the first linking note rather than collecting them all.
+
+        Args:
+            targets: Link target paths
+            ignore: Source note that doesn't count (e.g. the note itself)
+
+        Returns:
+            True if some note other than ``ignore`` links to a target
+        """
+        for target in targets:
+            sources = self.reverse.get(target)
+            if sources and (len(sources) > 1 or ignore not in sources):
+                return True
+        return False
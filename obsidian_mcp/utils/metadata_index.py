@@ -0,0 +1,222 @@
+"""Disk-backed cache of per-note metadata for Obsidian vault."""
+
+import os
+import sys
+import logging
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Set
+
+from .link_graph import Link, LinkGraph
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        # Frontmatter may use non-string keys (e.g. years), which json.dumps stringifies too
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:  # orjson is optional; fall back to the stdlib
+    import json
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+# Bump when the shape of cached entries (or how links and tags are extracted)
+# changes so stale caches are discarded
+INDEX_VERSION = 3
+
+
+def _stored_link(target: str, display_text: str, link_type: str) -> List[str]:
+    """
+    Build the [path, display_text, type] form links are stored in.
+
+    The list keeps the cache file compact. Link targets and types repeat
+    across many notes, so they are interned to keep one copy of each in
+    memory, shared with the link graph.
+    """
+    return [sys.intern(target), display_text, sys.intern(link_type)]
+
+
+class MetadataIndex:
+    """
+    JSON-backed cache of parsed note metadata (tags, frontmatter, links).
+
+    Entries are keyed by vault-relative path and validated against the file's
+    mtime and size, so only notes that changed since the last scan have to be
+    re-read and re-parsed. An inverted tag -> note paths index and a link
+    graph are kept in memory alongside the entries.
+    """
+
+    def __init__(self, vault_path: Path, index_path: Optional[Path] = None):
+        """
+        Initialize metadata index.
+
+        Args:
+            vault_path: Path to the Obsidian vault
+            index_path: Path to store the JSON cache (defaults to vault/.obsidian/mcp-metadata-index.json)
+        """
+        self.vault_path = vault_path
+
+        if index_path is None:
+            self.index_path = vault_path / ".obsidian" / "mcp-metadata-index.json"
+        else:
+            self.index_path = index_path
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.tag_index: Dict[str, Set[str]] = {}
+        self.link_graph = LinkGraph()
+        # Sorted entry paths for folder lookups, rebuilt after notes come or go
+        self._sorted_paths: Optional[List[str]] = None
+        self._loaded = False
+        self._dirty = False
+
+    def load(self) -> None:
+        """Load cached entries from disk, ignoring missing or unreadable caches."""
+        self._loaded = True
+        try:
+            data = _json_loads(self.index_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:  # ValueError covers both JSONDecodeErrors
+            logger.warning(f"Ignoring unreadable metadata index {self.index_path}: {e}")
+            return
+
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            logger.info("Metadata index format changed, rebuilding")
+            return
+
+        self.entries = data.get("entries", {})
+        self._sorted_paths = None
+        for path, entry in self.entries.items():
+            # The JSON decoder creates a new string for every occurrence of a value
+            entry["tags"] = [sys.intern(tag) for tag in entry["tags"]]
+            entry["links"] = [_stored_link(*link) for link in entry["links"]]
+            self._add_tags(path, entry["tags"])
+            self.link_graph.set_links(path, (link[0] for link in entry["links"]))
+
+    def save(self) -> None:
+        """Persist entries to disk if anything changed since the last save."""
+        if not self._dirty:
+            return
+
+        try:
+            self.index_path.parent.mkdir(exist_ok=True)
+            # Write to a sibling temp file and rename so readers never see a partial file
+            tmp_path = self.index_path.with_suffix(self.index_path.suffix + ".tmp")
+            tmp_path.write_bytes(_json_dumps({"version": INDEX_VERSION, "entries": self.entries}))
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except (OSError, TypeError) as e:
+            # A read-only vault still works, it just rescans on every start
+            logger.warning(f"Failed to save metadata index: {e}")
+
+    def is_fresh(self, path: str, mtime: float, size: int) -> bool:
+        """Check whether the cached entry for a note matches its current stat."""
+        if not self._loaded:
+            self.load()
+        entry = self.entries.get(path)
+        return entry is not None and entry["mtime"] == mtime and entry["size"] == size
+
+    def update(
+        self,
+        path: str,
+        mtime: float,
+        size: int,
+        tags: List[str],
+        frontmatter: Dict[str, Any],
+        links: List[Link],
+    ) -> None:
+        """Store freshly parsed metadata for a note."""
+        old_entry = self.entries.get(path)
+        if old_entry is not None:
+            self._remove_tags(path, old_entry["tags"])
+        else:
+            self._sorted_paths = None
+        tags = [sys.intern(tag) for tag in tags]
+        stored_links = [_stored_link(*link) for link in links]
+        self._add_tags(path, tags)
+        self.link_graph.set_links(path, (link[0] for link in stored_links))
+        self.entries[path] = {
+            "mtime": mtime,
+            "size": size,
+            "tags": tags,
+            "frontmatter": frontmatter,
+            "links": stored_links,
+        }
+        self._dirty = True
+
+    def get_links(self, path: str) -> Optional[List[Link]]:
+        """
+        Get the cached outgoing links of a note.
+
+        Args:
+            path: Relative path of the note
+
+        Returns:
+            Links in the format of extract_links_from_content, or None if the note isn't indexed
+        """
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        return [Link(*link) for link in entry["links"]]
+
+    def paths_under(self, folder: str) -> List[str]:
+        """
+        Get the sorted paths of indexed notes inside a folder, recursively.
+
+        Args:
+            folder: Folder relative to the vault root
+
+        Returns:
+            Paths of the notes below folder
+        """
+        if self._sorted_paths is None:
+            self._sorted_paths = sorted(self.entries)
+        # Paths below "folder/" sort between it and "folder0" ('0' follows '/')
+        prefix = folder.strip("/") + "/"
+        lo = bisect_left(self._sorted_paths, prefix)
+        hi = bisect_left(self._sorted_paths, prefix[:-1] + "0", lo)
+        return self._sorted_paths[lo:hi]
+
+    def remove(self, path: str) -> None:
+        """Drop the entry for a single note, if present."""
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self._remove_tags(path, entry["tags"])
+            self.link_graph.remove(path)
+            self._sorted_paths = None
+            self._dirty = True
+
+    def prune(self, existing_paths: Iterable[str]) -> None:
+        """Drop entries for notes that no longer exist."""
+        existing = set(existing_paths)
+        stale = [path for path in self.entries if path not in existing]
+        for path in stale:
+            self._remove_tags(path, self.entries.pop(path)["tags"])
+            self.link_graph.remove(path)
+        if stale:
+            self._sorted_paths = None
+            self._dirty = True
+
+    def _add_tags(self, path: str, tags: List[str]) -> None:
+        """Add a note to the posting list of each of its tags."""
+        for tag in tags:
+            if tag:
+                self.tag_index.setdefault(tag, set()).add(path)
+
+    def _remove_tags(self, path: str, tags: List[str]) -> None:
+        """Remove a note from the posting list of each of its tags."""
+        for tag in tags:
+            paths = self.tag_index.get(tag)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.tag_index[tag]
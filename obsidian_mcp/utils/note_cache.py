@@ -0,0 +1,49 @@
+"""In-memory LRU cache of parsed notes for Obsidian vault."""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..models import Note
+
+
+class NoteCache:
+    """
+    Bounded LRU cache of parsed notes.
+
+    Each entry remembers the (mtime_ns, size) stamp of the file it was parsed
+    from; a lookup with a different stamp is a miss, so edits made outside the
+    server are picked up on the next read.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize note cache.
+
+        Args:
+            maxsize: Maximum number of notes to keep
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Note]]" = OrderedDict()
+
+    def get(self, path: str, stamp: Tuple[int, int]) -> Optional[Note]:
+        """Return the cached note if it was parsed from the file version given by stamp."""
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != stamp:
+            return None
+        self._entries.move_to_end(path)
+        return entry[1]
+
+    def put(self, path: str, stamp: Tuple[int, int], note: Note) -> None:
+        """Cache a parsed note, evicting the least recently used one if full."""
+        self._entries[path] = (stamp, note)
+        self._entries.move_to_end(path)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        """Forget a note, e.g. after it was written or deleted."""
+        self._entries.pop(path, None)
+
+    def clear(self) -> None:
+        """Forget all notes."""
+        self._entries.clear()
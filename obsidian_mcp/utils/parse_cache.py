@@ -0,0 +1,55 @@
+"""Content-addressed cache of parsed note metadata for Obsidian vault."""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Dict, Hashable, Optional
+
+
+def content_key(content: str) -> bytes:
+    """Return an 8-byte BLAKE2b digest of note text for use as a cache key."""
+    return blake2b(content.encode("utf-8"), digest_size=8).digest()
+
+
+class ParseCache:
+    """
+    Bounded FIFO cache of parse results keyed by content digest.
+
+    Unlike NoteCache, entries don't depend on the file they came from, so a
+    note whose mtime changed without its text changing (touched, re-synced,
+    checked out again) or a copy of another note is not parsed twice.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize parse cache.
+
+        Args:
+            maxsize: Maximum number of parse results to keep
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached parse result for a content key, if any."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a parse result, evicting the oldest one if full."""
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Forget all parse results."""
+        self._entries.clear()
@@ -1,10 +1,16 @@
 """Persistent search index using SQLite for Obsidian vault."""
 
 import os
+import re
 import hashlib
 import json
 import asyncio
+import sqlite3
+import multiprocessing
 import aiosqlite
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
@@ -12,6 +18,350 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Under IGNORECASE these also match non-ASCII letters that don't lowercase to
+# them (dotless i, long s), so they can't be part of a pre-filter literal
+_CASE_AMBIGUOUS = frozenset("iIsS")
+
+
+def required_literals(pattern: str, flags: int = 0) -> List[str]:
+    """
+    Find literal strings that every match of a regular expression must contain.
+    
+    Only top-level runs of plain ASCII characters are collected; groups,
+    classes, repeats and alternation end the current run. The result is
+    lowercased to match the trigram index and is always safe to use as a
+    pre-filter (an empty list means no filtering is possible).
+    
+    Args:
+        pattern: Regular expression pattern
+        flags: Regex flags (e.g., re.IGNORECASE)
+        
+    Returns:
+        Literals of 3+ characters, lowercased
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return []
+    
+    ignore_case = bool(parsed.state.flags & re.IGNORECASE)
+    literals = []
+    run = []
+    for op, av in parsed:
+        if op is sre_parse.LITERAL and av < 128 and not (ignore_case and chr(av) in _CASE_AMBIGUOUS):
+            run.append(chr(av))
+            continue
+        if len(run) >= 3:
+            literals.append("".join(run).lower())
+        run = []
+    if len(run) >= 3:
+        literals.append("".join(run).lower())
+    return literals
+
+
+try:
+    import re2  # google-re2: linear-time matching, immune to catastrophic backtracking
+except ImportError:  # re2 is optional; Python's re is used
+    re2 = None
+
+# Flags RE2 understands, as inline flag letters
+_RE2_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+# RE2 rejects counted repetitions above this
+_RE2_MAX_REPEAT = 1000
+
+
+def _re2_equivalent(items, multiline: bool) -> bool:
+    """Check that a parsed pattern only uses constructs RE2 matches exactly like re."""
+    for op, av in items:
+        if op in (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.ANY):
+            continue
+        if op is sre_parse.IN:
+            # \w, \d, \s are Unicode-aware in re but ASCII-only in RE2
+            if any(item_op is sre_parse.CATEGORY for item_op, _ in av):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_re2_equivalent(branch, multiline) for branch in av[1]):
+                return False
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            if add_flags or del_flags or not _re2_equivalent(sub, multiline):
+                return False
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            min_count, max_count, sub = av
+            if min_count > _RE2_MAX_REPEAT:
+                return False
+            if max_count != sre_parse.MAXREPEAT and max_count > _RE2_MAX_REPEAT:
+                return False
+            if not _re2_equivalent(sub, multiline):
+                return False
+        elif op is sre_parse.AT:
+            # Without MULTILINE, re's '$' also matches before a trailing newline
+            if av not in (sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING) and not (
+                multiline and av is sre_parse.AT_END
+            ):
+                return False
+        else:
+            # Backreferences, lookarounds, conditionals, atomic groups, ...
+            return False
+    return True
+
+
+def re2_compatible(pattern: str, flags: int = 0) -> bool:
+    """
+    Check whether RE2 would find exactly the same matches as Python's re.
+    
+    Args:
+        pattern: Regular expression pattern
+        flags: Regex flags (e.g., re.IGNORECASE)
+        
+    Returns:
+        True if the pattern can safely be handed to RE2
+    """
+    # Syntax that re reads literally but RE2 gives a meaning ('{,n}', POSIX classes)
+    if "{," in pattern or "[:" in pattern:
+        return False
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return False
+    
+    state_flags = parsed.state.flags & ~re.UNICODE
+    if state_flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL):
+        return False
+    return _re2_equivalent(parsed, bool(state_flags & re.MULTILINE))
+
+
+def compile_search_regex(pattern: str, flags: int = 0):
+    """
+    Compile a search pattern, using RE2 when it's installed and equivalent.
+    
+    Args:
+        pattern: Regular expression pattern
+        flags: Regex flags (e.g., re.IGNORECASE)
+        
+    Returns:
+        Compiled pattern supporting finditer()
+        
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    regex = re.compile(pattern, flags)
+    if re2 is None or not re2_compatible(pattern, flags):
+        return regex
+    
+    inline_flags = "".join(letter for flag, letter in _RE2_FLAGS.items() if flags & flag)
+    try:
+        return re2.compile(f"(?{inline_flags}){pattern}" if inline_flags else pattern)
+    except Exception as e:
+        logger.debug(f"RE2 rejected pattern, using re: {e}")
+        return regex
+
+
+def _trigram_match_query(literals: List[str]) -> str:
+    """Build an FTS5 query requiring every literal as a substring."""
+    return " AND ".join('"' + literal.replace('"', '""') + '"' for literal in literals)
+
+
+# Candidate sets at least this large are scanned in worker processes
+PARALLEL_SCAN_BYTES = 8 * 1024 * 1024
+# Note content is loaded from the index at most this much at a time
+_SCAN_CHUNK_BYTES = 2 * 1024 * 1024
+_SCAN_CHUNK_ROWS = 500
+# Files larger than this are scanned in overlapping chunks
+_LARGE_FILE_BYTES = 1024 * 1024
+
+_regex_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _regex_workers() -> int:
+    """Number of worker processes for regex scans (OBSIDIAN_REGEX_WORKERS, default: CPU count)."""
+    return int(os.getenv("OBSIDIAN_REGEX_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def _get_regex_pool() -> ProcessPoolExecutor:
+    """Create the regex worker pool on first use."""
+    global _regex_pool
+    if _regex_pool is None:
+        # spawn: forking a process that runs the event loop and aiosqlite threads isn't safe
+        _regex_pool = ProcessPoolExecutor(
+            max_workers=_regex_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _regex_pool
+
+
+def _discard_regex_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken regex worker pool so the next parallel scan starts a new one."""
+    global _regex_pool
+    if _regex_pool is pool:
+        _regex_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _match_context(content: str, match, match_start: int, line_starts: Optional[List[int]],
+                   context_length: int) -> Dict[str, Any]:
+    """Build the result entry for one regex match."""
+    match_end = match_start + len(match.group(0))
+    
+    # Find line number efficiently
+    if line_starts:
+        line_num = bisect_right(line_starts, match_start)
+    else:
+        # Fallback: count newlines before match
+        line_num = content.count('\n', 0, match_start) + 1
+    
+    # Extract context
+    context_start = max(0, match_start - context_length // 2)
+    context_end = min(len(content), match_end + context_length // 2)
+    context = content[context_start:context_end].strip()
+    
+    # Add ellipsis if truncated
+    if context_start > 0:
+        context = "..." + context
+    if context_end < len(content):
+        context = context + "..."
+    
+    return {
+        "match": match.group(0),
+        "line": line_num,
+        "context": context,
+        "groups": match.groups() if match.groups() else None
+    }
+
+
+def _search_content(content: str, regex, line_starts: Optional[List[int]],
+                    context_length: int, max_matches: int = 5) -> List[Dict[str, Any]]:
+    """Search content and return match contexts."""
+    match_contexts = []
+    for match in regex.finditer(content):
+        if len(match_contexts) >= max_matches:
+            break
+        match_contexts.append(_match_context(content, match, match.start(), line_starts, context_length))
+    return match_contexts
+
+
+def _search_content_chunked(content: str, regex, line_starts: Optional[List[int]],
+                            context_length: int, max_matches: int = 5) -> List[Dict[str, Any]]:
+    """Search large content in chunks so matching stops early without slicing the whole text."""
+    match_contexts = []
+    chunk_size = 512 * 1024  # 512KB chunks
+    overlap = 1024  # 1KB overlap to catch matches at boundaries
+    last_start = -1
+    
+    pos = 0
+    while pos < len(content) and len(match_contexts) < max_matches:
+        # Extract chunk with overlap
+        chunk_start = max(0, pos - overlap)
+        chunk = content[chunk_start:min(len(content), pos + chunk_size)]
+        
+        for match in regex.finditer(chunk):
+            # Adjust match position to full content coordinates
+            match_start = chunk_start + match.start()
+            
+            # Skip if this match was already found in overlap
+            if match_start <= last_start:
+                continue
+            
+            last_start = match_start
+            match_contexts.append(_match_context(content, match, match_start, line_starts, context_length))
+            if len(match_contexts) >= max_matches:
+                break
+        
+        # Move to next chunk
+        pos += chunk_size
+    
+    return match_contexts
+
+
+def _scan_files_regex(rows: List[Tuple[str, str, int, Optional[str]]], pattern: str, flags: int,
+                      context_length: int, limit: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Run a regex over indexed files, in a worker thread or process.
+    
+    Args:
+        rows: (filepath, content, size, line_offsets JSON) tuples, in result order
+        pattern: Regular expression pattern
+        flags: Regex flags (e.g., re.IGNORECASE)
+        context_length: Characters to show around match
+        limit: Stop after this many files with matches
+        
+    Returns:
+        (filepath, match contexts) for each matching file
+    """
+    regex = compile_search_regex(pattern, flags)
+    results = []
+    for filepath, content, size, line_offsets_json in rows:
+        try:
+            try:
+                line_starts = json.loads(line_offsets_json) if line_offsets_json else None
+            except ValueError:
+                line_starts = None
+            
+            search = _search_content_chunked if size > _LARGE_FILE_BYTES else _search_content
+            match_contexts = search(content, regex, line_starts, context_length)
+        except Exception as e:
+            logger.error(f"Error processing file {filepath}: {e}")
+            continue
+        
+        if match_contexts:
+            results.append((filepath, match_contexts))
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _split_by_size(candidates: List[Tuple[int, int]], target_bytes: int,
+                   max_rows: int = _SCAN_CHUNK_ROWS) -> List[List[int]]:
+    """
+    Split (rowid, size) candidates, keeping their order, into chunks of rowids.
+    
+    Args:
+        candidates: (rowid, size) pairs in result order
+        target_bytes: Close a chunk once its notes add up to this many bytes
+        max_rows: Close a chunk once it has this many notes
+        
+    Returns:
+        Lists of rowids
+    """
+    chunks, chunk, chunk_bytes = [], [], 0
+    for rowid, size in candidates:
+        chunk.append(rowid)
+        chunk_bytes += size
+        if chunk_bytes >= target_bytes or len(chunk) >= max_rows:
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _rows_query(rowids: List[int]) -> str:
+    """Build the query loading the notes for a chunk of rowids."""
+    placeholders = ",".join("?" * len(rowids))
+    return f"SELECT rowid, filepath, content, size, line_offsets FROM file_index WHERE rowid IN ({placeholders})"
+
+
+def _order_rows(rowids: List[int], rows) -> List[Tuple[str, str, int, Optional[str]]]:
+    """Put fetched rows back in candidate order (dropping notes removed meanwhile)."""
+    by_rowid = {row[0]: tuple(row[1:]) for row in rows}
+    return [by_rowid[rowid] for rowid in rowids if rowid in by_rowid]
+
+
+def _scan_indexed_regex(index_uri: str, rowids: List[int], pattern: str, flags: int,
+                        context_length: int, limit: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """Worker process entry point: load a chunk of notes straight from the index and scan it."""
+    conn = sqlite3.connect(index_uri, uri=True)
+    try:
+        rows = _order_rows(rowids, conn.execute(_rows_query(rowids), rowids))
+    finally:
+        conn.close()
+    return _scan_files_regex(rows, pattern, flags, context_length, limit)
+
 
 class PersistentSearchIndex:
     """SQLite-based persistent search index for efficient vault searching."""
@@ -36,6 +386,7 @@ class PersistentSearchIndex:
             
         self.db: Optional[aiosqlite.Connection] = None
         self._lock = asyncio.Lock()
+        self._trigram_enabled = False
         
     async def initialize(self):
         """Initialize database connection and create tables if needed."""
@@ -107,7 +458,65 @@ class PersistentSearchIndex:
             )
         """)
         
+        self._trigram_enabled = await self._create_trigram_index()
+        
         await self.db.commit()
+    
+    async def _create_trigram_index(self) -> bool:
+        """
+        Create the trigram index used to pre-filter substring and regex searches.
+        
+        It indexes file_index.content_lower as external content (no second copy
+        of the text) and is kept in sync by triggers, so any string of 3+
+        characters can be looked up without scanning every note.
+        
+        Returns:
+            True if the index is available
+        """
+        cursor = await self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'file_trigram'"
+        )
+        exists = await cursor.fetchone() is not None
+        
+        try:
+            await self.db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS file_trigram
+                USING fts5(
+                    content_lower,
+                    content='file_index',
+                    content_rowid='rowid',
+                    tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            # The trigram tokenizer needs SQLite 3.34+; searches then scan every note
+            logger.info(f"Trigram index unavailable, searches will scan all notes: {e}")
+            return False
+        
+        await self.db.execute("""
+            CREATE TRIGGER IF NOT EXISTS file_trigram_insert AFTER INSERT ON file_index BEGIN
+                INSERT INTO file_trigram (rowid, content_lower) VALUES (new.rowid, new.content_lower);
+            END
+        """)
+        await self.db.execute("""
+            CREATE TRIGGER IF NOT EXISTS file_trigram_delete AFTER DELETE ON file_index BEGIN
+                INSERT INTO file_trigram (file_trigram, rowid, content_lower)
+                VALUES ('delete', old.rowid, old.content_lower);
+            END
+        """)
+        await self.db.execute("""
+            CREATE TRIGGER IF NOT EXISTS file_trigram_update AFTER UPDATE OF content_lower ON file_index BEGIN
+                INSERT INTO file_trigram (file_trigram, rowid, content_lower)
+                VALUES ('delete', old.rowid, old.content_lower);
+                INSERT INTO file_trigram (rowid, content_lower) VALUES (new.rowid, new.content_lower);
+            END
+        """)
+        
+        if not exists:
+            # Index notes that were already in an older database
+            await self.db.execute("INSERT INTO file_trigram (file_trigram) VALUES ('rebuild')")
+        
+        return True
         
     async def close(self):
         """Close database connection."""
@@ -193,11 +602,21 @@ class PersistentSearchIndex:
         now = datetime.now().timestamp()
         
         async with self._lock:
-            # Update main index
+            # Update main index (an upsert rather than INSERT OR REPLACE, so the
+            # update trigger keeps the trigram index in sync)
             await self.db.execute("""
-                INSERT OR REPLACE INTO file_index 
+                INSERT INTO file_index 
                 (filepath, content, content_lower, mtime, size, content_hash, last_indexed, metadata, line_offsets)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (filepath) DO UPDATE SET
+                    content = excluded.content,
+                    content_lower = excluded.content_lower,
+                    mtime = excluded.mtime,
+                    size = excluded.size,
+                    content_hash = excluded.content_hash,
+                    last_indexed = excluded.last_indexed,
+                    metadata = excluded.metadata,
+                    line_offsets = excluded.line_offsets
             """, (filepath, content, content_lower, mtime, size, content_hash, now, metadata_json, line_offsets_json))
             
             # Update FTS index
@@ -269,31 +688,44 @@ class PersistentSearchIndex:
         Returns dictionary with results and metadata.
         """
         query_lower = query.lower()
-        search_pattern = f"%{query_lower}%"
+        
+        # instr() is a plain substring scan: no LIKE pattern to compile and
+        # no surprises from '%' or '_' in the query. For queries of 3+
+        # characters the trigram index narrows the scan to candidate notes.
+        if self._trigram_enabled and len(query_lower) >= 3:
+            where = """
+                rowid IN (SELECT rowid FROM file_trigram WHERE file_trigram MATCH ?)
+                AND instr(content_lower, ?) > 0
+            """
+            params = (_trigram_match_query([query_lower]), query_lower)
+        else:
+            where = "instr(content_lower, ?) > 0"
+            params = (query_lower,)
         
         # First get total count
-        count_cursor = await self.db.execute("""
+        count_cursor = await self.db.execute(f"""
             SELECT COUNT(*)
             FROM file_index
-            WHERE content_lower LIKE ?
-        """, (search_pattern,))
+            WHERE {where}
+        """, params)
         total_count = (await count_cursor.fetchone())[0]
         
         # Then get limited results
-        cursor = await self.db.execute("""
-            SELECT filepath, content, mtime, size
+        cursor = await self.db.execute(f"""
+            SELECT filepath, content, content_lower, mtime, size
             FROM file_index
-            WHERE content_lower LIKE ?
+            WHERE {where}
             LIMIT ?
-        """, (search_pattern, limit))
+        """, params + (limit,))
         
         results = []
         async for row in cursor:
             results.append({
                 "filepath": row[0],
                 "content": row[1],
-                "mtime": row[2],
-                "size": row[3]
+                "content_lower": row[2],
+                "mtime": row[3],
+                "size": row[4]
             })
         
         return {
@@ -304,282 +736,120 @@ class PersistentSearchIndex:
         }
         
     async def search_regex(self, pattern: str, flags: int = 0, limit: int = 50, 
-                          context_length: int = 100, max_parallel: int = 10) -> List[Dict[str, Any]]:
+                          context_length: int = 100) -> List[Dict[str, Any]]:
         """
-        Search using regular expressions with efficient streaming and parallel processing.
+        Search using regular expressions.
+        
+        Candidate notes are narrowed down by the literals every match must
+        contain. The regex then runs off the event loop: in a worker thread, or
+        spread over a process pool when there are many megabytes to scan.
         
         Args:
             pattern: Regular expression pattern
             flags: Regex flags (e.g., re.IGNORECASE)
             limit: Maximum number of results
             context_length: Characters to show around match
-            max_parallel: Maximum number of files to process in parallel
             
         Returns:
             List of search results with matches and context
         """
-        import re
-        
-        # Compile regex pattern
+        # Validate the pattern up front
         try:
-            regex = re.compile(pattern, flags)
+            compile_search_regex(pattern, flags)
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
         
-        # Check if we can use FTS5 pre-filtering
-        literal_prefix = self._extract_literal_prefix(pattern)
+        # Literals every match must contain pre-filter notes before any regex runs
+        literals = required_literals(pattern, flags)
         
         # Build query - order by size for faster initial results
-        if literal_prefix and len(literal_prefix) >= 3:
-            # Escape special characters for FTS5
-            # FTS5 requires double quotes around phrases with special characters
-            fts5_query = f'"{literal_prefix}"'
-            
-            # Use FTS5 to pre-filter files containing the literal prefix
-            query = """
-                SELECT f.filepath, f.content, f.mtime, f.size, f.line_offsets
-                FROM file_index f
-                JOIN file_search s ON f.filepath = s.filepath
-                WHERE file_search MATCH ?
-                ORDER BY f.size ASC, f.mtime DESC
-            """
-            params = (fts5_query,)
+        if literals and self._trigram_enabled:
+            where = "WHERE rowid IN (SELECT rowid FROM file_trigram WHERE file_trigram MATCH ?)"
+            params: Tuple = (_trigram_match_query(literals),)
+        elif literals:
+            where = "WHERE " + " AND ".join("instr(content_lower, ?) > 0" for _ in literals)
+            params = tuple(literals)
         else:
             # Full scan, but ordered by size
-            query = """
-                SELECT filepath, content, mtime, size, line_offsets
-                FROM file_index
-                ORDER BY size ASC, mtime DESC
-            """
+            where = ""
             params = ()
         
-        cursor = await self.db.execute(query, params)
-        rows = await cursor.fetchall()
-        
-        # Process files in batches for parallel execution
-        results = []
-        total_results = 0
-        batch_size = max_parallel
-        
-        for i in range(0, len(rows), batch_size):
-            if total_results >= limit:
-                break
-                
-            batch = rows[i:i + batch_size]
-            
-            # Process batch in parallel
-            batch_tasks = []
-            for row in batch:
-                if total_results >= limit:
-                    break
-                    
-                filepath, content, mtime, size, line_offsets_json = row
-                
-                # Create task for processing this file
-                task = self._process_file_regex(
-                    filepath, content, size, line_offsets_json,
-                    regex, context_length
-                )
-                batch_tasks.append(task)
-            
-            # Wait for batch to complete
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            # Collect results
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    logger.error(f"Error processing file: {result}")
-                    continue
-                    
-                if result and result['match_contexts']:
-                    results.append({
-                        "filepath": result['filepath'],
-                        "match_count": len(result['match_contexts']),
-                        "matches": result['match_contexts'],
-                        "score": min(len(result['match_contexts']) / 5.0 + 1.0, 5.0)
-                    })
-                    total_results += 1
-                    
-                    if total_results >= limit:
-                        break
-        
-        return results[:limit]
-    
-    async def _process_file_regex(self, filepath: str, content: str, size: int,
-                                 line_offsets_json: Optional[str], regex,
-                                 context_length: int, max_matches: int = 5) -> Dict[str, Any]:
-        """Process a single file for regex matches (for parallel execution)."""
-        # Parse line offsets if available
-        try:
-            line_offsets = json.loads(line_offsets_json) if line_offsets_json else None
-        except:
-            line_offsets = None
-        
-        # For large files, use streaming approach
-        if size > 1024 * 1024:  # 1MB threshold
-            match_contexts = await self._search_large_file_streaming(
-                content, regex, line_offsets, context_length, max_matches
+        # Only rowids and sizes here: content is loaded chunk by chunk, so
+        # memory stays bounded and scanning stops loading once limit is hit
+        cursor = await self.db.execute(f"""
+            SELECT rowid, size
+            FROM file_index
+            {where}
+            ORDER BY size ASC, mtime DESC
+        """, params)
+        candidates = await cursor.fetchall()
+        
+        workers = _regex_workers()
+        total_bytes = sum(size for _, size in candidates)
+        if workers > 1 and total_bytes >= PARALLEL_SCAN_BYTES:
+            file_matches = await self._scan_regex_parallel(
+                candidates, total_bytes // (workers * 4), pattern, flags, context_length, limit
             )
         else:
-            # For smaller files, use the optimized standard approach
-            match_contexts = self._search_file_content(
-                content, regex, line_offsets, context_length, max_matches
-            )
-        
-        return {
-            'filepath': filepath,
-            'match_contexts': match_contexts
-        }
-    
-    def _extract_literal_prefix(self, pattern: str) -> Optional[str]:
-        """Extract a literal prefix from regex pattern for FTS5 pre-filtering."""
-        # Simple extraction - look for literal characters at the start
-        literal = ""
-        escaped = False
-        
-        for char in pattern:
-            if escaped:
-                # If it's a regex escape sequence, stop extraction
-                if char in 'dDwWsSbBAZ':  # Common regex escape sequences
-                    break
-                elif char in 'nrtfv':  # Special character escapes
-                    break
-                elif char in '.^$*+?{[|(\\':  # Escaped metacharacters
-                    literal += char
-                else:
-                    # Unknown escape, stop extraction to be safe
-                    break
-                escaped = False
-            elif char == '\\':
-                escaped = True
-            elif char in '.^$*+?{[|(':
-                break  # Regex metacharacter
-            else:
-                literal += char
-        
-        return literal if len(literal) >= 3 else None
+            file_matches = await self._scan_regex_in_thread(candidates, pattern, flags, context_length, limit)
+        
+        return [
+            {
+                "filepath": filepath,
+                "match_count": len(match_contexts),
+                "matches": match_contexts,
+                "score": min(len(match_contexts) / 5.0 + 1.0, 5.0)
+            }
+            for filepath, match_contexts in file_matches[:limit]
+        ]
     
-    def _search_file_content(self, content: str, regex, line_offsets: Optional[List[int]], 
-                           context_length: int, max_matches: int = 5) -> List[Dict[str, Any]]:
-        """Search content and return match contexts."""
-        match_contexts = []
-        match_count = 0
-        
-        # Use finditer for streaming matches
-        for match in regex.finditer(content):
-            if match_count >= max_matches:
+    async def _scan_regex_in_thread(self, candidates: List[Tuple[int, int]], pattern: str, flags: int,
+                                    context_length: int, limit: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Scan (rowid, size) candidates in a worker thread, loading content chunk by chunk, until limit."""
+        file_matches = []
+        for rowids in _split_by_size(candidates, _SCAN_CHUNK_BYTES):
+            cursor = await self.db.execute(_rows_query(rowids), rowids)
+            rows = _order_rows(rowids, await cursor.fetchall())
+            file_matches.extend(await asyncio.to_thread(
+                _scan_files_regex, rows, pattern, flags, context_length, limit - len(file_matches)
+            ))
+            if len(file_matches) >= limit:
                 break
-                
-            match_start = match.start()
-            match_end = match.end()
-            
-            # Find line number efficiently
-            if line_offsets:
-                line_num = self._find_line_number(line_offsets, match_start)
-            else:
-                # Fallback: count newlines before match
-                line_num = content[:match_start].count('\n') + 1
-            
-            # Extract context
-            context_start = max(0, match_start - context_length // 2)
-            context_end = min(len(content), match_end + context_length // 2)
-            context = content[context_start:context_end].strip()
-            
-            # Add ellipsis if truncated
-            if context_start > 0:
-                context = "..." + context
-            if context_end < len(content):
-                context = context + "..."
-            
-            match_contexts.append({
-                "match": match.group(0),
-                "line": line_num,
-                "context": context,
-                "groups": match.groups() if match.groups() else None
-            })
-            
-            match_count += 1
-        
-        return match_contexts
+        return file_matches
     
-    async def _search_large_file_streaming(self, content: str, regex, line_offsets: Optional[List[int]], 
-                                         context_length: int, max_matches: int = 5) -> List[Dict[str, Any]]:
-        """Search large files using a streaming approach with chunks."""
-        match_contexts = []
-        chunk_size = 512 * 1024  # 512KB chunks
-        overlap = 1024  # 1KB overlap to catch matches at boundaries
-        
-        pos = 0
-        while pos < len(content) and len(match_contexts) < max_matches:
-            # Extract chunk with overlap
-            chunk_start = max(0, pos - overlap)
-            chunk_end = min(len(content), pos + chunk_size)
-            chunk = content[chunk_start:chunk_end]
-            
-            # Find matches in chunk
-            for match in regex.finditer(chunk):
-                # Adjust match position to full content coordinates
-                match_start = chunk_start + match.start()
-                match_end = chunk_start + match.end()
-                
-                # Skip if this match was already found in overlap
-                if match_contexts and match_start <= match_contexts[-1]["match_start"]:
-                    continue
-                
-                # Find line number
-                if line_offsets:
-                    line_num = self._find_line_number(line_offsets, match_start)
-                else:
-                    line_num = content[:match_start].count('\n') + 1
-                
-                # Extract context from full content
-                context_start = max(0, match_start - context_length // 2)
-                context_end = min(len(content), match_end + context_length // 2)
-                context = content[context_start:context_end].strip()
-                
-                # Add ellipsis if truncated
-                if context_start > 0:
-                    context = "..." + context
-                if context_end < len(content):
-                    context = context + "..."
-                
-                match_contexts.append({
-                    "match": match.group(0),
-                    "line": line_num,
-                    "context": context,
-                    "groups": match.groups() if match.groups() else None,
-                    "match_start": match_start  # For duplicate detection
-                })
-                
-                if len(match_contexts) >= max_matches:
+    async def _scan_regex_parallel(self, candidates: List[Tuple[int, int]], chunk_bytes: int, pattern: str,
+                                   flags: int, context_length: int,
+                                   limit: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Scan chunks of candidates in worker processes, keeping result order and stopping at limit."""
+        # Workers read note content from the database themselves rather than
+        # having it pickled over; WAL mode lets them read alongside this connection
+        index_uri = self.index_path.resolve().as_uri() + "?mode=ro"
+        loop = asyncio.get_running_loop()
+        pool = _get_regex_pool()
+        futures = []
+        
+        file_matches = []
+        try:
+            for rowids in _split_by_size(candidates, chunk_bytes):
+                futures.append(loop.run_in_executor(
+                    pool, _scan_indexed_regex, index_uri, rowids, pattern, flags, context_length, limit
+                ))
+            for future in futures:
+                file_matches.extend(await future)
+                if len(file_matches) >= limit:
                     break
-            
-            # Move to next chunk
-            pos += chunk_size
-        
-        # Remove the match_start field used for duplicate detection
-        for match_ctx in match_contexts:
-            match_ctx.pop("match_start", None)
-        
-        return match_contexts
-    
-    def _find_line_number(self, line_starts: List[int], position: int) -> int:
-        """Find line number using binary search."""
-        left, right = 0, len(line_starts) - 1
-        
-        while left <= right:
-            mid = (left + right) // 2
-            if mid + 1 < len(line_starts):
-                if line_starts[mid] <= position < line_starts[mid + 1]:
-                    return mid + 1
-                elif position < line_starts[mid]:
-                    right = mid - 1
-                else:
-                    left = mid + 1
-            else:
-                return mid + 1
-        
-        return len(line_starts)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for running out of memory), which
+            # breaks the whole pool: replace it for later searches and scan
+            # this time in a thread instead
+            logger.warning("Regex worker pool broke; restarting it and scanning in a thread")
+            _discard_regex_pool(pool)
+            return await self._scan_regex_in_thread(candidates, pattern, flags, context_length, limit)
+        finally:
+            # Chunks not yet started are no longer needed
+            for future in futures:
+                future.cancel()
+        return file_matches
         
     async def get_all_files(self) -> List[str]:
         """Get list of all indexed files."""
@@ -603,12 +873,13 @@ class PersistentSearchIndex:
         async with self._lock:
             cursor = await self.db.execute("SELECT filepath FROM file_index")
             indexed_files = {row[0] for row in await cursor.fetchall()}
-            
-            orphaned = indexed_files - existing_files
-            
-            for filepath in orphaned:
-                await self.remove_file(filepath)
-                logger.info(f"Removed orphaned index entry: {filepath}")
+        
+        orphaned = indexed_files - existing_files
+        
+        # remove_file takes the lock itself, and asyncio.Lock isn't reentrant
+        for filepath in orphaned:
+            await self.remove_file(filepath)
+            logger.info(f"Removed orphaned index entry: {filepath}")
                 
     async def search_by_property(self, property_name: str, operator: str, value: Optional[str] = None, 
                                 limit: int = 50) -> List[Dict[str, Any]]:
@@ -2,7 +2,11 @@
 
 import re
 from typing import List, Tuple, Optional, Any
-from ..constants import MARKDOWN_EXTENSIONS, ERROR_MESSAGES
+from ..constants import MARKDOWN_SUFFIXES, ERROR_MESSAGES, format_error
+
+
+# Same constraint as the path fields in the tool schemas
+NOTE_PATH_PATTERN = re.compile(r"^[^/].*\.md$")
 
 
 class ValidationError(ValueError):
@@ -25,31 +29,30 @@ def validate_note_path(path: str) -> Tuple[bool, Optional[str]]:
     
     # Check length (matching our schema constraint)
     if len(path) > 255:
-        return False, ERROR_MESSAGES["path_too_long"].format(length=len(path))
+        return False, format_error("path_too_long", length=len(path))
     
     # Check pattern (must not start with /)
     if path.startswith("/"):
-        return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+        return False, format_error("invalid_path", path=path)
     
     # Check for path traversal attempts
     if ".." in path:
-        return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+        return False, format_error("invalid_path", path=path)
     
     # Check extension
-    if not any(path.endswith(ext) for ext in MARKDOWN_EXTENSIONS):
-        return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+    if not path.endswith(MARKDOWN_SUFFIXES):
+        return False, format_error("invalid_path", path=path)
     
     # Check for invalid characters (Windows-specific restrictions)
     # Note: We allow quotes since they're valid on macOS/Linux
     invalid_chars = ["<", ">", ":", "|", "?", "*"]
     for char in invalid_chars:
         if char in path:
-            return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+            return False, format_error("invalid_path", path=path)
     
     # Check pattern matches our schema
-    pattern = r"^[^/].*\.md$"
-    if not re.match(pattern, path):
-        return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+    if not NOTE_PATH_PATTERN.match(path):
+        return False, format_error("invalid_path", path=path)
     
     return True, None
 
@@ -85,7 +88,7 @@ def validate_context_length(length: int) -> Tuple[bool, Optional[str]]:
         Tuple of (is_valid, error_message)
     """
     if length < 10 or length > 500:
-        return False, ERROR_MESSAGES["invalid_context_length"].format(length=length)
+        return False, format_error("invalid_context_length", length=length)
     
     return True, None
 
@@ -108,15 +111,15 @@ def validate_date_search_params(
     """
     # Validate date_type
     if date_type not in ["created", "modified"]:
-        return False, ERROR_MESSAGES["invalid_date_type"].format(date_type=date_type)
+        return False, format_error("invalid_date_type", date_type=date_type)
     
     # Validate operator
     if operator not in ["within", "exactly"]:
-        return False, ERROR_MESSAGES["invalid_operator"].format(operator=operator)
+        return False, format_error("invalid_operator", operator=operator)
     
     # Validate days_ago
     if days_ago < 0:
-        return False, ERROR_MESSAGES["negative_days"].format(days=days_ago)
+        return False, format_error("negative_days", days=days_ago)
     
     if days_ago > 365:
         return False, f"Days ago too large: {days_ago} (max: 365). Use smaller values or implement year-based search."
@@ -2,7 +2,7 @@
 
 import os
 from typing import Optional
-from ..constants import MARKDOWN_EXTENSIONS, ERROR_MESSAGES
+from ..constants import MARKDOWN_SUFFIXES, format_error
 
 
 def validate_note_path(path: str) -> tuple[bool, Optional[str]]:
@@ -20,21 +20,21 @@ def validate_note_path(path: str) -> tuple[bool, Optional[str]]:
     
     # Check length
     if len(path) > 255:
-        return False, ERROR_MESSAGES["path_too_long"].format(length=len(path))
+        return False, format_error("path_too_long", length=len(path))
     
     # Check for path traversal attempts
     if ".." in path or path.startswith("/"):
-        return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+        return False, format_error("invalid_path", path=path)
     
     # Check extension
-    if not any(path.endswith(ext) for ext in MARKDOWN_EXTENSIONS):
-        return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+    if not path.endswith(MARKDOWN_SUFFIXES):
+        return False, format_error("invalid_path", path=path)
     
     # Check for invalid characters
     invalid_chars = ["<", ">", ":", '"', "|", "?", "*"]
     for char in invalid_chars:
         if char in path:
-            return False, ERROR_MESSAGES["invalid_path"].format(path=path)
+            return False, format_error("invalid_path", path=path)
     
     return True, None
 
@@ -53,7 +53,7 @@ def sanitize_path(path: str) -> str:
     path = path.strip().strip("/")
     
     # Ensure .md extension
-    if not any(path.endswith(ext) for ext in MARKDOWN_EXTENSIONS):
+    if not path.endswith(MARKDOWN_SUFFIXES):
         path += ".md"
     
     return path
@@ -61,4 +61,4 @@ def sanitize_path(path: str) -> str:
 
 def is_markdown_file(path: str) -> bool:
     """Check if a path points to a markdown file."""
-    return any(path.lower().endswith(ext) for ext in MARKDOWN_EXTENSIONS)
\ No newline at end of file
+    return path.lower().endswith(MARKDOWN_SUFFIXES)
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Optional file watcher that keeps vault caches in sync with disk."""
+
+import os
+import asyncio
+import logging
+from pathlib import Path
+from typing import Callable, Optional
+
+from ..constants import SKIP_DIRS
+
+logger = logging.getLogger(__name__)
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:  # watchdog is optional; callers fall back to mtime scans
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+
+def _is_note(path) -> bool:
+    """Check a raw watchdog path (str or bytes) for the markdown extension."""
+    return path.endswith(b".md" if isinstance(path, bytes) else ".md")
+
+
+def _in_skipped_folder(rel_path: str, is_directory: bool) -> bool:
+    """
+    Check whether a vault-relative path lies in a folder vault walks skip.
+
+    That covers dot-folders and SKIP_DIRS, e.g. the server's own index files
+    in .obsidian/ and notes deleted into .trash/, as well as paths outside
+    the vault ("..").
+    """
+    parts = rel_path.split("/")
+    if not is_directory:
+        parts.pop()
+    return any(part[:1] == "." or part in SKIP_DIRS for part in parts)
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forward watchdog events (from the observer thread) to the event loop."""
+
+    def __init__(self, root: str, loop: asyncio.AbstractEventLoop, callback: Callable[[Optional[str]], None]):
+        super().__init__()
+        self._root = root
+        self._loop = loop
+        self._callback = callback
+
+    def _relative(self, path) -> Optional[str]:
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        try:
+            return Path(os.path.relpath(path, self._root)).as_posix()
+        except ValueError:
+            return None
+
+    def on_any_event(self, event):
+        if event.event_type in ("opened", "closed", "closed_no_write"):
+            return
+        is_directory = event.is_directory
+        if is_directory and event.event_type == "modified":
+            # Sent for a folder whenever an entry inside it is created, deleted
+            # or moved; that entry's own event already reports the change
+            return
+        raw_paths = [event.src_path]
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            raw_paths.append(dest_path)
+        if not is_directory:
+            # Drop attachments on the raw path, before any relpath/Path work
+            raw_paths = [path for path in raw_paths if _is_note(path)]
+        rel_paths = [
+            rel_path
+            for rel_path in map(self._relative, raw_paths)
+            if rel_path is not None and not _in_skipped_folder(rel_path, is_directory)
+        ]
+        if is_directory:
+            # A folder create/move/delete can affect many notes at once
+            rel_paths = [None] if rel_paths else []
+        for rel_path in rel_paths:
+            self._loop.call_soon_threadsafe(self._callback, rel_path)
+
+
+class VaultWatcher:
+    """
+    Watch a vault directory and report changed note paths.
+
+    The callback runs on the event loop thread and receives the vault-relative
+    path of a changed note, or None when the change can't be narrowed down to
+    a single note (e.g. a folder was moved).
+    """
+
+    def __init__(self, vault_root: Path, callback: Callable[[Optional[str]], None]):
+        """
+        Initialize vault watcher.
+
+        Args:
+            vault_root: Resolved vault directory
+            callback: Called with each changed note path (or None)
+        """
+        self.vault_root = vault_root
+        self.callback = callback
+        self._observer = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the observer thread is running."""
+        return self._observer is not None
+
+    def start(self) -> bool:
+        """
+        Start watching. Must be called from within the running event loop.
+
+        Returns:
+            True if the watcher started, False if watchdog is unavailable or failed
+        """
+        if self._observer is not None:
+            return True
+        if not WATCHDOG_AVAILABLE:
+            return False
+
+        try:
+            handler = _ChangeHandler(str(self.vault_root), asyncio.get_running_loop(), self.callback)
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(handler, str(self.vault_root), recursive=True)
+            observer.start()
+        except Exception as e:
+            # e.g. inotify watch limit reached on very large vaults
+            logger.warning(f"File watcher unavailable, falling back to mtime scans: {e}")
+            return False
+
+        self._observer = observer
+        logger.info(f"Watching vault for changes: {self.vault_root}")
+        return True
+
+    def stop(self) -> None:
+        """Stop watching."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
@@ -6,6 +6,7 @@ import asyncio
 import shutil
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 import pytest
 import pytest_asyncio
 
@@ -16,7 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from obsidian_mcp.utils.filesystem import ObsidianVault, init_vault
 from obsidian_mcp.tools import (
     read_note, create_note, update_note, delete_note,
-    search_notes, list_notes, read_image
+    search_notes, list_notes, list_folders, read_image
 )
 
 
@@ -199,6 +200,22 @@ This content has been updated.
         assert isinstance(result["total_count"], int)
         assert isinstance(result["truncated"], bool)
     
+    @pytest.mark.asyncio
+    async def test_search_match_counts_and_ranking(self, test_vault):
+        """Test overlapping match counts, ranking and snippets of indexed search."""
+        await test_vault.write_note("overlap.md", "zzzz " + "x" * 200 + " zzzz zzzz")
+        await test_vault.write_note("single.md", "one zz here")
+        test_vault._index_timestamp = None
+        await test_vault._update_search_index()
+
+        results = await test_vault.search_notes("zz", context_length=10)
+
+        assert [r["path"] for r in results] == ["overlap.md", "single.md"]
+        assert results[0]["match_count"] == 9  # three overlapping matches per "zzzz"
+        assert results[0]["context"] == "zzzz xx..."
+        assert results[1]["match_count"] == 1
+        assert results[1]["score"] == 1.1
+
     @pytest.mark.asyncio
     async def test_search_by_tag(self, test_vault):
         """Test searching by tag."""
@@ -216,7 +233,200 @@ This content has been updated.
         paths = [n["path"] for n in result["items"]]
         assert "test_note.md" in paths
         assert "folder/nested_note.md" in paths
-    
+
+    @pytest.mark.asyncio
+    async def test_list_notes_skips_internal_dirs(self, test_vault):
+        """Test that the vault walker ignores internal/hidden dirs and honours recursive."""
+        hidden = (
+            ".obsidian/plugin-notes.md",
+            ".trash/deleted.md",
+            ".git/COMMIT_EDITMSG.md",
+            ".stfolder/sync.md",
+            "node_modules/pkg/README.md",
+        )
+        for rel_path in hidden:
+            full_path = test_vault.vault_path / rel_path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text("# Hidden")
+
+        paths = [n["path"] for n in await test_vault.list_notes()]
+        assert not set(hidden) & set(paths)
+        assert "folder/nested_note.md" in paths
+
+        top_level = await test_vault.list_notes(recursive=False)
+        assert [n["path"] for n in top_level] == ["test_note.md"]
+
+        in_folder = await test_vault.list_notes("folder")
+        assert in_folder == [{"path": "folder/nested_note.md", "name": "nested_note.md"}]
+
+    @pytest.mark.asyncio
+    async def test_symlink_escape_rejected(self, test_vault):
+        """Test that paths resolving outside the vault root are rejected."""
+        outside = tempfile.mkdtemp(prefix="obsidian_outside_")
+        try:
+            Path(outside, "secret.md").write_text("# Secret")
+            os.symlink(outside, test_vault.vault_path / "escape")
+
+            with pytest.raises(ValueError, match="escapes vault"):
+                await test_vault.read_note("escape/secret.md")
+        finally:
+            shutil.rmtree(outside)
+
+    @pytest.mark.asyncio
+    async def test_read_many(self, test_vault):
+        """Test reading raw note contents in batches."""
+        contents = await test_vault.read_many(
+            ["test_note.md", "missing.md", "folder/nested_note.md"], batch_size=2
+        )
+
+        assert contents[0].startswith("# Test Note")
+        assert contents[1] is None
+        assert contents[2].startswith("---\ntitle: Nested Note")
+
+    @pytest.mark.asyncio
+    async def test_read_note_cache(self, test_vault):
+        """Test that unchanged notes are cached and writes invalidate the cache."""
+        first = await test_vault.read_note("test_note.md")
+        second = await test_vault.read_note("test_note.md")
+        assert second is first
+
+        await test_vault.write_note("test_note.md", "# Rewritten", overwrite=True)
+        third = await test_vault.read_note("test_note.md")
+        assert third.content == "# Rewritten"
+
+        # Edits made outside the server are picked up through the file stamp
+        full_path = test_vault.vault_path / "test_note.md"
+        full_path.write_text("# Edited in Obsidian")
+        stat = full_path.stat()
+        os.utime(full_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        fourth = await test_vault.read_note("test_note.md")
+        assert fourth.content == "# Edited in Obsidian"
+
+    @pytest.mark.asyncio
+    async def test_read_note_parse_cache(self, test_vault):
+        """Test that unchanged text isn't re-parsed when only the file stamp moves."""
+        first = await test_vault.read_note("test_note.md")
+
+        full_path = test_vault.vault_path / "test_note.md"
+        stat = full_path.stat()
+        os.utime(full_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        with patch.object(test_vault, "_parse_frontmatter", wraps=test_vault._parse_frontmatter) as parse:
+            second = await test_vault.read_note("test_note.md")
+
+        assert second is not first
+        assert parse.call_count == 0
+        assert second.metadata.tags == first.metadata.tags
+        assert second.metadata.frontmatter == first.metadata.frontmatter
+
+    @pytest.mark.asyncio
+    async def test_list_folders_and_find_image(self, test_vault):
+        """Test folder listing and image lookup via scandir, skipping hidden folders."""
+        (test_vault.vault_path / "folder" / "sub").mkdir()
+        (test_vault.vault_path / ".trash").mkdir()
+        (test_vault.vault_path / ".trash" / "old.png").write_bytes(b"x")
+
+        result = await list_folders()
+        assert [f["path"] for f in result["items"]] == ["folder", "folder/sub", "images"]
+        result = await list_folders("folder", recursive=False)
+        assert result["items"] == [{"path": "folder/sub", "name": "sub"}]
+
+        assert await test_vault.find_image("test_image.png") == "images/test_image.png"
+        assert await test_vault.find_image("old.png") is None
+
+    @pytest.mark.asyncio
+    async def test_vault_read_image_encoding(self, test_vault):
+        """Test that the vault returns image bytes as standard base64."""
+        from obsidian_mcp.utils.filesystem import b64decode
+
+        result = await test_vault.read_image("images/test_image.png")
+        raw = (test_vault.vault_path / "images" / "test_image.png").read_bytes()
+
+        assert result["mime_type"] == "image/png"
+        assert b64decode(result["content"]) == raw
+
+        content, metadata = await test_vault.read_image_bytes("images/test_image.png")
+        assert content == raw
+        assert metadata == {key: value for key, value in result.items() if key != "content"}
+
+    @pytest.mark.asyncio
+    async def test_vault_read_image_cache(self, test_vault):
+        """Test that repeat image reads are served from the cache until the file changes."""
+        with patch.object(test_vault, "_load_image", wraps=test_vault._load_image) as load:
+            first = await test_vault.read_image_bytes("images/test_image.png")
+            second = await test_vault.read_image_bytes("images/test_image.png")
+            assert load.call_count == 1
+            assert second == first
+
+            await test_vault.read_image_bytes("images/test_image.png", max_width=1)
+            assert load.call_count == 2
+
+            image_path = test_vault.vault_path / "images" / "test_image.png"
+            stat = image_path.stat()
+            os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            await test_vault.read_image_bytes("images/test_image.png")
+            assert load.call_count == 3
+
+            # Concurrent reads of an image that isn't cached yet share one load
+            test_vault._image_cache.clear()
+            results = await asyncio.gather(*(test_vault.read_image_bytes("images/test_image.png") for _ in range(3)))
+            assert load.call_count == 4
+            assert results[0] == results[1] == results[2]
+            assert results[0][1] is not results[1][1]
+            assert not test_vault._image_loads
+
+    def test_resize_jpeg_keeps_lanczos_margin(self):
+        """Test that JPEG draft decoding stops at twice the target size before LANCZOS."""
+        import io
+        from PIL import Image as PILImage, JpegImagePlugin
+        from obsidian_mcp.utils.filesystem import _resize_image
+
+        buffer = io.BytesIO()
+        PILImage.new("RGB", (6000, 4000), (200, 10, 10)).save(buffer, "JPEG")
+
+        draft = JpegImagePlugin.JpegImageFile.draft
+        drafted = []
+
+        def record_draft(img, mode, size):
+            result = draft(img, mode, size)
+            drafted.append(img.size)
+            return result
+
+        with patch.object(JpegImagePlugin.JpegImageFile, "draft", record_draft):
+            content, metadata = _resize_image("big.jpg", buffer.getvalue(), ".jpg", "image/jpeg", 800)
+
+        # 1/4 scale (1500x1000) would be under 1600 wide, so it stops at 1/2
+        assert drafted == [(3000, 2000)]
+        assert metadata["resized"] is True
+        assert PILImage.open(io.BytesIO(content)).size == (800, 533)
+
+    @pytest.mark.asyncio
+    async def test_view_note_images_bounded_concurrency(self, test_vault):
+        """Test that a note's images load concurrently but only a few at a time."""
+        from obsidian_mcp.tools import view_note_images
+        from obsidian_mcp.constants import IMAGE_LOAD_CONCURRENCY
+
+        content = "\n".join(f"![[test_image.png]] ![img {i}](images/test_image.png)" for i in range(10))
+        (test_vault.vault_path / "gallery.md").write_text(content)
+
+        read_image_bytes = test_vault.read_image_bytes
+        active = peak = 0
+
+        async def tracked(*args, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            try:
+                return await read_image_bytes(*args, **kwargs)
+            finally:
+                active -= 1
+
+        with patch.object(test_vault, "read_image_bytes", side_effect=tracked):
+            images = await view_note_images("gallery.md")
+
+        assert len(images) == 20
+        assert peak == IMAGE_LOAD_CONCURRENCY
+
     @pytest.mark.asyncio
     async def test_read_image(self, test_vault):
         """Test reading an image."""
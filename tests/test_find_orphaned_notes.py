@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Test orphaned note detection."""
+
+import os
+import time
+import tempfile
+import shutil
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+import pytest_asyncio
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from obsidian_mcp.utils.filesystem import ObsidianVault
+from obsidian_mcp.tools.find_orphaned_notes import find_orphaned_notes, iter_orphaned_notes
+
+
+class TestFindOrphanedNotes:
+    """Test suite for find_orphaned_notes."""
+
+    @pytest_asyncio.fixture
+    async def vault(self):
+        """Create a temporary vault with linked, tagged and isolated notes."""
+        temp_dir = tempfile.mkdtemp(prefix="obsidian_test_orphans_")
+        notes = {
+            "hub.md": "# Hub\n\nSee [[linked]] and [child](sub/child.md)",
+            "linked.md": "---\nstatus: done\n---\n\n# Linked\n\n#topic",
+            "sub/child.md": "# Child\n\nBack to [[hub]]",
+            "lonely.md": "# Lonely\n\nNothing links here",
+            "tagged.md": "# Tagged\n\n#topic",
+            "Templates/template.md": "# Template",
+        }
+        for path, content in notes.items():
+            full_path = Path(temp_dir) / path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(content)
+
+        vault = ObsidianVault(temp_dir)
+        with patch("obsidian_mcp.tools.find_orphaned_notes.get_vault", return_value=vault), \
+             patch("obsidian_mcp.tools.link_management.get_vault", return_value=vault):
+            yield vault
+        shutil.rmtree(temp_dir)
+
+    @staticmethod
+    def paths(result):
+        return sorted(note["path"] for note in result["orphaned_notes"])
+
+    @pytest.mark.asyncio
+    async def test_no_backlinks(self, vault):
+        """Test that notes nothing links to are reported, excluding default folders."""
+        result = await find_orphaned_notes("no_backlinks")
+
+        assert self.paths(result) == ["lonely.md", "tagged.md"]
+        assert result["count"] == 2
+        assert result["orphaned_notes"][0]["reason"] == "No incoming links"
+        assert result["stats"]["total_notes_scanned"] == 5
+
+    @pytest.mark.asyncio
+    async def test_other_orphan_types(self, vault):
+        """Test the link, tag and metadata based criteria."""
+        assert self.paths(await find_orphaned_notes("no_links")) == ["lonely.md", "tagged.md"]
+        assert self.paths(await find_orphaned_notes("isolated")) == ["lonely.md"]
+        assert self.paths(await find_orphaned_notes("no_tags")) == ["hub.md", "lonely.md", "sub/child.md"]
+        assert "linked.md" not in self.paths(await find_orphaned_notes("no_metadata"))
+        assert "Templates/template.md" in self.paths(await find_orphaned_notes("no_tags", exclude_folders=[]))
+
+        with pytest.raises(ValueError, match="Invalid orphan type"):
+            await find_orphaned_notes("no_friends")
+
+    @pytest.mark.asyncio
+    async def test_excluded_folders_are_not_walked(self, vault):
+        """Test that list_notes prunes excluded folders, including nested ones."""
+        (vault.vault_path / "sub" / "old").mkdir()
+        (vault.vault_path / "sub" / "old" / "stale.md").write_text("# Stale")
+
+        notes = await vault.list_notes(recursive=True, exclude_folders=["Templates", "sub\\old"])
+        paths = [note["path"] for note in notes]
+
+        assert "Templates/template.md" not in paths
+        assert "sub/old/stale.md" not in paths
+        assert "sub/child.md" in paths
+
+    @pytest.mark.asyncio
+    async def test_orphan_details(self, vault):
+        """Test the size and word count reported for each orphan."""
+        result = await find_orphaned_notes("isolated")
+        orphan = result["orphaned_notes"][0]
+
+        assert orphan["size"] == len("# Lonely\n\nNothing links here")
+        assert orphan["word_count"] == 5
+        mtime = (vault.vault_path / "lonely.md").stat().st_mtime
+        assert orphan["modified"] == datetime.fromtimestamp(mtime).isoformat()
+
+    @pytest.mark.asyncio
+    async def test_classification_uses_metadata_index(self, vault):
+        """Test that one index refresh serves every note and only orphans are read."""
+        await find_orphaned_notes("no_links")
+
+        with patch.object(vault, "refresh_metadata_index", wraps=vault.refresh_metadata_index) as refresh, \
+             patch.object(vault, "read_note", wraps=vault.read_note) as read_note:
+            result = await find_orphaned_notes("no_tags")
+
+        assert refresh.call_count == 1
+        assert read_note.call_count == result["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_min_age_days(self, vault):
+        """Test that notes modified within the window are skipped without being read."""
+        old = time.time() - 10 * 86400
+        os.utime(vault.vault_path / "lonely.md", (old, old))
+        await vault.refresh_metadata_index()
+
+        with patch.object(vault, "read_note", wraps=vault.read_note) as read_note:
+            result = await find_orphaned_notes("no_backlinks", min_age_days=7)
+
+        assert self.paths(result) == ["lonely.md"]
+        assert read_note.call_count == 1
+        assert "date_threshold" in result["stats"]
+
+    @pytest.mark.asyncio
+    async def test_sorted_oldest_first(self, vault):
+        """Test that orphans are ordered by modification time."""
+        now = time.time()
+        os.utime(vault.vault_path / "lonely.md", (now - 100, now - 100))
+        os.utime(vault.vault_path / "tagged.md", (now - 200, now - 200))
+
+        result = await find_orphaned_notes("no_backlinks")
+
+        assert [note["path"] for note in result["orphaned_notes"]] == ["tagged.md", "lonely.md"]
+
+    @pytest.mark.asyncio
+    async def test_iter_orphaned_notes(self, vault):
+        """Test that orphans stream with their mtime and stats are filled up front."""
+        stats = {}
+        orphans = iter_orphaned_notes("no_backlinks", stats=stats)
+        mtime, first = await orphans.__anext__()
+
+        assert stats["total_notes_scanned"] == 5
+        assert mtime == (vault.vault_path / first["path"]).stat().st_mtime
+        await orphans.aclose()
+
+        streamed = sorted([record["path"] async for _, record in iter_orphaned_notes("no_backlinks")])
+        assert streamed == self.paths(await find_orphaned_notes("no_backlinks"))
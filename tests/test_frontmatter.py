@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Test frontmatter parsing."""
+
+from datetime import date
+from pathlib import Path
+import pytest
+import yaml
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from obsidian_mcp.utils.frontmatter import load_frontmatter
+
+
+class TestFrontmatter:
+    """Test suite for the fast frontmatter parser."""
+
+    @pytest.mark.parametrize("text", [
+        "title: Weekly review\ncreated: 2024-03-01\ntags:\n  - project\n  - review",
+        "aliases: [weekly, review]\nstatus: draft\npriority: 3\ndone: yes",
+        "tags:\n- a\n- 2024-01-01\nempty:\n# comment\ntime: 12:30",
+        "title: 'Quoted: value'\nsubtitle: \"Say \\\"hi\\\"\"",
+        "nested:\n  key: value\nanchor: &a 1\nref: *a",
+        "text: |\n  multi\n  line",
+        "# only a comment",
+        "",
+        "title: one\r\nstatus: two",
+        "title: a\xa0\nnote: \xa0",
+    ])
+    def test_matches_yaml(self, text):
+        """Test that results are identical to yaml.safe_load."""
+        assert load_frontmatter(text) == yaml.safe_load(text)
+
+    def test_scalar_types(self):
+        """Test that plain scalars are resolved with YAML's rules."""
+        result = load_frontmatter("created: 2024-03-01\ncount: 7\ndraft: false\nnote: ~\nname: 2024 plan")
+
+        assert result == {"created": date(2024, 3, 1), "count": 7, "draft": False, "note": None, "name": "2024 plan"}
+
+    @pytest.mark.parametrize("text", ["title: x\x01y", "title: a\u2028b", "title: a\x85b\nstatus: draft"])
+    def test_unprintable_text_uses_yaml(self, text):
+        """Test that text the fast parser would misread goes through PyYAML (and fails the same way)."""
+        with pytest.raises(yaml.YAMLError):
+            yaml.safe_load(text)
+        with pytest.raises(yaml.YAMLError):
+            load_frontmatter(text)
+
+    def test_invalid_yaml_raises(self):
+        """Test that invalid frontmatter still raises a YAML error."""
+        with pytest.raises(yaml.YAMLError):
+            load_frontmatter("title: [unclosed\nother: value")
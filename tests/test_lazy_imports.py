@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Test that starting the server doesn't import every tool module."""
+
+import os
+import sys
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import obsidian_mcp.tools as tools
+
+
+def test_server_import_defers_tool_modules():
+    """Test that tool modules, PIL and the search index load on first use, not at server import."""
+    code = (
+        "import sys, obsidian_mcp.server\n"
+        "print(sorted(m for m in sys.modules"
+        " if m.startswith('obsidian_mcp.tools')"
+        " or m in ('PIL', 'aiosqlite', 'obsidian_mcp.utils.persistent_index')))"
+    )
+    with tempfile.TemporaryDirectory() as vault_dir:
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=str(Path(__file__).parent.parent),
+            env={**os.environ, "OBSIDIAN_VAULT_PATH": vault_dir},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_tools_package_resolves_lazily():
+    """Test that tool functions are still importable from the tools package."""
+    from obsidian_mcp.tools.note_management import read_note
+
+    assert tools.read_note is read_note
+    assert callable(tools.find_orphaned_notes)
+    assert set(tools.__all__) <= set(dir(tools))
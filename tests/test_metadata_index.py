@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""Test the disk-backed note metadata index."""
+
+import os
+import asyncio
+import tempfile
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+import pytest
+import pytest_asyncio
+
+# Add parent directory to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from obsidian_mcp.utils.filesystem import ObsidianVault
+from obsidian_mcp.utils.metadata_index import MetadataIndex
+from obsidian_mcp.utils.link_graph import Link, extract_links_from_content, IMAGE_PATTERN
+from obsidian_mcp.utils.watcher import _ChangeHandler
+from obsidian_mcp.tools.organization import list_tags
+from obsidian_mcp.tools.search_discovery import _search_by_tag, _search_by_property
+from obsidian_mcp.tools.link_management import (
+    get_backlinks,
+    get_outgoing_links,
+    find_broken_links,
+    build_vault_notes_index,
+    find_notes_by_names,
+    get_link_context,
+)
+
+
+class TestMetadataIndex:
+    """Test suite for the metadata index."""
+
+    @pytest_asyncio.fixture
+    async def vault(self):
+        """Create a temporary vault with a few tagged notes."""
+        temp_dir = tempfile.mkdtemp(prefix="obsidian_test_meta_")
+        notes = {
+            "a.md": "---\ntags: [project]\n---\n\n# A\n\n#idea",
+            "b.md": "# B\n\n#project",
+            "sub/c.md": "# C\n\nNo tags here",
+            "sub/d.md": "# D\n\n#area/project/web",
+        }
+        for path, content in notes.items():
+            full_path = Path(temp_dir) / path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(content)
+
+        vault = ObsidianVault(temp_dir)
+        with patch("obsidian_mcp.tools.organization.get_vault", return_value=vault):
+            yield vault
+        shutil.rmtree(temp_dir)
+
+    @pytest.mark.asyncio
+    async def test_list_tags_uses_index(self, vault):
+        """Test that tags are counted from the index and the index is saved."""
+        result = await list_tags(include_counts=True, sort_by="count")
+
+        assert result["items"][0] == {"name": "project", "count": 2}
+        assert {"name": "area/project/web", "count": 1} in result["items"]
+        assert {"name": "idea", "count": 1} in result["items"]
+        assert (vault.vault_path / ".obsidian" / "mcp-metadata-index.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_tag_search_uses_posting_lists(self, vault):
+        """Test that tag search only reads notes carrying a matching tag."""
+        await vault.refresh_metadata_index()
+        with patch.object(vault, "read_note", wraps=vault.read_note) as read_note:
+            results = await _search_by_tag(vault, "project", 100)
+
+        assert [r["path"] for r in results] == ["a.md", "b.md", "sub/d.md"]
+        assert results[2]["matches"] == ["area/project/web"]
+        assert "sub/c.md" not in [call.args[0] for call in read_note.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_property_search_reads_only_candidates(self, vault):
+        """Test that property search skips notes whose frontmatter lacks the property."""
+        await vault.refresh_metadata_index()
+        with patch.object(vault, "read_note", wraps=vault.read_note) as read_note:
+            results = await _search_by_property(vault, "property:tags:*", 100)
+
+        assert [call.args[0] for call in read_note.call_args_list] == ["a.md"]
+        assert [r["path"] for r in results] == ["a.md"]
+
+    @pytest.mark.asyncio
+    async def test_only_changed_notes_are_reparsed(self, vault):
+        """Test that unchanged notes are served from the index."""
+        await vault.refresh_metadata_index()
+
+        note_path = vault.vault_path / "b.md"
+        note_path.write_text("# B\n\n#project #extra")
+        stat = note_path.stat()
+        os.utime(note_path, (stat.st_atime, stat.st_mtime + 10))
+
+        with patch.object(vault, "read_note", wraps=vault.read_note) as read_note:
+            entries = (await vault.refresh_metadata_index()).entries
+
+        assert [call.args[0] for call in read_note.call_args_list] == ["b.md"]
+        assert entries["b.md"]["tags"] == ["extra", "project"]
+
+    @pytest.mark.asyncio
+    async def test_index_survives_restart(self, vault):
+        """Test that a fresh vault instance loads the saved index instead of reparsing."""
+        await vault.refresh_metadata_index()
+
+        reopened = ObsidianVault(str(vault.vault_path))
+        with patch.object(reopened, "read_note") as read_note:
+            entries = (await reopened.refresh_metadata_index()).entries
+
+        read_note.assert_not_called()
+        assert entries["a.md"]["tags"] == ["idea", "project"]
+
+    @pytest.mark.asyncio
+    async def test_deleted_notes_are_pruned(self, vault):
+        """Test that entries for deleted notes are dropped."""
+        await vault.refresh_metadata_index()
+        (vault.vault_path / "sub" / "c.md").unlink()
+
+        entries = (await vault.refresh_metadata_index()).entries
+
+        assert "sub/c.md" not in entries
+
+    @pytest.mark.asyncio
+    async def test_watcher_limits_refresh_to_changed_notes(self, vault):
+        """Test that watcher events replace the full vault walk."""
+        vault._watcher._observer = object()  # pretend the observer thread is running
+        await vault.refresh_metadata_index()
+
+        (vault.vault_path / "b.md").write_text("# B\n\n#watched")
+        (vault.vault_path / "sub" / "c.md").unlink()
+        vault._on_vault_change("b.md")
+        vault._on_vault_change("sub/c.md")
+
+        with patch("obsidian_mcp.utils.filesystem.walk_markdown") as walk:
+            index = await vault.refresh_metadata_index()
+
+        walk.assert_not_called()
+        assert index.entries["b.md"]["tags"] == ["watched"]
+        assert "sub/c.md" not in index.entries
+        assert index.tag_index["project"] == {"a.md"}
+
+        # A folder-level event forces the next refresh to walk the vault again
+        vault._on_vault_change(None)
+        with patch("obsidian_mcp.utils.filesystem.walk_markdown", return_value=iter([])) as walk:
+            await vault.refresh_metadata_index()
+        walk.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_own_writes_refresh_without_watcher_events(self, vault):
+        """Test that notes written or deleted by the vault are re-checked before the watcher reports them."""
+        vault._watcher._observer = object()  # pretend the observer thread is running
+        await vault.refresh_metadata_index()
+
+        await vault.write_note("e.md", "# E\n\n#fresh")
+        await vault.delete_note("sub/c.md")
+        index = await vault.refresh_metadata_index()
+
+        assert index.entries["e.md"]["tags"] == ["fresh"]
+        assert "sub/c.md" not in index.entries
+
+    def test_watcher_ignores_attachments(self, vault):
+        """Test that only note paths are forwarded from file events."""
+        changed = []
+        loop = SimpleNamespace(call_soon_threadsafe=lambda callback, path: changed.append(path))
+        handler = _ChangeHandler(str(vault.vault_root), loop, None)
+        root = vault.vault_root
+
+        handler.on_any_event(SimpleNamespace(event_type="modified", is_directory=False, src_path=str(root / "img.png")))
+        handler.on_any_event(SimpleNamespace(event_type="modified", is_directory=False, src_path=str(root / "sub" / "c.md")))
+        handler.on_any_event(SimpleNamespace(
+            event_type="moved", is_directory=False, src_path=bytes(root / "a.md"), dest_path=bytes(root / "a.pdf")
+        ))
+
+        assert changed == ["sub/c.md", "a.md"]
+
+    def test_watcher_ignores_folder_modified_and_skipped_folders(self, vault):
+        """Test that parent-folder updates and changes in .obsidian/.trash don't fire."""
+        changed = []
+        loop = SimpleNamespace(call_soon_threadsafe=lambda callback, path: changed.append(path))
+        handler = _ChangeHandler(str(vault.vault_root), loop, None)
+        root = vault.vault_root
+
+        handler.on_any_event(SimpleNamespace(event_type="modified", is_directory=True, src_path=str(root / "sub")))
+        handler.on_any_event(SimpleNamespace(event_type="deleted", is_directory=False, src_path=str(root / ".trash" / "x.md")))
+        handler.on_any_event(SimpleNamespace(
+            event_type="created", is_directory=False, src_path=str(root / ".obsidian" / "mcp-metadata-index.json.tmp")
+        ))
+        handler.on_any_event(SimpleNamespace(event_type="created", is_directory=True, src_path=str(root / ".obsidian" / "x")))
+        assert changed == []
+
+        # Real folder changes and notes restored from the trash still get through
+        handler.on_any_event(SimpleNamespace(event_type="deleted", is_directory=True, src_path=str(root / "sub")))
+        handler.on_any_event(SimpleNamespace(
+            event_type="moved", is_directory=False, src_path=str(root / ".trash" / "x.md"), dest_path=str(root / "x.md")
+        ))
+        assert changed == [None, "x.md"]
+
+    @pytest.mark.asyncio
+    async def test_backlinks_only_read_linking_notes(self, vault):
+        """Test that backlinks come from the link graph instead of a full scan."""
+        (vault.vault_path / "e.md").write_text("See [[b]] and [B](b.md)")
+        (vault.vault_path / "sub" / "f.md").write_text("Nothing to see")
+        await vault.refresh_metadata_index()
+
+        with patch("obsidian_mcp.tools.link_management.get_vault", return_value=vault), \
+             patch.object(vault, "read_many", wraps=vault.read_many) as read_many, \
+             patch.object(vault, "read_note", wraps=vault.read_note) as read_note:
+            result = await get_backlinks("b.md", include_context=False)
+
+            with pytest.raises(FileNotFoundError):
+                await get_backlinks("missing.md")
+
+        read_many.assert_called_once_with(["e.md"])
+        # The indexed target isn't read just to check that it exists
+        read_note.assert_called_once_with("missing.md")
+        assert [(bl["source_path"], bl["link_type"]) for bl in result["findings"]] == [
+            ("e.md", "wiki"),
+            ("e.md", "markdown"),
+        ]
+        assert result["summary"]["truncated"] is False
+
+        with patch("obsidian_mcp.tools.link_management.get_vault", return_value=vault):
+            with_context = await get_backlinks("b.md")
+        assert [bl.pop("context") for bl in with_context["findings"]] == ["See [[b]] and [B](b.md)"] * 2
+        assert with_context["findings"] == result["findings"]
+
+        with patch("obsidian_mcp.tools.link_management.get_vault", return_value=vault):
+            limited = await get_backlinks("b.md", include_context=False, limit=1)
+        assert limited["findings"] == result["findings"][:1]
+        assert limited["summary"]["truncated"] is True
+
+        # With a limit, only as many linking notes are read (and contexts
+        # built) as are needed to fill it and detect truncation
+        for name in ("g", "h", "i"):
+            (vault.vault_path / f"{name}.md").write_text("Also [[b]]")
+        await vault.refresh_metadata_index()
+        with patch("obsidian_mcp.tools.link_management.get_vault", return_value=vault), \
+             patch.object(vault, "read_many", wraps=vault.read_many) as read_many, \
+             patch("obsidian_mcp.tools.link_management.get_link_context",
+                   wraps=get_link_context) as link_context:
+            limited = await get_backlinks("b.md", limit=2)
+
+        assert [bl["source_path"] for bl in limited["findings"]] == ["e.md", "e.md"]
+        assert limited["summary"]["truncated"] is True
+        assert [len(call.args[0]) for call in read_many.call_args_list] == [3]
+        assert link_context.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_broken_links_use_indexed_links(self, vault):
+        """Test that broken links are found without rereading unchanged notes."""
+        (vault.vault_path / "e.md").write_text("[[b]] [[missing]] [[sub/d]] [[d]] [[missing|again]]")
+        await vault.refresh_metadata_index()
+
+        with patch("obsidian_mcp.tools.link_management.get_vault", return_value=vault), \
+             patch.object(vault, "read_many", wraps=vault.read_many) as read_many, \
+             patch("obsidian_mcp.tools.link_management.find_notes_by_names",
+                   wraps=find_notes_by_names) as lookup:
+            result = await find_broken_links()
+
+        read_many.assert_called_once_with([])
+        # Exact note paths resolve against the index without a name lookup
+        assert sorted(lookup.call_args.args[1]) == ["d.md", "missing.md"]
+        assert [(bl["broken_link"], bl["link_text"], bl["count"]) for bl in result["findings"]] == [
+            ("missing.md", "missing", 2),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_find_notes_by_names(self, vault):
+        """Test that full paths, bare names and missing notes resolve correctly."""
+        assert await find_notes_by_names(vault, ["sub/c.md", "sub/d", "c", "C.md", "missing"]) == {
+            "sub/c.md": "sub/c.md",
+            "sub/d": "sub/d.md",
+            "c": "sub/c.md",
+            "C.md": "sub/c.md",
+            "missing": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_notes_index_is_per_vault(self, vault):
+        """Test that each vault caches its own note lookup, built once under concurrency."""
+        other_dir = tempfile.mkdtemp(prefix="obsidian_test_meta_")
+        try:
+            (Path(other_dir) / "other.md").write_text("# Other")
+            other = ObsidianVault(other_dir)
+
+            with patch.object(vault, "list_notes", wraps=vault.list_notes) as list_notes:
+                indexes = await asyncio.gather(*(build_vault_notes_index(vault) for _ in range(3)))
+            assert list_notes.call_count == 1
+            assert all(index is indexes[0] for index in indexes)
+
+            assert await build_vault_notes_index(other) == {"other": "other.md"}
+            assert (await find_notes_by_names(vault, ["c"]))["c"] == "sub/c.md"
+            assert (await find_notes_by_names(other, ["c"]))["c"] is None
+        finally:
+            shutil.rmtree(other_dir)
+
+    @pytest.mark.asyncio
+    async def test_outgoing_links_use_index(self, vault):
+        """Test that outgoing links of an unchanged note come from the index."""
+        (vault.vault_path / "e.md").write_text("See [[b|Bee]] and [C](sub/c.md)")
+        await vault.refresh_metadata_index()
+
+        with patch("obsidian_mcp.tools.link_management.get_vault", return_value=vault), \
+             patch.object(vault, "read_note", wraps=vault.read_note) as read_note:
+            result = await get_outgoing_links("e.md")
+
+            assert read_note.call_count == 0
+            assert result["findings"] == [
+                {"path": "b.md", "display_text": "Bee", "type": "wiki"},
+                {"path": "sub/c.md", "display_text": "C", "type": "markdown"},
+            ]
+
+            # A changed note is parsed again
+            (vault.vault_path / "e.md").write_text("Now [[d]]")
+            result = await get_outgoing_links("e.md")
+
+        assert read_note.call_count == 1
+        assert [link["path"] for link in result["findings"]] == ["d.md"]
+
+    def test_non_string_frontmatter_keys_round_trip(self, tmp_path):
+        """Test that YAML keys like years don't prevent the index from being saved."""
+        index = MetadataIndex(tmp_path)
+        index.update("a.md", 1.0, 10, ["x"], {2024: "review"}, [])
+        index.save()
+
+        reloaded = MetadataIndex(tmp_path)
+        reloaded.load()
+
+        assert reloaded.entries["a.md"]["frontmatter"] == {"2024": "review"}
+        assert reloaded.tag_index == {"x": {"a.md"}}
+
+    def test_loaded_strings_are_shared(self, tmp_path):
+        """Test that tags and link targets repeated across notes load as one string each."""
+        index = MetadataIndex(tmp_path)
+        link = Link("hub.md", "hub", "wiki")
+        index.update("a.md", 1.0, 10, ["project"], {}, [link])
+        index.update("b.md", 1.0, 10, ["project"], {}, [link])
+        index.save()
+
+        reloaded = MetadataIndex(tmp_path)
+        reloaded.load()
+        a, b = reloaded.entries["a.md"], reloaded.entries["b.md"]
+
+        assert a["tags"][0] is b["tags"][0]
+        assert a["links"][0][0] is b["links"][0][0]
+        assert a["links"][0][2] is b["links"][0][2]
+        assert reloaded.tag_index == {"project": {"a.md", "b.md"}}
+        assert reloaded.link_graph.sources_of(["hub.md"]) == {"a.md", "b.md"}
+
+    def test_has_sources_ignores_self_links(self, tmp_path):
+        """Test the early-exit backlink check used for orphan detection."""
+        index = MetadataIndex(tmp_path)
+        index.update("a.md", 1.0, 10, [], {}, [Link("a.md", "a", "wiki")])
+        index.update("b.md", 1.0, 10, [], {}, [Link("hub.md", "hub", "wiki")])
+
+        assert index.link_graph.has_sources(["hub.md"])
+        assert not index.link_graph.has_sources(["a.md", "missing.md"], ignore="a.md")
+        assert index.link_graph.has_sources(["a.md"], ignore="b.md")
+
+    def test_extract_links_single_pass_order(self):
+        """Test that one scan still lists wiki links before markdown links."""
+        links = extract_links_from_content(
+            "[A](a.md) [[b|Bee]] [web](https://x.org) [mail](mailto:me@x.org) "
+            "[top](#intro) [app](zotero://select) [[c.md]]"
+        )
+
+        assert links == [
+            Link("b.md", "Bee", "wiki"),
+            Link("c.md", "c.md", "wiki"),
+            Link("a.md", "A", "markdown"),
+        ]
+
+    def test_image_embed_patterns(self):
+        """Test that both embed styles are found, with extensions in any case."""
+        content = "![[a.PNG]] [[b.png]] ![alt](img/c.jpg) [d](d.gif) ![[notes.md]]"
+
+        assert [m.groups() for m in IMAGE_PATTERN.finditer(content)] == [("a.PNG", None), (None, "img/c.jpg")]
+
+    def test_paths_under(self, tmp_path):
+        """Test folder lookups on the sorted paths, including after updates."""
+        index = MetadataIndex(tmp_path)
+        for path in ["sub/b.md", "sub/a.md", "sub2/c.md", "sub/deep/d.md", "top.md"]:
+            index.update(path, 1.0, 10, [], {}, [])
+
+        assert index.paths_under("sub") == ["sub/a.md", "sub/b.md", "sub/deep/d.md"]
+        assert index.paths_under("sub/deep/") == ["sub/deep/d.md"]
+
+        index.remove("sub/a.md")
+        index.update("sub/0.md", 1.0, 10, [], {}, [])
+        assert index.paths_under("sub") == ["sub/0.md", "sub/b.md", "sub/deep/d.md"]
+        assert index.paths_under("missing") == []
+
+    def test_corrupt_index_is_ignored(self, tmp_path):
+        """Test that an unreadable cache file is treated as empty."""
+        (tmp_path / ".obsidian").mkdir()
+        (tmp_path / ".obsidian" / "mcp-metadata-index.json").write_text("{not json")
+
+        index = MetadataIndex(tmp_path)
+        index.load()
+
+        assert index.entries == {}
@@ -2,10 +2,13 @@
 """Test persistent search index functionality."""
 
 import os
+import re
 import asyncio
 import tempfile
 import shutil
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 import pytest
 import pytest_asyncio
 
@@ -14,7 +17,9 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from obsidian_mcp.utils.filesystem import ObsidianVault
-from obsidian_mcp.utils.persistent_index import PersistentSearchIndex
+from obsidian_mcp.utils import persistent_index
+from obsidian_mcp.utils.watcher import _ChangeHandler
+from obsidian_mcp.utils.persistent_index import PersistentSearchIndex, required_literals, re2_compatible
 
 
 class TestPersistentIndex:
@@ -142,6 +147,197 @@ class TestPersistentIndex:
         assert result_data["limit"] == 200
         
         await index.close()
+    
+    @pytest.mark.asyncio
+    async def test_search_simple_wildcard_characters(self, test_vault_dir):
+        """Test that '%' and '_' in a query are matched literally."""
+        index = PersistentSearchIndex(Path(test_vault_dir))
+        await index.initialize()
+        
+        await index.index_file("growth.md", "Revenue grew 50% in Q3", 1000.0, 22)
+        await index.index_file("code.md", "Call my_func here", 1001.0, 17)
+        await index.index_file("other.md", "Call myXfunc and 50 apples", 1002.0, 26)
+        
+        result_data = await index.search_simple("50%", 10)
+        assert [r["filepath"] for r in result_data["results"]] == ["growth.md"]
+        
+        result_data = await index.search_simple("MY_FUNC", 10)
+        assert result_data["total_count"] == 1
+        assert result_data["results"][0]["content_lower"] == "call my_func here"
+        
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_trigram_prefilter_tracks_updates(self, test_vault_dir):
+        """Test substring matches inside words and that re-indexing/removal stay in sync."""
+        index = PersistentSearchIndex(Path(test_vault_dir))
+        await index.initialize()
+        
+        await index.index_file("a.md", "Working on the project plan", 1000.0, 27)
+        await index.index_file("b.md", "Nothing relevant", 1001.0, 16)
+        
+        # Partial words match (a word-tokenized index would miss "rojec")
+        result_data = await index.search_simple("ROJEC", 10)
+        assert [r["filepath"] for r in result_data["results"]] == ["a.md"]
+        results = await index.search_regex(r"proj\w+ plan", 0, 10)
+        assert [r["filepath"] for r in results] == ["a.md"]
+        
+        await index.index_file("a.md", "Renamed to a roadmap", 2000.0, 20)
+        assert (await index.search_simple("project", 10))["total_count"] == 0
+        assert (await index.search_simple("roadmap", 10))["total_count"] == 1
+        
+        await index.remove_file("a.md")
+        assert (await index.search_simple("roadmap", 10))["total_count"] == 0
+        
+        await index.close()
+    
+    @pytest.mark.asyncio
+    async def test_regex_search_process_pool(self, test_vault_dir, monkeypatch):
+        """Test that chunked and worker-process scans give the same results as one pass."""
+        index = PersistentSearchIndex(Path(test_vault_dir))
+        await index.initialize()
+
+        for i in range(12):
+            content = f"Note {i}\nTODO: item {i}\n" + ("filler line\n" * i) + f"todo: later {i}"
+            await index.index_file(f"note{i:02d}.md", content, 1000.0 + i, len(content))
+        await index.index_file("other.md", "No tasks here", 999.0, 13)
+
+        serial = await index.search_regex(r"todo: (\w+) (\d+)", re.IGNORECASE, 10)
+
+        # Content loaded one note at a time gives the same results
+        monkeypatch.setattr(persistent_index, "_SCAN_CHUNK_BYTES", 1)
+        assert await index.search_regex(r"todo: (\w+) (\d+)", re.IGNORECASE, 10) == serial
+
+        monkeypatch.setenv("OBSIDIAN_REGEX_WORKERS", "2")
+        monkeypatch.setattr(persistent_index, "PARALLEL_SCAN_BYTES", 0)
+        monkeypatch.setattr(persistent_index, "_regex_pool", None)
+        try:
+            parallel = await index.search_regex(r"todo: (\w+) (\d+)", re.IGNORECASE, 10)
+
+            # A worker dying breaks the pool: that search falls back to a
+            # thread and the next one starts a fresh pool
+            broken_pool = persistent_index._regex_pool
+            for process in list(broken_pool._processes.values()):
+                process.kill()
+                process.join()
+            assert await index.search_regex(r"todo: (\w+) (\d+)", re.IGNORECASE, 10) == serial
+            assert persistent_index._regex_pool is None
+            assert await index.search_regex(r"todo: (\w+) (\d+)", re.IGNORECASE, 10) == serial
+            assert persistent_index._regex_pool not in (None, broken_pool)
+        finally:
+            if persistent_index._regex_pool is not None:
+                persistent_index._regex_pool.shutdown()
+
+        assert len(serial) == 10
+        assert parallel == serial
+        assert serial[0]["matches"][0]["groups"] == ("item", "0")
+        assert serial[0]["matches"][1]["line"] == 3
+
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_vault_update_uses_watcher_changes(self, test_vault_dir):
+        """Test that with the watcher running only reported notes are re-checked."""
+        (Path(test_vault_dir) / "a.md").write_text("alpha")
+        (Path(test_vault_dir) / "b.md").write_text("beta")
+        vault = ObsidianVault(test_vault_dir)
+        vault._watcher._observer = object()  # pretend the observer thread is running
+        await vault._update_search_index()
+        
+        (Path(test_vault_dir) / "a.md").write_text("alpha gamma")
+        (Path(test_vault_dir) / "b.md").unlink()
+        vault._on_vault_change("a.md")
+        vault._on_vault_change("b.md")
+        
+        with patch("obsidian_mcp.utils.filesystem.walk_markdown") as walk:
+            await vault._update_search_index()
+        
+        walk.assert_not_called()
+        assert (await vault.persistent_index.search_simple("gamma", 10))["total_count"] == 1
+        assert await vault.persistent_index.get_file_info("b.md") is None
+        
+        # A folder-level event forces the next update to walk the vault again
+        vault._on_vault_change(None)
+        with patch("obsidian_mcp.utils.filesystem.walk_markdown", return_value=iter([])) as walk:
+            await vault._update_search_index()
+        walk.assert_called_once()
+        
+        await vault.persistent_index.close()
+    
+    @pytest.mark.asyncio
+    async def test_own_writes_sync_without_watcher_events(self, test_vault_dir):
+        """Test that notes written or deleted by the vault reach the next incremental update."""
+        (Path(test_vault_dir) / "a.md").write_text("alpha")
+        vault = ObsidianVault(test_vault_dir)
+        vault._watcher._observer = object()  # pretend the observer thread is running
+        await vault._update_search_index()
+        
+        try:
+            # No watcher event is delivered; the update runs straight after
+            await vault.delete_note("a.md")
+            await vault.write_note("b.md", "beta")
+            with patch("obsidian_mcp.utils.filesystem.walk_markdown") as walk:
+                await vault._update_search_index()
+            
+            walk.assert_not_called()
+            assert await vault.persistent_index.get_file_info("a.md") is None
+            assert (await vault.persistent_index.search_simple("beta", 10))["total_count"] == 1
+        finally:
+            await vault.persistent_index.close()
+    
+    @pytest.mark.asyncio
+    async def test_search_index_writes_keep_updates_incremental(self, test_vault_dir):
+        """Test that the events of the index's own database writes don't force a full walk."""
+        (Path(test_vault_dir) / "a.md").write_text("alpha")
+        vault = ObsidianVault(test_vault_dir)
+        vault._watcher._observer = object()  # pretend the observer thread is running
+        await vault._update_search_index()
+        assert not vault._search_needs_full_scan
+        
+        # What inotify reports for a SQLite write transaction in .obsidian/
+        loop = SimpleNamespace(call_soon_threadsafe=lambda callback, path: callback(path))
+        handler = _ChangeHandler(str(vault.vault_root), loop, vault._on_vault_change)
+        db_dir = vault.vault_root / ".obsidian"
+        for event_type, is_directory, path in [
+            ("created", False, db_dir / "mcp-search-index.db-journal"),
+            ("modified", True, db_dir),
+            ("modified", False, db_dir / "mcp-search-index.db"),
+            ("deleted", False, db_dir / "mcp-search-index.db-journal"),
+            ("modified", True, db_dir),
+        ]:
+            handler.on_any_event(SimpleNamespace(event_type=event_type, is_directory=is_directory, src_path=str(path)))
+        
+        assert not vault._search_needs_full_scan
+        with patch("obsidian_mcp.utils.filesystem.walk_markdown") as walk:
+            await vault._update_search_index()
+        walk.assert_not_called()
+        
+        await vault.persistent_index.close()
+    
+    def test_required_literals(self):
+        """Test extraction of literals every regex match must contain."""
+        assert required_literals(r"TODO:\s+fix") == ["todo:", "fix"]
+        assert required_literals(r"meeting (notes|minutes) 2024") == ["meeting ", " 2024"]
+        assert required_literals(r"abc|xyz") == []
+        assert required_literals(r"colou?r") == ["colo"]
+        assert required_literals(r"\d+-\d+") == []
+        # Under IGNORECASE, 'i'/'s' also match dotless i / long s, so they end a run
+        assert required_literals(r"(?i)weekly business") == ["weekly bu"]
+        assert required_literals(r"Weekly Business", re.IGNORECASE) == ["weekly bu"]
+        assert required_literals(r"(unclosed") == []
+
+    def test_re2_compatible(self):
+        """Test that only patterns RE2 matches identically are handed to it."""
+        assert re2_compatible(r"meeting (notes|minutes) [0-9]{4}")
+        assert re2_compatible(r"^# .+$", re.MULTILINE)
+        assert re2_compatible(r"(?i)todo:.*")
+        assert not re2_compatible(r"\w+ing")  # \w is ASCII-only in RE2
+        assert not re2_compatible(r"end$")  # re's $ also matches before a final newline
+        assert not re2_compatible(r"(a)\1")
+        assert not re2_compatible(r"(?<=#)tag")
+        assert not re2_compatible(r"a{,3}")
+        assert not re2_compatible(r"x{2000}")
+        assert not re2_compatible(r"a b", re.VERBOSE)
 
 
 if __name__ == "__main__":